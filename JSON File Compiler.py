@@ -1,990 +1,201 @@
-import pygame as pg
-import sys
-import random
+# Level building tool for Maze Master
+# Usage: python "JSON File Compiler.py" convert [levels.json] [levels.bin]
+#        python "JSON File Compiler.py" par [levels.bin]
+#        python "JSON File Compiler.py" metrics [levels.bin]
+#        python "JSON File Compiler.py" build [levels.bin] [--levels 45] [--tiers 15 20 30] [--candidates 4] [--seed 0] [--processes N]
+#        python "JSON File Compiler.py" runs [levels.bin]
+#        python "JSON File Compiler.py" check [levels.bin] [--sizes 15 20 30 100]
 import os
+import sys
 import json
-
-# Initialise Pygame
-pg.init()
-pg.mixer.init()
-
-# Constants
-SCREEN_WIDTH = 1280
-SCREEN_HEIGHT = 720
-FPS = 60
-GREEN = (7, 168, 18)
-LIGHT_ORANGE = (255, 204, 153)
-CYAN = (102, 255, 255)
-PINK = (255, 0, 255)
-
-# File directories
-MAIN_DIR = os.path.dirname(__file__)
-DATA_DIR = os.path.join(MAIN_DIR, 'data')
-ASSETS_DIR = os.path.join(MAIN_DIR, 'assets')
-IMAGES_DIR = os.path.join(ASSETS_DIR, 'images')
-SOUNDS_DIR = os.path.join(ASSETS_DIR, 'sounds')
-FONTS_DIR = os.path.join(ASSETS_DIR, 'fonts')
-
-# Fonts
-MONTSERRAT_REG = os.path.join(FONTS_DIR, 'Montserrat_Font_Family', 'Montserrat Regular 400.ttf')
-MONTSERRAT_BOLD = os.path.join(FONTS_DIR, 'Montserrat_Font_Family', 'Montserrat Bold 700.ttf')
-PARKVANE = os.path.join(FONTS_DIR, 'Parkvane_Font_Family', 'Parkvane Regular 400.ttf')
-
-# Global functions
-def load_image(filename):
-    return pg.image.load(os.path.join(IMAGES_DIR, filename)).convert_alpha()
-
-def draw_text(screen, text, x, y, font, colour = (255, 255, 255), align = 'topleft'):
-    text_surface = font.render(text, True, colour)
-
-    rect = text_surface.get_rect()
-    if align == 'center':
-        rect.center = (x, y)
-    elif align == 'topright':
-        rect.topright = (x, y)
-    elif align == 'bottomleft':
-        rect.bottomleft = (x, y)
-    elif align == 'bottomright':
-        rect.bottomright = (x, y)
-    else:  # default is topleft
-        rect.topleft = (x, y)
-
-    screen.blit(text_surface, rect)
-
-# Classes
-class Game:
-    def __init__(self):
-        # Initialise screen display
-        self.screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pg.display.set_caption('Maze Master')
-        pg.display.set_icon(load_image('maze_icon.png'))
-
-        self.clock = pg.time.Clock()
-        self.is_running = True
-        self.title_screen = TitleScreen(self)
-        self.play_mode = PlayMode(self)
-        self.levels_game_mode = LevelsGameMode(self)
-        self.endless_game_mode = EndlessGameMode(self)
-        self.pause_menu = PauseMenu(self)
-        self.win_screen = WinScreen(self)
-        self.is_paused = False
-        self.win = False
-        self.state = self.title_screen
-        self.mouse_pos = pg.mouse.get_pos()
-        self.mouse_x = self.mouse_pos[0]
-        self.mouse_y = self.mouse_pos[1]
-        self.key_pressed = None # Current key pressed in a frame
-
-    def run(self):
-        while self.is_running:
-            # Event handler
-            self.key_pressed = None
-            for event in pg.event.get():
-                if event.type == pg.QUIT: # Close window
-                    self.is_running = False
-                if event.type == pg.MOUSEBUTTONDOWN and event.button == 1: # Mouse left-click
-                    if self.is_paused:
-                        self.pause_menu.buttons_clicked()
-                    elif self.win:
-                        self.win_screen.buttons_clicked()
-                    else:
-                        self.state.buttons_clicked()
-                if event.type == pg.KEYDOWN: # Updates current key pressed
-                    self.key_pressed = event.key
-            
-            # Update mouse coords
-            self.mouse_pos = pg.mouse.get_pos()
-            self.mouse_x = self.mouse_pos[0]
-            self.mouse_y = self.mouse_pos[1]
-
-            self.state.draw()
-
-            if self.is_paused:
-                self.pause_menu.draw()
-            elif self.win:
-                self.win_screen.update()
-                self.win_screen.draw()        
-            else:
-                self.state.update()
-
-            pg.display.update()
-            self.clock.tick(FPS)
-        pg.quit()
-        sys.exit()
-
-class TitleScreen:
-    def __init__(self, game):
-        self.game = game
-        self.image = load_image('title_screen.png')
-        self.buttons = [
-            Button(self.game, SCREEN_WIDTH // 2, 430, 'play_button1.png', self.play_button_clicked),
-            Button(self.game, 1146, 668, 'education_button.png', self.education_button_clicked)
-        ]
-    
-    def draw(self):
-        self.game.screen.blit(self.image,(0,0))
-        for button in self.buttons:
-            button.draw()
-
-    def update(self):
-        pass
-
-    def buttons_clicked(self):
-        for button in self.buttons:
-            button.clicked()
-
-    def play_button_clicked(self):
-        self.game.state = self.game.play_mode
-
-    def education_button_clicked(self):
-        print('Education button clicked.')
-
-class PlayMode:
-    def __init__(self, game):
-        self.game = game
-        self.image = load_image('play_mode.png')
-        self.buttons = [
-            Button(self.game, 56, 670, 'back_button.png', self.back_button_clicked, 81, 72),
-            Button(self.game, 1230, 670, 'settings_button.png', self.settings_button_clicked, 72, 72),
-            Button(self.game, SCREEN_WIDTH // 2, 426, 'levels_button.png', self.levels_button_clicked),
-            Button(self.game, SCREEN_WIDTH // 2, 564, 'endless_button.png', self.endless_button_clicked)
-        ]
-    
-    def draw(self):
-        self.game.screen.blit(self.image, (0,0))
-        for button in self.buttons:
-            button.draw()
-
-    def update(self):
-        pass
-
-    def buttons_clicked(self):
-        for button in self.buttons:
-            button.clicked()
-
-    def back_button_clicked(self):
-        self.game.state = self.game.title_screen
-
-    def settings_button_clicked(self):
-        print('Settings button clicked.')
-
-    def levels_button_clicked(self):
-        print('Levels button clicked.')
-
-    def endless_button_clicked(self):
-        self.game.state = self.game.endless_game_mode
-        self.game.endless_game_mode.reset()
-
-class GameMode: # Parent Class
-    def __init__(self, game):
-        self.game = game
-        self.image = load_image('blank.png')
-        self.buttons = [
-            Button(self.game, 50, 50, 'pause_button.png', self.pause_button_clicked, 72, 72)
-        ]
-        self.start_node_pos = (0, 0)
-        self.maze_width = None
-        self.maze_height = None
-        self.maze_surface_pos = (353, 101)
-        self.maze_surface_width = 575
-        self.maze_surface_height = 575
-        self.maze = None
-        self.player = None
-        self.start_time = pg.time.get_ticks() # Timer value when started
-        self.elapsed_time = 0 # Seconds since level started
-        self.start_pause_time = 0 # Timer value when paused
-        self.elapsed_pause_time = 0 # Pause duration
-        self.minutes = 0 # Clock display
-        self.seconds = 0 # Clock display
-        self.goal_node_pos = None
-        self.goal_node_image = None
-        self.goal_node_rect = None
-        self.timer_label_font = pg.font.Font(MONTSERRAT_BOLD, 40)
-        self.timer_text_font = pg.font.Font(MONTSERRAT_REG, 40)
-        self.moves_counter_label_font = pg.font.Font(MONTSERRAT_BOLD, 40)
-        self.moves_counter_text_font = pg.font.Font(MONTSERRAT_REG, 40)
-        self.title = None
-        self.title_text_font = pg.font.Font(PARKVANE, 50)
-        self.path = None
-        self.zero_star_image = pg.transform.smoothscale(load_image('0 star.png'), (153, 51))
-        self.zero_star_rect = self.zero_star_image.get_rect()
-        self.one_star_image = pg.transform.smoothscale(load_image('1 star.png'), (153, 51))
-        self.one_star_rect = self.one_star_image.get_rect()
-        self.two_star_image = pg.transform.smoothscale(load_image('2 star.png'), (153, 51))
-        self.two_star_rect = self.two_star_image.get_rect()
-        self.three_star_image = pg.transform.smoothscale(load_image('3 star.png'), (153, 51))
-        self.three_star_rect = self.three_star_image.get_rect()
-        self.star_rating = 3
-        self.speed_constant = 6.02 # Solving speed to acheive 3/3 stars
-
-    def draw(self):
-        self.game.screen.blit(self.image,(0,0))
-        if not self.game.is_paused and not self.game.win:
-            for button in self.buttons:
-                button.draw()
-        self.maze.draw(self.game.screen)
-        self.draw_goal_node()
-        self.player.draw()
-        self.draw_title()
-        if not self.game.win:
-            self.draw_timer()
-            self.draw_moves_counter()
-            self.draw_star_rating()
-
-    def update(self):
-        if not self.game.win:
-            self.player.update()
-            self.update_star_rating()
-            self.update_timer()
-            self.is_winning()
-    
-    def reset(self):
-        self.maze = Maze(self.maze_width, self.maze_height, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height)
-        self.player = Player(self.game, self.maze, self.start_node_pos[0], self.start_node_pos[1])
-        self.start_time = pg.time.get_ticks() # Timer value when started
-        self.elapsed_time = 0 # Seconds since level started
-        self.start_pause_time = 0 # Timer value when paused
-        self.elapsed_pause_time = 0 # Pause duration
-        self.minutes = 0 # Clock display
-        self.seconds = 0 # Clock display
-        self.path = self.maze.run_dijkstra(self.start_node_pos, self.goal_node_pos)
-        self.star_rating = 3
-        self.game.win = False      
-
-    def buttons_clicked(self):
-        for button in self.buttons:
-            button.clicked()
-
-    def pause_button_clicked(self):
-        self.game.is_paused = True
-        self.start_pause_time = pg.time.get_ticks()
-
-    def draw_title(self):
-        draw_text(
-            self.game.screen,
-            self.title,
-            self.maze_surface_pos[0],
-            45,
-            self.title_text_font,
-            PINK,
-            'topleft'
-        )
-
-    def update_timer(self):
-        self.elapsed_time = (pg.time.get_ticks() - self.start_time) // 1000 # Elapsed time in seconds
-        self.minutes = self.elapsed_time // 60
-        self.seconds = self.elapsed_time % 60
-    
-    def draw_timer(self):
-        time = f'{self.minutes:02d}:{self.seconds:02d}' # Clock display MM:SS
-        draw_text(
-            self.game.screen,
-            'Timer:',
-            (SCREEN_WIDTH + self.maze_surface_pos[0] + self.maze_surface_width) // 2,
-            130,
-            self.timer_label_font,
-            LIGHT_ORANGE,
-            'center'
-        )
-        draw_text(
-            self.game.screen,
-            time,
-            (SCREEN_WIDTH + self.maze_surface_pos[0] + self.maze_surface_width) // 2,
-            200,
-            self.timer_text_font,
-            LIGHT_ORANGE,
-            'center'
-        )
-
-    def draw_moves_counter(self):
-        moves = str(self.player.moves) # Obtain the no. moves made from Player class
-        draw_text(
-            self.game.screen,
-            'Moves:',
-            (SCREEN_WIDTH + self.maze_surface_pos[0] + self.maze_surface_width) // 2,
-            340,
-            self.moves_counter_label_font,
-            CYAN,
-            'center'
-        )
-        draw_text(
-            self.game.screen,
-            moves,
-            (SCREEN_WIDTH + self.maze_surface_pos[0] + self.maze_surface_width) // 2,
-            410,
-            self.moves_counter_text_font,
-            CYAN,
-            'center'
-        )
-
-    def is_winning(self):
-        if (self.player.x, self.player.y) == self.goal_node_pos:
-            self.game.win = True
-            self.game.win_screen.next_animation_time = pg.time.get_ticks() # Passes timer value to WinScreen when game won
-
-    def draw_goal_node(self):
-        self.goal_node_rect.center = self.maze.pos_to_px(self.goal_node_pos)
-        self.game.screen.blit(self.goal_node_image, self.goal_node_rect)
-
-    def update_star_rating(self):
-        three_star_time = len(self.path) / self.speed_constant # Max time to achieve 3/3 stars
-        if self.elapsed_time <= three_star_time:
-            self.star_rating = 3
-        elif self.elapsed_time <= three_star_time + 5:
-            self.star_rating = 2
-        else:
-            self.star_rating = 1
-    
-    def draw_star_rating(self):
-        match self.star_rating:
-            case 3:
-                self.three_star_rect.topleft = (775, 45)
-                self.game.screen.blit(self.three_star_image, self.three_star_rect)
-            case 2:
-                self.two_star_rect.topleft = (775, 45)
-                self.game.screen.blit(self.two_star_image, self.two_star_rect)
-            case 1:
-                self.one_star_rect.topleft = (775, 45)
-                self.game.screen.blit(self.one_star_image, self.one_star_rect)
-
-class EndlessGameMode(GameMode):
-    def __init__(self, game):
-        super().__init__(game)
-        self.maze_width = 10
-        self.maze_height = 10
-        self.maze = Maze(self.maze_width, self.maze_height, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height)
-        self.player = Player(self.game, self.maze, self.start_node_pos[0], self.start_node_pos[1])
-        self.goal_node_pos = (self.maze_width - 1, self.maze_height - 1)
-        self.goal_node_image = pg.transform.smoothscale(load_image('goal_node.png'), (self.maze.cell_size, self.maze.cell_size))
-        self.goal_node_rect = self.goal_node_image.get_rect()
-        self.title = 'Endless'
-        self.path = self.maze.run_dijkstra(self.start_node_pos, self.goal_node_pos)
-
-class LevelsGameMode(GameMode):
-    def __init__(self, game):
-        super().__init__(game)
-        self.levels = [] # Levels dictionary
-        # for i in range(1, 46):
-        #     if i <= 15: # Easy
-        #         maze = Maze(15, 15, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height)
-        #     elif i <= 30: # Medium
-        #         maze = Maze(20, 20, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height)
-        #     else: # Hard
-        #         maze = Maze(30, 30, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height)
-        #     array = maze.to_dict()
-        #     self.levels.append({'number': i, 'maze': array, 'stars': 0})
-
-        # with open(os.path.join(DATA_DIR, 'levels.json'), 'w') as f: # Saves to the data file directory
-        #     json.dump(self.levels, f, indent = 4)
-
-
-        # with open(os.path.join(DATA_DIR, 'levels.json'), 'r') as f:
-        #     self.levels = json.load(f) # Levels dictionary
-        
-        # for level in self.levels:
-        #     normal_score = level["stars"]
-        #     level["stars"] = {"normal": normal_score, "darkness": 0}
-
-        # with open(os.path.join(DATA_DIR, 'levels.json'), 'w') as f:
-        #     json.dump(self.levels, f, indent = 4)
-
-        
-
-
-
-
-
-
-
-
-
-class Button:
-    def __init__(self, game, x, y, image, action = None, width = None, height = None):
-        self.game = game
-        self.x = x
-        self.y = y
-        if width and height:
-            self.image = pg.transform.smoothscale(load_image(image), (width, height))
-        else:
-            self.image = load_image(image)
-        self.mask = pg.mask.from_surface(self.image) # Creates mask of button
-        self.rect = self.image.get_rect(center = (x, y))
-        self.action = action
-
-    def draw(self):
-        self.game.screen.blit(self.image, self.rect)
-    
-    def clicked(self):
-        if self.rect.collidepoint(self.game.mouse_pos): # First checks if button rectangle is clicked
-            pixel_x = self.game.mouse_x - self.rect.left # Relative x-coord of image pixel clicked
-            pixel_y = self.game.mouse_y - self.rect.top # Relative y-coord of image pixel clicked
-            if self.mask.get_at((pixel_x, pixel_y)): # Checks if pixel clicked is not transparent
-                self.action()
-
-class Node:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.is_visited = False # Visited flag for maze generation
-        self.is_path_visited = False # Visited flag for pathfinding
-        self.walls = {'top':True, 'bottom':True, 'left':True, 'right':True}
-        self.distance = float('inf') # Set to infinity
-        self.previous_node = None
-        self.heuristic = 0
-
-class Maze:
-    def __init__(self, width, height, surface_pos, surface_width, surface_height, generate = True):
-        self.width = width
-        self.height = height
-        self.stack = []
-        self.array = self.create_2D_array(width, height)
-        # Determining the appropriate cell size from the ratio of space given to maze size
-        self.cell_size = min(surface_width // self.width, surface_height // self.height) # Take the smallest value as the node is a square
-        # Determine the coords of where to start drawing from to ensure the maze is aligned at the centre
-        self.start_x = surface_pos[0] + (surface_width - self.cell_size * self.width) // 2
-        self.start_y = surface_pos[1] + (surface_height - self.cell_size * self.height) // 2
-        if generate:
-            self.generate()
-
-    def to_dict(self): # Converts Maze object into a JSON-friendly dictionary
-        array = []
-        for x in range(self.width):
-            array.append([])
-            for y in range(self.height):
-                array[x].append(self.array[x][y].walls)
-        return array
-
-    def create_2D_array(self, width, height):
-        array = []
-        for x in range(width):
-            array.append([])
-            for y in range(height):
-                array[x].append(Node(x, y))
-        return array
-    
-    def get_unvisited_neighbours(self, node): # Returns a list of univisited neighbouring nodes for maze generation
-        neighbours = []
-
-        if node.y > 0: # Top
-            if self.array[node.x][node.y - 1].is_visited == False:
-                neighbours.append(self.array[node.x][node.y - 1])
-        
-        if node.y < self.height - 1: # Bottom
-            if self.array[node.x][node.y + 1].is_visited == False:
-                neighbours.append(self.array[node.x][node.y + 1])
-
-        if node.x > 0: # Left
-            if self.array[node.x - 1][node.y].is_visited == False:
-                neighbours.append(self.array[node.x - 1][node.y])   
-
-        if node.x < self.width - 1: # Right
-            if self.array[node.x + 1][node.y].is_visited == False:
-                neighbours.append(self.array[node.x + 1][node.y])
-
-        return neighbours
-    
-    def remove_walls(self, node1, node2):
-        if node1.x == node2.x and node1.y == node2.y + 1: # Top of node1
-            node1.walls['top'] = False
-            node2.walls['bottom'] = False
-        elif node1.x == node2.x and node1.y == node2.y - 1: # Bottom of node1
-            node1.walls['bottom'] = False
-            node2.walls['top'] = False
-        elif node1.x == node2.x + 1 and node1.y == node2.y: # Left of node1
-            node1.walls['left'] = False
-            node2.walls['right'] = False
-        elif node1.x == node2.x - 1 and node1.y == node2.y: # Right of node1
-            node1.walls['right'] = False
-            node2.walls['left'] = False
-        
-    def generate(self):
-        start_node = self.array[0][0]
-        start_node.is_visited = True
-        self.stack.append(start_node)
-
-        while len(self.stack) > 0:
-            current_node = self.stack[-1]
-            neighbouring_nodes = self.get_unvisited_neighbours(current_node)
-
-            if len(neighbouring_nodes) > 0:
-                next_node = random.choice(neighbouring_nodes)
-                self.remove_walls(current_node, next_node)
-                next_node.is_visited = True
-                self.stack.append(next_node)
-            else:
-                self.stack.pop()
-
-    def draw(self, screen, wall_colour=(255,255,255)):
-        wall_thickness = max(self.cell_size // 12, 1) # Cell size : Wall thickenss ratio - minimum 1px
-        # Draw border
-        top_border = pg.Rect(
-            self.start_x - wall_thickness,
-            self.start_y - wall_thickness,
-            self.cell_size * self.width + 2 * wall_thickness,
-            wall_thickness
-        )
-        pg.draw.rect(screen, wall_colour, top_border)
-        bottom_border = pg.Rect(
-            self.start_x - wall_thickness,
-            self.start_y + self.cell_size * self.height,
-            self.cell_size * self.width + 2 * wall_thickness,
-            wall_thickness
-        )
-        pg.draw.rect(screen, wall_colour, bottom_border)
-        left_border = pg.Rect(
-            self.start_x - wall_thickness,
-            self.start_y - wall_thickness,
-            wall_thickness,
-            self.cell_size * self.height + 2 * wall_thickness
-        )
-        pg.draw.rect(screen, wall_colour, left_border)
-        right_border = pg.Rect(
-            self.start_x + self.cell_size * self.width,
-            self.start_y - wall_thickness,
-            wall_thickness,
-            self.cell_size * self.height + 2 * wall_thickness
-        )
-        pg.draw.rect(screen, wall_colour, right_border)
-        # Draw cells
-        for x in range(self.width):
-            for y in range(self.height):
-                cell = self.array[x][y]
-                x_pos = self.start_x + x * self.cell_size
-                y_pos = self.start_y + y * self.cell_size
-
-                if cell.walls['top'] == True:
-                    top = pg.Rect(x_pos - wall_thickness, y_pos, self.cell_size + 2 * wall_thickness, wall_thickness)
-                    pg.draw.rect(screen, wall_colour, top)
-
-                if cell.walls['bottom'] == True:
-                    bottom = pg.Rect(x_pos - wall_thickness, y_pos + self.cell_size - wall_thickness, self.cell_size + 2 * wall_thickness, wall_thickness)
-                    pg.draw.rect(screen, wall_colour, bottom)
-
-                if cell.walls['left'] == True:
-                    left = pg.Rect(x_pos, y_pos - wall_thickness, wall_thickness, self.cell_size + 2 * wall_thickness)
-                    pg.draw.rect(screen, wall_colour, left)
-
-                if cell.walls['right'] == True:
-                    right = pg.Rect(x_pos + self.cell_size - wall_thickness, y_pos - wall_thickness, wall_thickness, self.cell_size + 2 * wall_thickness)
-                    pg.draw.rect(screen, wall_colour, right)
-
-    def pos_to_px(self, pos):
-        return [self.start_x + (pos[0] + 0.5) * self.cell_size, self.start_y + (pos[1] + 0.5) * self.cell_size]
-
-    def px_to_pos(self, px):
-        return [(px[0] - self.start_x) / self.cell_size - 0.5, (px[1] - self.start_y) / self.cell_size - 0.5]
-    
-    def target_node(self, pos, direction):
-        x = pos[0]
-        y = pos[1]
-        match direction:
-            case 'north':
-                while not self.array[x][y].walls['top']:
-                    y -= 1
-                    if not self.array[x][y].walls['left'] or not self.array[x][y].walls['right']:
-                        return (x, y) # When a junction is reached
-                
-            case 'east':
-                while not self.array[x][y].walls['right']:
-                    x += 1
-                    if not self.array[x][y].walls['top'] or not self.array[x][y].walls['bottom']:
-                        return (x, y) # When a junction is reached
-                    
-            case 'south':
-                while not self.array[x][y].walls['bottom']:
-                    y += 1
-                    if not self.array[x][y].walls['left'] or not self.array[x][y].walls['right']:
-                        return (x, y) # When a junction is reached
-                    
-            case 'west':
-                while not self.array[x][y].walls['left']:
-                    x -= 1
-                    if not self.array[x][y].walls['top'] or not self.array[x][y].walls['bottom']:
-                        return (x, y) # When a junction is reached
-        return (x, y) # When a dead end is reached
-    
-    def get_reachable_neighbours(self, node): # Returns a list of adjacent nodes with no wall in between
-        neighbours = []
-
-        if not node.walls['top']:
-            neighbours.append(self.array[node.x][node.y - 1])
-        if not node.walls['bottom']:
-            neighbours.append(self.array[node.x][node.y + 1])
-        if not node.walls['left']:
-            neighbours.append(self.array[node.x - 1][node.y])
-        if not node.walls['right']:
-            neighbours.append(self.array[node.x + 1][node.y])
-        return neighbours
-    
-    def run_dijkstra(self, start_node_pos, goal_node_pos):
-        start_node = self.array[start_node_pos[0]][start_node_pos[1]]
-        goal_node = self.array[goal_node_pos[0]][goal_node_pos[1]]
-        return Dijkstra(self).run(start_node, goal_node)
-
-
-    
-class Player:
-    def __init__(self, game, maze, x = 0, y = 0):
-        self.game = game # Reference to the Game object
-        self.maze = maze # Reference to the maze object
-        self.x = x # Position in the maze array
-        self.y = y # Position in the maze array
-        self.px = self.maze.pos_to_px((self.x, self.y)) # Converts player position to pixel coords
-        self.direction = None
-        self.queued_direction = None
-        self.is_moving = False
-        self.target_node_pos = None
-        self.target_node_px = None
-        self.speed = 5
-        self.colour = GREEN
-        self.trail_colour = GREEN
-        self.trail = [(self.x, self.y)] # Trail path nodes
-        self.toggle_trail = True
-        self.moves = 0 
-
-    def update(self):
-        self.handle_input()
-        self.move()
-
-    def handle_input(self):
-        if not self.is_moving: # Resets queued direction to none when stationary
-            self.queued_direction = None
-
-        if self.game.key_pressed == pg.K_UP: # Up key clicked
-            if not self.maze.array[int(self.x)][int(self.y)].walls['top'] and not self.is_moving:
-                self.direction = 'north'
-                self.is_moving = True
-                self.target_node_pos = self.maze.target_node((self.x, self.y), self.direction)
-                self.target_node_px = self.maze.pos_to_px(self.target_node_pos)
-                self.handle_backtracking()
-            elif self.is_moving:
-                self.queued_direction = 'north'
-        elif self.game.key_pressed == pg.K_DOWN: # Down key clicked
-            if not self.maze.array[int(self.x)][int(self.y)].walls['bottom'] and not self.is_moving:
-                self.direction = 'south'
-                self.is_moving = True
-                self.target_node_pos = self.maze.target_node((self.x, self.y), self.direction)
-                self.target_node_px = self.maze.pos_to_px(self.target_node_pos)
-                self.handle_backtracking()
-            elif self.is_moving:
-                self.queued_direction = 'south'
-        elif self.game.key_pressed == pg.K_LEFT: # Left key clicked
-            if not self.maze.array[int(self.x)][int(self.y)].walls['left'] and not self.is_moving:
-                self.direction = 'west'
-                self.is_moving = True
-                self.target_node_pos = self.maze.target_node((self.x, self.y), self.direction)
-                self.target_node_px = self.maze.pos_to_px(self.target_node_pos)
-                self.handle_backtracking()
-            elif self.is_moving:
-                self.queued_direction = 'west'
-        elif self.game.key_pressed == pg.K_RIGHT: # Right key clicked
-            if not self.maze.array[int(self.x)][int(self.y)].walls['right'] and not self.is_moving:
-                self.direction = 'east'
-                self.is_moving = True
-                self.target_node_pos = self.maze.target_node((self.x, self.y), self.direction)
-                self.target_node_px = self.maze.pos_to_px(self.target_node_pos)
-                self.handle_backtracking()
-            elif self.is_moving:
-                self.queued_direction = 'east'
-
-    def move(self):
-        if self.is_moving:
-            if self.direction == 'north':
-                if self.px[1] > self.target_node_px[1]:
-                    self.px[1] -= self.speed # Move up
-                else:
-                    self.px[0] = self.target_node_px[0]
-                    self.px[1] = self.target_node_px[1]
-                    self.x = self.target_node_pos[0]
-                    self.y = self.target_node_pos[1]
-                    self.is_moving = False
-                    self.moves += 1
-                    if (self.x, self.y) != self.trail[-1]: # If new node visited
-                        if len(self.trail) >= 2 and (self.x, self.y) == self.trail[-2]:
-                            self.trail.pop() # Remove last item if player is backtracking
-                        else:
-                            self.trail.append((self.x, self.y)) # Add item if new node visiited
-
-            elif self.direction == 'east':
-                if self.px[0] < self.target_node_px[0]:
-                    self.px[0] += self.speed # Move right
-                else:
-                    self.px[0] = self.target_node_px[0]
-                    self.px[1] = self.target_node_px[1]
-                    self.x = self.target_node_pos[0]
-                    self.y = self.target_node_pos[1]
-                    self.is_moving = False
-                    self.moves += 1
-                    if (self.x, self.y) != self.trail[-1]:
-                        if len(self.trail) >= 2 and (self.x, self.y) == self.trail[-2]:
-                            self.trail.pop()
-                        else:
-                            self.trail.append((self.x, self.y))
-
-            elif self.direction == 'south':
-                if self.px[1] < self.target_node_px[1]:
-                    self.px[1] += self.speed # Move down
-                else:
-                    self.px[0] = self.target_node_px[0]
-                    self.px[1] = self.target_node_px[1]
-                    self.x = self.target_node_pos[0]
-                    self.y = self.target_node_pos[1]
-                    self.is_moving = False
-                    self.moves += 1
-                    if (self.x, self.y) != self.trail[-1]:
-                        if len(self.trail) >= 2 and (self.x, self.y) == self.trail[-2]:
-                            self.trail.pop()
-                        else:
-                            self.trail.append((self.x, self.y))
-
-            elif self.direction == 'west':
-                if self.px[0] > self.target_node_px[0]:
-                    self.px[0] -= self.speed # Move left
-                else:
-                    self.px[0] = self.target_node_px[0]
-                    self.px[1] = self.target_node_px[1]
-                    self.x = self.target_node_pos[0]
-                    self.y = self.target_node_pos[1]
-                    self.is_moving = False
-                    self.moves += 1
-                    if (self.x, self.y) != self.trail[-1]:
-                        if len(self.trail) >= 2 and (self.x, self.y) == self.trail[-2]:
-                            self.trail.pop()
-                        else:
-                            self.trail.append((self.x, self.y))
-
-        if self.queued_direction and not self.is_moving: # Checks for any queued direction
-            self.direction = self.queued_direction
-            self.queued_direction = None
-            self.is_moving = True
-            self.target_node_pos = self.maze.target_node((self.x, self.y), self.direction)
-            self.target_node_px = self.maze.pos_to_px(self.target_node_pos)
-            self.handle_backtracking()
-
-    def draw_trail(self):
-        trail_thickness = max(self.maze.cell_size // 3, 1)
-        for i in range(len(self.trail) - 1): # Draws the static part of the trail
-            start_pos = self.trail[i]
-            end_pos = self.trail[i + 1]
-            start_px = self.maze.pos_to_px(start_pos)
-            end_px = self.maze.pos_to_px(end_pos)
-
-            static_rect = self.create_rect(start_px, end_px, trail_thickness)
-            pg.draw.rect(self.game.screen, self.trail_colour, static_rect)
-
-        last_px = self.maze.pos_to_px(self.trail[-1]) # Draws the dynamic part of the trail
-        dynamic_rect = self.create_rect(last_px, self.px, trail_thickness)
-        pg.draw.rect(self.game.screen, self.trail_colour, dynamic_rect)
-
-    def create_rect(self, start_px, end_px, thickness):
-        if start_px[0] == end_px[0]: # Draw a vertical rectangle
-            length = abs(start_px[1] - end_px[1]) + thickness
-            x = start_px[0] - thickness // 2
-            y = min(start_px[1], end_px[1]) - thickness // 2
-            return pg.Rect(x, y, thickness, length)
-
-
-        elif start_px[1] == end_px[1]: # Draw a horizontal rectangle
-            length = abs(start_px[0] - end_px[0]) + thickness
-            x = min(start_px[0], end_px[0]) - thickness // 2
-            y = start_px[1] - thickness // 2
-            return pg.Rect(x, y, length, thickness)
-
-    def handle_backtracking(self):
-        if len(self.trail) > 1 and self.target_node_pos == self.trail[-2]:
-            self.trail.pop()
-
-    def draw(self): # Draws player as a circle
-        self.draw_trail()
-        pg.draw.circle(self.game.screen, self.colour, (int(self.px[0]), int(self.px[1])), self.maze.cell_size // 2.5)
-
-class PauseMenu:
-    def __init__(self, game):
-        self.game = game
-        self.image = pg.transform.smoothscale(load_image('paused.png'), (419, 161))
-        self.buttons = [
-            Button(self.game, SCREEN_WIDTH // 2, 421, 'play_button2.png', self.play_button_clicked, 206, 206),
-            Button(self.game, 452, 421, 'home_button.png', self.home_button_clicked, 139, 139),
-            Button(self.game, 828, 421, 'controls_button.png', self.controls_button_clicked, 139, 139),
-        ]
-        self.overlay = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA) # Darkens screen
-        self.overlay.fill((0, 0, 0, 180))
-    
-    def draw(self):
-        self.game.screen.blit(self.overlay, (0, 0))
-        self.game.screen.blit(self.image, (431, 170))
-        for button in self.buttons:
-            button.draw()
-
-    def buttons_clicked(self):
-        for button in self.buttons:
-            button.clicked()
-
-    def play_button_clicked(self):
-        self.game.is_paused = False
-        self.game.state.elapsed_pause_time = pg.time.get_ticks() - self.game.state.start_pause_time # Calculate pause duration
-        self.game.state.start_time += self.game.state.elapsed_pause_time # Shifts start time forward when unpaused
-
-    def home_button_clicked(self):
-        self.game.is_paused = False
-        self.game.state = self.game.play_mode
-
-    def controls_button_clicked(self):
-        print('Controls button clicked.')
-
-class WinScreen:
-    def __init__(self, game):
-        self.game = game
-        self.image1 = pg.transform.smoothscale(load_image('win1.png'), (720, 649))
-        self.image2 = pg.transform.smoothscale(load_image('win2.png'), (720, 649))
-        self.buttons = [
-            Button(self.game, SCREEN_WIDTH // 2, 421, 'replay_button.png', self.replay_button_clicked, 206, 206),
-            Button(self.game, 452, 421, 'home_button.png', self.home_button_clicked, 139, 139),
-            Button(self.game, 828, 421, 'controls_button.png', self.controls_button_clicked, 139, 139),
-        ]
-        self.overlay = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA) # Darkens screen
-        self.overlay.fill((0, 0, 0, 180))
-        self.font = pg.font.Font(MONTSERRAT_BOLD, 32)
-        self.zero_star_image = pg.transform.smoothscale(load_image('0 star.png'), (261, 87))
-        self.one_star_image = pg.transform.smoothscale(load_image('1 star.png'), (261, 87))
-        self.two_star_image = pg.transform.smoothscale(load_image('2 star.png'), (261, 87))
-        self.three_star_image = pg.transform.smoothscale(load_image('3 star.png'), (261, 87))
-        self.current_star = 0 # Current star value during animation
-        self.current_star_image = self.zero_star_image # Current star animated
-        self.next_animation_time = 0
-        self.animation_delay = 500 # ms between each animation frame
-        self.star_sound = pg.mixer.Sound(os.path.join(SOUNDS_DIR, 'ding.wav'))
-        self.stop_animation = False
-    
-    def draw(self):
-        self.game.screen.blit(self.overlay, (0, 0))
-        self.game.screen.blit(self.current_star_image, (510, 186))
-        if self.stop_animation:
-            self.game.screen.blit(self.image2, (280, 41))
-            for button in self.buttons:
-                button.draw()
-            time = f'{self.game.state.minutes:02d}:{self.game.state.seconds:02d}' # Clock display MM:SS
-            draw_text(self.game.screen, time, SCREEN_WIDTH // 2, 590, self.font, (255, 255, 255), 'center')
-            moves = str(self.game.state.player.moves) # Obtain the no. moves made from Player class
-            draw_text(self.game.screen, moves, SCREEN_WIDTH // 2, 667, self.font, (255, 255, 255), 'center')
-        else:
-            self.game.screen.blit(self.image1, (280, 41))
-
-    def update(self):
-        self.animate()
-
-    def reset(self):
-        self.game.state.reset()
-        self.current_star = 0 # Current star value during animation
-        self.current_star_image = self.zero_star_image # Current star animated
-        self.next_animation_time = 0
-        self.stop_animation = False
-
-    def animate(self):
-        if self.game.win and not self.stop_animation:
-            current_time = pg.time.get_ticks() 
-            if self.current_star < self.game.state.star_rating:
-                if current_time - self.next_animation_time > self.animation_delay: # Display each star at intervals
-                    self.current_star += 1
-                    match self.current_star:
-                        case 0:
-                            self.current_star_image = self.zero_star_image
-                        case 1:
-                            self.current_star_image = self.one_star_image
-                        case 2:
-                            self.current_star_image = self.two_star_image
-                        case 3:
-                            self.current_star_image = self.three_star_image
-                    self.star_sound.play()
-                    self.next_animation_time = current_time
-            else:
-                if current_time - self.next_animation_time > self.animation_delay: # Adds delay between star animation and rest of UI display
-                    self.stop_animation = True
-
-    def buttons_clicked(self):
-        if self.stop_animation:
-            for button in self.buttons:
-                button.clicked()
-
-    def replay_button_clicked(self):
-        self.reset()
-
-    def home_button_clicked(self):
-        self.reset()
-        self.game.state = self.game.play_mode
-
-    def controls_button_clicked(self):
-        print('Controls button clicked.')
-
-class Dijkstra:
-    def __init__(self, maze):
-        self.maze = maze
-
-    def reset_nodes(self): # Resets all nodes' pathfinding attributes
-        for column in self.maze.array:
-            for node in column:
-                node.is_path_visited = False
-                node.distance = float('inf') # Set to infinity
-                node.previous_node = None
-                node.heuristic = 0
-
-    def retrace(self, goal_node): # Outputs the path of nodes from goal node to start node
-        current_node = goal_node
-        path = [goal_node]
-        while current_node.previous_node:
-            current_node = current_node.previous_node
-            path.append(current_node)
-        return path
-
-    def run(self, start_node, goal_node):
-        self.reset_nodes()
-        start_node.distance = 0
-        open_set = []
-        open_set.append(start_node)
-
-        while open_set:
-            closest_node = open_set[0]
-            index = 0
-            for i in range(len(open_set)): # Finds the closest node in the open set
-                if open_set[i].distance < closest_node.distance:
-                    closest_node = open_set[i]
-                    index = i
-            
-            current_node = open_set.pop(index)
-            current_node.is_path_visited = True
-
-            if current_node == goal_node:
-                return self.retrace(goal_node)
-            
-            neighbouring_nodes = self.maze.get_reachable_neighbours(current_node)
-            for i in range(len(neighbouring_nodes)): # Find an unvisited neighbouring node
-                if not neighbouring_nodes[i].is_path_visited:
-                    new_distance = current_node.distance + 1 # Distance from start increases by 1 each square
-                    if new_distance < neighbouring_nodes[i].distance: # Updates the nodes' distance from start
-                        neighbouring_nodes[i].distance = new_distance
-                        neighbouring_nodes[i].previous_node = current_node
-                        open_set.append(neighbouring_nodes[i])
-            
-
-
-
-
-            
-
-
-        
-
-
-    
-
-
-
-        
-
-    
-
-
-
-# Code execution
-new_game = Game()
-new_game.run()
\ No newline at end of file
+import time
+import base64
+import hashlib
+import random
+import argparse
+import multiprocessing
+
+# Runs without a window or a sound device
+os.environ['MAZE_MASTER_HEADLESS'] = '1'
+
+import main
+
+# A maze generated from a fixed seed - if its walls change, Maze.generate has changed and GENERATOR_VERSION must be bumped (then update the digest)
+GENERATOR_CHECK = {'width': 20, 'height': 20, 'seed': 0, 'digest': '036587402b25179181f567d76d2666cf'}
+
+def convert(json_path, pack_path): # Converts a pretty-printed levels.json into a binary level pack
+    with open(json_path, 'r') as f:
+        levels = [main.level_from_json(level) for level in json.load(f)]
+    main.save_level_pack(pack_path, levels)
+    # Reads the pack back to make sure every maze survived the conversion
+    for level, loaded_level in zip(levels, main.load_level_pack(pack_path)):
+        if level != loaded_level:
+            sys.exit(f'Level {level["number"]} changed during conversion')
+    print(f'Converted {len(levels)} levels: {os.path.getsize(json_path):,} bytes -> {os.path.getsize(pack_path):,} bytes ({pack_path})')
+
+def rebuild(pack_path): # Rewrites a level pack in the current format, working out the par values of every level
+    levels = main.load_level_pack(pack_path)
+    for level in levels:
+        level.update(main.get_level_par(level))
+        print(f'Level {level["number"]:>2} ({level["width"]}x{level["height"]}): path {level["path_length"]:>3} cells, par {level["par_moves"]:>3} moves, {level["par_frames"] / main.FPS:.1f} s sliding')
+    main.save_level_pack(pack_path, levels)
+    print(f'Saved {len(levels)} levels to {pack_path}')
+
+def report(pack_path): # Prints the difficulty metrics of every level in a level pack, then the average of each maze size
+    columns = ('solution_length', 'slide_moves', 'dead_ends', 'junctions', 'mean_corridor_length', 'turns', 'branching_factor')
+    headings = ('level', 'size', 'solution', 'slides', 'dead ends', 'junctions', 'corridor', 'turns', 'branching')
+    print(''.join(f'{heading:>10}' for heading in headings))
+    tiers = {}
+    for level in main.load_level_pack(pack_path):
+        metrics = main.get_level_metrics(level)
+        size = f'{level["width"]}x{level["height"]}'
+        tiers.setdefault(size, []).append(metrics)
+        print(f'{level["number"]:>10}{size:>10}' + ''.join(f'{metrics[column]:>10.2f}' if isinstance(metrics[column], float) else f'{metrics[column]:>10}' for column in columns))
+    print()
+    for size, tier in tiers.items():
+        print(f'{"mean":>10}{size:>10}' + ''.join(f'{sum(metrics[column] for metrics in tier) / len(tier):>10.2f}' for column in columns))
+
+def make_candidate(task): # Generates and solves one candidate maze, runs in a worker process
+    size, seed = task
+    maze = main.Maze(size, size, (0, 0), main.MAZE_SURFACE_WIDTH, main.MAZE_SURFACE_HEIGHT, seed = seed)
+    goal_node_pos = (size - 1, size - 1)
+    par_moves, par_frames = maze.solve_par((0, 0), goal_node_pos)
+    return { # Stored as its seed, the walls are regenerated when the level is played
+        'width': size,
+        'height': size,
+        'seed': seed,
+        'path_length': len(maze.run_dijkstra((0, 0), goal_node_pos)),
+        'par_moves': par_moves,
+        'par_frames': par_frames
+    }
+
+def score(candidate): # Harder mazes need more slides, ties are broken by the time spent sliding
+    return (candidate['par_moves'], candidate['par_frames'])
+
+def pick_levels(candidates, count): # Drops mazes with too direct a route, then picks evenly across the rest from easiest to hardest so difficulty ramps up through the tier
+    size = candidates[0]['width']
+    candidates = sorted((candidate for candidate in candidates if candidate['par_moves'] >= size * 2), key = score)
+    if len(candidates) < count:
+        sys.exit(f'Only {len(candidates)} of the {size}x{size} candidates passed the filter, {count} are needed - try more --candidates')
+    if count == 1:
+        return [candidates[-1]]
+    return [candidates[round(i * (len(candidates) - 1) / (count - 1))] for i in range(count)]
+
+def build(pack_path, level_count, tiers, candidates_per_level, seed, processes): # Generates a whole level pack, tier by tier, from a seed
+    start = time.perf_counter()
+    tier_counts = [level_count // len(tiers) + (i < level_count % len(tiers)) for i in range(len(tiers))] # Spreads the levels evenly, earlier tiers take the remainder
+    # Every candidate has its own seed, so the output doesn't depend on how the work is split between processes
+    tasks = [(size, random.Random(f'{seed}:{size}:{i}').getrandbits(32)) for size, count in zip(tiers, tier_counts) for i in range(count * candidates_per_level)]
+    processes = processes or os.cpu_count()
+    pool = multiprocessing.Pool(processes)
+    try:
+        candidates = pool.map(make_candidate, tasks, chunksize = max(1, len(tasks) // (processes * 8))) # Results come back in task order
+    finally: # Workers are left to exit by themselves, as Pygame catches the SIGTERM that Pool.terminate would send
+        pool.close()
+        pool.join()
+    levels = []
+    for size, count in zip(tiers, tier_counts):
+        if not count: # More tiers than levels leaves the last tiers empty
+            continue
+        tier_candidates, candidates = candidates[:count * candidates_per_level], candidates[count * candidates_per_level:]
+        for level in pick_levels(tier_candidates, count):
+            level['number'] = len(levels) + 1
+            levels.append(level)
+    main.save_level_pack(pack_path, levels)
+    elapsed = time.perf_counter() - start
+    print(f'Built {len(levels)} levels from {len(tasks)} candidates in {elapsed:.1f} s: {os.path.getsize(pack_path):,} bytes ({pack_path})')
+
+def generate_walls(width, height, seed):
+    return main.Maze(width, height, (0, 0), main.MAZE_SURFACE_WIDTH, main.MAZE_SURFACE_HEIGHT, seed = seed).array.walls
+
+def check_seeds(pack_path, sizes): # Checks that the same seed always gives a bit-identical wall layout, which seeded levels and recorded runs rely on
+    failures = []
+    walls = generate_walls(GENERATOR_CHECK['width'], GENERATOR_CHECK['height'], GENERATOR_CHECK['seed'])
+    digest = hashlib.blake2b(bytes(walls), digest_size = 16).hexdigest()
+    if digest != GENERATOR_CHECK['digest']:
+        failures.append(f'seed {GENERATOR_CHECK["seed"]} gave walls {digest}, expected {GENERATOR_CHECK["digest"]} - bump GENERATOR_VERSION if Maze.generate changed')
+    rng = random.Random()
+    for size in sizes:
+        seed = rng.getrandbits(32)
+        walls = generate_walls(size, size, seed)
+        random.random() # Nothing else drawing random numbers in between may change the maze
+        if generate_walls(size, size, seed) != walls:
+            failures.append(f'seed {seed} gave a different {size}x{size} maze the second time')
+    levels = [level for level in main.load_level_pack(pack_path) if 'seed' in level]
+    for level in levels: # Seeded levels store no walls, so their regenerated mazes must still have the shortest path the pack was built with
+        maze = main.create_level_maze(level)
+        path_length = maze.get_distance_field((level['width'] - 1, level['height'] - 1)).distance[0] + 1
+        if path_length != level['path_length']:
+            failures.append(f'level {level["number"]} regenerated with a path of {path_length} cells, the pack says {level["path_length"]}')
+    for failure in failures:
+        print(failure)
+    print(f'Checked the generator digest, {len(sizes)} regenerated sizes and {len(levels)} seeded levels: {len(failures)} failures')
+    if failures:
+        sys.exit(1)
+
+def verify_runs(pack_path): # Replays every personal best saved in the data directory, checking each still gets the result it was saved with
+    levels = main.load_level_pack(pack_path)
+    with open(os.path.join(main.DATA_DIR, 'stats.json'), 'r') as f:
+        stats = json.load(f)
+    progress = main.load_progress(levels)
+    runs = [] # (name, saved result, run as text, which replay value the result is)
+    for mode, run in stats.get('best_runs', {}).items():
+        runs.append((f'Endless {mode}', stats['shortest_time'][mode], run, 'elapsed_time'))
+    for mode, level_runs in progress['runs'].items():
+        for number, run in sorted(level_runs.items(), key = lambda item: int(item[0])):
+            runs.append((f'Level {number} {mode}', progress['stars'][mode][int(number) - 1], run, 'star_rating'))
+    failures = 0
+    steps = 0
+    start = time.perf_counter()
+    for name, saved, run, value in runs:
+        data = base64.b64decode(run)
+        try:
+            replay = main.replay_input_log(main.load_input_log(data), levels)
+        except ValueError as error:
+            print(f'{name:<20} could not be replayed: {error}')
+            failures += 1
+            continue
+        steps += replay.steps
+        is_verified = replay.is_finished and getattr(replay, value) == saved
+        failures += not is_verified
+        print(f'{name:<20} {"ok" if is_verified else "MISMATCH":<9}saved {saved:>4}, replayed {getattr(replay, value):>4} ({value}), {replay.steps:>5} steps, {len(replay.log.keys):>4} keys in {len(data):>5} bytes')
+    elapsed = time.perf_counter() - start
+    print(f'Replayed {len(runs)} runs, {steps:,} steps in {elapsed:.2f} s ({steps / elapsed if elapsed else 0:,.0f} steps/s)')
+    if failures:
+        sys.exit(f'{failures} runs did not replay to their saved result')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Maze Master level building tool')
+    commands = parser.add_subparsers(dest = 'command', required = True)
+    convert_parser = commands.add_parser('convert', help = 'convert a levels.json file into a binary level pack')
+    convert_parser.add_argument('json_path', nargs = '?', default = os.path.join(main.DATA_DIR, 'levels.json'))
+    convert_parser.add_argument('pack_path', nargs = '?', default = os.path.join(main.DATA_DIR, 'levels.bin'))
+    par_parser = commands.add_parser('par', help = 'precompute the par values of every level in a level pack')
+    par_parser.add_argument('pack_path', nargs = '?', default = os.path.join(main.DATA_DIR, 'levels.bin'))
+    metrics_parser = commands.add_parser('metrics', help = 'print how hard every level in a level pack is')
+    metrics_parser.add_argument('pack_path', nargs = '?', default = os.path.join(main.DATA_DIR, 'levels.bin'))
+    build_parser = commands.add_parser('build', help = 'generate a new level pack from a seed')
+    build_parser.add_argument('pack_path', nargs = '?', default = os.path.join(main.DATA_DIR, 'levels.bin'))
+    build_parser.add_argument('--levels', type = int, default = 45, help = 'no. levels in the pack')
+    build_parser.add_argument('--tiers', nargs = '+', type = int, default = [15, 20, 30], help = 'maze sizes, from easiest to hardest, with the levels split evenly between them')
+    build_parser.add_argument('--candidates', type = int, default = 4, help = 'mazes generated per level, the best spread of them is kept')
+    build_parser.add_argument('--seed', default = '0', help = 'the same seed always builds the same pack')
+    build_parser.add_argument('--processes', type = int, default = None, help = 'worker processes (default: one per CPU)')
+    runs_parser = commands.add_parser('runs', help = 'replay every saved personal best and check it gets the saved result')
+    runs_parser.add_argument('pack_path', nargs = '?', default = os.path.join(main.DATA_DIR, 'levels.bin'))
+    check_parser = commands.add_parser('check', help = 'check that maze seeds regenerate bit-identical walls')
+    check_parser.add_argument('pack_path', nargs = '?', default = os.path.join(main.DATA_DIR, 'levels.bin'))
+    check_parser.add_argument('--sizes', nargs = '+', type = int, default = [15, 20, 30, 100], help = 'maze sizes to regenerate from random seeds')
+    args = parser.parse_args()
+    if args.command == 'convert':
+        convert(args.json_path, args.pack_path)
+    elif args.command == 'par':
+        rebuild(args.pack_path)
+    elif args.command == 'metrics':
+        report(args.pack_path)
+    elif args.command == 'build':
+        build(args.pack_path, args.levels, args.tiers, args.candidates, args.seed, args.processes)
+    elif args.command == 'runs':
+        verify_runs(args.pack_path)
+    elif args.command == 'check':
+        check_seeds(args.pack_path, args.sizes)
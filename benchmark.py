@@ -0,0 +1,783 @@
+# Performance benchmarks for Maze Master
+# Usage: python benchmark.py [solvers] [bfs] [field] [maze] [draw] [visualiser] [camera] [text] [levels] [saves] [junctions] [par] [jumps] [assets] [seeds] [metrics] [prefetch] [solutions] [timestep] [replay] [speeds] [startup] [frames] [--sizes 100 500] [--repeat 3] [--frames 300] [--output frame_times.json]
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+# Benchmarks run the game in headless mode - no window, no sound device and no FPS cap
+os.environ['MAZE_MASTER_HEADLESS'] = '1'
+
+import main
+
+# Baselines
+def legacy_search(maze, start_node, goal_node, use_heuristic = False): # The original list-scan open set, kept as the baseline for the solver benchmark
+    grid = maze.array
+    grid.reset_pathfinding()
+    heuristic = [0] * grid.size
+    if use_heuristic:
+        for index in range(grid.size):
+            x, y = grid.pos(index)
+            heuristic[index] = abs(x - goal_node.x) + abs(y - goal_node.y)
+    grid.distance[start_node.index] = 0
+    open_set = [start_node.index]
+    while open_set:
+        closest_index = open_set[0]
+        index = 0
+        for i in range(len(open_set)): # Linear scan for the closest node
+            if grid.distance[open_set[i]] + heuristic[open_set[i]] < grid.distance[closest_index] + heuristic[closest_index]:
+                closest_index = open_set[i]
+                index = i
+        current_index = open_set.pop(index)
+        grid.is_path_visited[current_index] = True
+        if current_index == goal_node.index:
+            return main.Dijkstra(maze).retrace(goal_node)
+        for neighbour_index in grid.get_reachable_neighbours(current_index):
+            if not grid.is_path_visited[neighbour_index] and grid.distance[current_index] + 1 < grid.distance[neighbour_index]:
+                grid.distance[neighbour_index] = grid.distance[current_index] + 1
+                grid.previous[neighbour_index] = current_index
+                open_set.append(neighbour_index)
+
+def legacy_target_node(maze, pos, direction): # The original cell-by-cell slide, kept as the baseline for the jump table benchmark
+    x, y = pos
+    walls = maze.array.walls
+    height = maze.height
+    match direction:
+        case 'north':
+            while not walls[x * height + y] & main.TOP:
+                y -= 1
+                if (walls[x * height + y] & (main.LEFT | main.RIGHT)) != main.LEFT | main.RIGHT:
+                    return (x, y)
+        case 'east':
+            while not walls[x * height + y] & main.RIGHT:
+                x += 1
+                if (walls[x * height + y] & (main.TOP | main.BOTTOM)) != main.TOP | main.BOTTOM:
+                    return (x, y)
+        case 'south':
+            while not walls[x * height + y] & main.BOTTOM:
+                y += 1
+                if (walls[x * height + y] & (main.LEFT | main.RIGHT)) != main.LEFT | main.RIGHT:
+                    return (x, y)
+        case 'west':
+            while not walls[x * height + y] & main.LEFT:
+                x -= 1
+                if (walls[x * height + y] & (main.TOP | main.BOTTOM)) != main.TOP | main.BOTTOM:
+                    return (x, y)
+    return (x, y)
+
+class LegacyNode: # The original per-cell object, kept as the baseline for the maze representation benchmark
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.is_visited = False
+        self.is_path_visited = False
+        self.walls = {'top':True, 'bottom':True, 'left':True, 'right':True}
+        self.distance = float('inf')
+        self.previous_node = None
+        self.heuristic = 0
+
+def legacy_grid(walls_dict): # Builds the original 2D array of Node objects from a maze layout
+    array = []
+    for x in range(len(walls_dict)):
+        array.append([])
+        for y in range(len(walls_dict[x])):
+            node = LegacyNode(x, y)
+            node.walls = dict(walls_dict[x][y])
+            array[x].append(node)
+    return array
+
+# Helpers
+def measure_memory(function, *args): # Returns the bytes still allocated by the result of a call
+    tracemalloc.start()
+    result = function(*args)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory, result
+
+def time_call(function, *args, repeat = 1): # Returns the best wall time in seconds and the result of the last call
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run_all_frames(solver): # Steps a visualiser solver until it finishes, returning the path
+    while True:
+        output = solver.run_frame()
+        if isinstance(output, list):
+            return output
+        if output:
+            return None
+
+def positions(path): # Converts a list of nodes into a list of (x, y) tuples for comparisons
+    return [(node.x, node.y) for node in path]
+
+def percentile(sorted_values, fraction): # Nearest-rank percentile of an already sorted list
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def print_row(*columns):
+    print(''.join(f'{column:>16}' for column in columns))
+
+# Maze layouts
+def open_maze(size): # A maze with every inner wall removed - open rooms give the largest open sets
+    maze = main.Maze(size, size, (0, 0), 575, 575)
+    for x in range(size):
+        for y in range(size):
+            maze.array[x][y].walls = {'top': y == 0, 'bottom': y == size - 1, 'left': x == 0, 'right': x == size - 1}
+    return maze
+
+LAYOUTS = {
+    'dfs': lambda size: main.Maze(size, size, (0, 0), 575, 575), # Perfect maze from Maze.generate
+    'open': open_maze
+}
+
+# Benchmarks
+def bench_solvers(sizes, repeat):
+    print(f'Solvers (seconds, best of {repeat} - list scan vs binary heap)')
+    print_row('maze', 'layout', 'solver', 'list scan', 'heap', 'speed-up')
+    for size in sizes:
+        for layout, make_maze in LAYOUTS.items():
+            maze = make_maze(size)
+            start_pos = (0, 0)
+            goal_pos = (size - 1, size - 1)
+            start_node = maze.array[start_pos[0]][start_pos[1]]
+            goal_node = maze.array[goal_pos[0]][goal_pos[1]]
+
+            legacy_time, legacy_path = time_call(legacy_search, maze, start_node, goal_node, repeat = repeat)
+            heap_time, path = time_call(main.Dijkstra(maze).run, start_node, goal_node, repeat = repeat)
+            assert positions(path) == positions(legacy_path), 'heap Dijkstra changed the path'
+            print_row(f'{size}x{size}', layout, 'Dijkstra run', f'{legacy_time:.4f}', f'{heap_time:.4f}', f'{legacy_time / heap_time:.1f}x')
+
+            heap_time, path = time_call(lambda: run_all_frames(maze.setup_dijkstra(start_pos, goal_pos)), repeat = repeat)
+            assert positions(path) == positions(legacy_path), 'heap Dijkstra frames changed the path'
+            print_row(f'{size}x{size}', layout, 'Dijkstra frames', f'{legacy_time:.4f}', f'{heap_time:.4f}', f'{legacy_time / heap_time:.1f}x')
+
+            legacy_time, legacy_path = time_call(legacy_search, maze, start_node, goal_node, True, repeat = repeat)
+            heap_time, path = time_call(lambda: run_all_frames(maze.setup_astar(start_pos, goal_pos)), repeat = repeat)
+            assert positions(path) == positions(legacy_path), 'heap A* frames changed the path'
+            print_row(f'{size}x{size}', layout, 'A* frames', f'{legacy_time:.4f}', f'{heap_time:.4f}', f'{legacy_time / heap_time:.1f}x')
+
+def bench_bfs(sizes, repeat):
+    print(f'Unit-cost solvers (nodes expanded and seconds, best of {repeat})')
+    print_row('maze', 'layout', 'solver', 'expanded', 'seconds', 'vs Dijkstra')
+    for size in sizes:
+        for layout, make_maze in LAYOUTS.items():
+            maze = make_maze(size)
+            start_pos = (0, 0)
+            goal_pos = (size - 1, size - 1)
+            start_node = maze.array[start_pos[0]][start_pos[1]]
+            goal_node = maze.array[goal_pos[0]][goal_pos[1]]
+            solvers = [
+                ('Dijkstra run', lambda: main.Dijkstra(maze).run(start_node, goal_node)),
+                ('BFS run', lambda: maze.run_bfs(start_pos, goal_pos)),
+                ('Bi-BFS run', lambda: maze.run_bidirectional_bfs(start_pos, goal_pos)),
+                ('Dijkstra frames', lambda: run_all_frames(maze.setup_dijkstra(start_pos, goal_pos))),
+                ('A* frames', lambda: run_all_frames(maze.setup_astar(start_pos, goal_pos))),
+                ('BFS frames', lambda: run_all_frames(maze.setup_bfs(start_pos, goal_pos))),
+                ('Bi-BFS frames', lambda: run_all_frames(maze.setup_bidirectional_bfs(start_pos, goal_pos)))
+            ]
+            dijkstra_time = None
+            for name, solve in solvers:
+                solve_time, path = time_call(solve, repeat = repeat)
+                assert len(path) == len(maze.run_dijkstra(start_pos, goal_pos)), f'{name} found a longer path'
+                dijkstra_time = dijkstra_time or solve_time
+                print_row(f'{size}x{size}', layout, name, maze.array.is_path_visited.count(1), f'{solve_time:.4f}', f'{dijkstra_time / solve_time:.1f}x')
+            maze.run_dijkstra(start_pos, goal_pos)
+            solve_time, _ = time_call(maze.run_dijkstra, start_pos, goal_pos, repeat = repeat)
+            print_row(f'{size}x{size}', layout, 'junction graph', maze.get_junction_graph().expanded, f'{solve_time:.4f}', f'{dijkstra_time / solve_time:.1f}x')
+
+def bench_field(sizes, repeat):
+    queries = 100
+    print(f'Distance field (us per query over {queries} random cells, best of {repeat} - searching every query vs the goal-rooted distance field)')
+    print_row('maze', 'query', 'search', 'field', 'speed-up', 'build (ms)')
+    for size in [20, 30] + sizes:
+        maze = main.Maze(size, size, (0, 0), 575, 575)
+        goal_pos = (size - 1, size - 1)
+        cells = [(random.randrange(size), random.randrange(size)) for _ in range(queries)]
+        build_time, field = time_call(main.DistanceField, maze, maze.array.index(*goal_pos), repeat = repeat)
+        search_time, paths = time_call(lambda: [maze.run_bfs(cell, goal_pos) for cell in cells], repeat = repeat)
+        field_time, field_paths = time_call(lambda: [field.path_from(maze.array.index(*cell)) for cell in cells], repeat = repeat)
+        assert [len(path) for path in paths] == [len(path) for path in field_paths], 'distance field path is not a shortest path'
+        print_row(f'{size}x{size}', 'solution', f'{search_time / queries * 1e6:.1f}', f'{field_time / queries * 1e6:.1f}', f'{search_time / field_time:.0f}x', f'{build_time * 1000:.2f}')
+        field_time, distances = time_call(lambda: [field.distance[maze.array.index(*cell)] for cell in cells], repeat = repeat)
+        assert distances == [len(path) - 1 for path in paths], 'distance field distance is wrong'
+        print_row(f'{size}x{size}', 'distance left', f'{search_time / queries * 1e6:.1f}', f'{field_time / queries * 1e6:.2f}', f'{search_time / field_time:.0f}x', '')
+
+def bench_maze(sizes, repeat):
+    print(f'Maze representation (best of {repeat} - Node objects with wall dicts vs CompactMaze)')
+    print_row('maze', 'measure', 'Node grid', 'CompactMaze', 'ratio')
+    for size in sizes:
+        random.seed(size)
+        compact_memory, maze = measure_memory(main.Maze, size, size, (0, 0), 575, 575)
+        walls_dict = maze.to_dict()
+        legacy_memory, array = measure_memory(legacy_grid, walls_dict)
+        print_row(f'{size}x{size}', 'memory (MB)', f'{legacy_memory / 1e6:.2f}', f'{compact_memory / 1e6:.2f}', f'{legacy_memory / compact_memory:.1f}x')
+
+        def legacy_read(): # Counts open walls through the wall dicts
+            return sum(not node.walls[side] for column in array for node in column for side in ('top', 'bottom', 'left', 'right'))
+        def compact_read(): # Counts open walls through the wall masks
+            return sum(not mask & flag for mask in maze.array.walls for flag in (main.TOP, main.BOTTOM, main.LEFT, main.RIGHT))
+        legacy_time, legacy_count = time_call(legacy_read, repeat = repeat)
+        compact_time, compact_count = time_call(compact_read, repeat = repeat)
+        assert legacy_count == compact_count, 'wall masks differ from the wall dicts'
+        print_row(f'{size}x{size}', 'read walls (s)', f'{legacy_time:.4f}', f'{compact_time:.4f}', f'{legacy_time / compact_time:.1f}x')
+
+        generate_time, _ = time_call(main.Maze, size, size, (0, 0), 575, 575, repeat = repeat)
+        load_time, _ = time_call(main.Maze, size, size, (0, 0), 575, 575, walls_dict, repeat = repeat)
+        print_row(f'{size}x{size}', 'generate (s)', '', f'{generate_time:.4f}', '')
+        print_row(f'{size}x{size}', 'load dict (s)', '', f'{load_time:.4f}', '')
+
+def bench_draw(repeat):
+    screen = main.pg.display.set_mode((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    frames = 60
+    print(f'Maze drawing (ms per frame, best of {repeat} x {frames} frames - redrawing every wall vs cached wall surface)')
+    print_row('maze', 'every wall', 'cached', 'speed-up')
+    for size in (15, 20, 30, 50):
+        maze = main.Maze(size, size, (353, 101), 575, 575)
+        def redraw(): # The per-frame cost before the wall surface was cached
+            for _ in range(frames):
+                maze.draw_walls(screen)
+                maze.draw_border(screen)
+        def cached():
+            for _ in range(frames):
+                maze.draw(screen)
+        redraw_time, _ = time_call(redraw, repeat = repeat)
+        cached_time, _ = time_call(cached, repeat = repeat)
+        print_row(f'{size}x{size}', f'{redraw_time * 1000 / frames:.3f}', f'{cached_time * 1000 / frames:.3f}', f'{redraw_time / cached_time:.1f}x')
+
+def bench_visualiser(repeat):
+    screen = main.pg.display.set_mode((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    print(f'Visualiser drawing (ms per search step, best of {repeat} - repainting every cell vs repainting changed cells)')
+    print_row('maze', 'every cell', 'changed cells', 'speed-up')
+    for size in (20, 50):
+        maze = main.Maze(size, size, (353, 73), 575, 575)
+        def animate(full_repaint): # Runs a whole search, drawing the maze after every step like EducationMode does
+            solver = maze.setup_dijkstra((0, 0), (size - 1, size - 1))
+            steps = 0
+            while not solver.run_frame():
+                if full_repaint:
+                    maze.overlay = None # Forces every cell to be repainted
+                maze.draw(screen, solver)
+                steps += 1
+            return steps
+        full_time, steps = time_call(animate, True, repeat = repeat)
+        changed_time, _ = time_call(animate, False, repeat = repeat)
+        print_row(f'{size}x{size}', f'{full_time * 1000 / steps:.3f}', f'{changed_time * 1000 / steps:.3f}', f'{full_time / changed_time:.1f}x')
+
+def bench_speeds():
+    print('Visualiser speeds (Dijkstra\'s played one simulation step per frame - game time to finish the search and path animation, and the most steps per second the speed label measured; Max used to run one step a frame, 60 steps/s)')
+    print_row('maze', 'speed', 'game time (s)', 'steps/s', 'real time (s)')
+    game = main.Game()
+    education = game.education_mode
+    game.state = education
+    for size, speed in ((50, '10x'), (50, '100x'), (50, 'Max'), (200, 'Max')):
+        education.speed = [label for label, rate in education.speeds].index(speed)
+        education.maze = main.Maze(size, size, education.maze_surface_pos, education.maze_surface_width, education.maze_surface_height, seed = 0)
+        education.goal_node_pos = (size - 1, size - 1)
+        education.replay_button_clicked()
+        steps_per_second = 0
+        updates = 0
+        start = time.perf_counter()
+        while not education.stop_path_animation:
+            game.run_frame([])
+            updates += 1
+            steps_per_second = max(steps_per_second, education.animation_stepper.get_steps_per_second())
+        print_row(f'{size}x{size}', speed, f'{updates / main.FPS:.2f}', f'{steps_per_second:,}', f'{time.perf_counter() - start:.2f}')
+
+def bench_camera(frames):
+    screen = main.pg.display.set_mode((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    size = main.MAX_MAZE_SIZE
+    print(f'Camera (ms per frame over {frames} frames of panning a {size}x{size} maze while BFS runs 50 steps a frame, zooming in half-way)')
+    print_row('measure', 'value')
+    start = time.perf_counter()
+    maze = main.Maze(size, size, (353, 73), 575, 575, seed = 0)
+    print_row('generate (s)', f'{time.perf_counter() - start:.2f}')
+    solver = maze.setup_bfs((0, 0), (size - 1, size - 1))
+    frame_times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        if frame == frames // 2:
+            maze.zoom(maze.cell_size * 2, maze.viewport.center)
+        maze.pan(-main.CAMERA_SPEED, -main.CAMERA_SPEED // 2)
+        for _ in range(50):
+            solver.run_frame()
+        screen.fill(main.BLACK)
+        maze.draw(screen, solver)
+        frame_times.append((time.perf_counter() - start) * 1000)
+    frame_times.sort()
+    print_row('median', f'{frame_times[len(frame_times) // 2]:.2f}')
+    print_row('95th percentile', f'{frame_times[len(frame_times) * 95 // 100]:.2f}')
+    print_row('worst', f'{frame_times[-1]:.2f}')
+    stats = maze.chunks.get_stats()
+    wall_thickness = max(maze.cell_size // 12, 1)
+    print_row('chunks drawn', stats['misses'])
+    print_row('chunks evicted', stats['evictions'])
+    print_row('chunk hit rate', f'{stats["hit_rate"]:.1%}')
+    print_row('chunks (MB)', f'{stats["chunk_bytes"] / 1e6:.1f}')
+    print_row('one surface (MB)', f'{(size * maze.cell_size + 2 * wall_thickness) ** 2 * 4 / 1e6:.1f}') # What a single pre-rendered wall surface of the whole maze would need
+
+def bench_text(repeat):
+    game = main.Game()
+    frames = 60
+    screens = {
+        'title screen': lambda: game.title_screen,
+        'play mode': lambda: game.play_mode,
+        'levels select': lambda: game.levels_game_mode,
+        'visualiser': lambda: game.education_mode,
+        'endless': lambda: game.endless_game_mode
+    }
+    print(f'Text rendering (per frame, over {frames} frames after one warm-up frame)')
+    print_row('screen', 'draw_text calls', 'font renders', 'hit rate')
+    for name, get_state in screens.items():
+        game.state = get_state()
+        if game.state == game.endless_game_mode:
+            game.state.reset()
+        game.state.draw() # Warm-up frame
+        main.text_cache.hits = 0
+        main.text_cache.misses = 0
+        for _ in range(frames):
+            game.state.draw()
+            game.state.update()
+        stats = main.text_cache.get_stats()
+        print_row(name, f'{(stats["hits"] + stats["misses"]) / frames:.1f}', f'{stats["misses"] / frames:.2f}', f'{stats["hit_rate"]:.1%}')
+
+def write_levels_json(path, levels): # Writes levels in the old levels.json format, where each cell's walls are a dictionary
+    with open(path, 'w') as f:
+        json.dump([{'number': level['number'], 'maze': [[dict(node.walls) for node in column] for column in main.create_level_maze(level).array]} for level in levels], f, indent = 4)
+
+def bench_levels(json_path, repeat):
+    pack_path = os.path.join(main.DATA_DIR, 'levels.bin')
+    with tempfile.TemporaryDirectory() as directory:
+        if json_path is None: # levels.json is no longer shipped, so the comparison is against the level pack written out in the old format
+            json_path = os.path.join(directory, 'levels.json')
+            write_levels_json(json_path, main.load_level_pack(pack_path))
+            print(f'Level loading (best of {repeat} - levels.json rebuilt from levels.bin vs binary level pack)')
+        else:
+            print(f'Level loading (best of {repeat} - {json_path} vs binary level pack)')
+        compare_levels(json_path, pack_path, repeat)
+
+def compare_levels(json_path, pack_path, repeat):
+    print_row('measure', 'levels.json', 'levels.bin', 'ratio')
+    json_size = os.path.getsize(json_path)
+    pack_size = os.path.getsize(pack_path)
+    print_row('file size (KB)', f'{json_size / 1000:.1f}', f'{pack_size / 1000:.1f}', f'{json_size / pack_size:.0f}x')
+
+    def load_json():
+        with open(json_path, 'r') as f:
+            return json.load(f)
+    json_time, json_levels = time_call(load_json, repeat = repeat)
+    pack_time, pack_levels = time_call(main.load_level_pack, pack_path, repeat = repeat)
+    assert [main.level_from_json(level)['walls'] for level in json_levels] == [main.create_level_maze(level).array.walls for level in pack_levels], 'level pack differs from levels.json'
+    print_row('load all (ms)', f'{json_time * 1000:.2f}', f'{pack_time * 1000:.2f}', f'{json_time / pack_time:.0f}x')
+
+    # Builds the largest level's maze like LevelsGameMode.play_level does
+    json_level = json_levels[-1]
+    pack_level = pack_levels[-1]
+    json_time, _ = time_call(lambda: main.Maze(len(json_level['maze']), len(json_level['maze'][0]), (0, 0), 575, 575, json_level['maze']), repeat = repeat)
+    pack_time, _ = time_call(main.create_level_maze, pack_level, repeat = repeat)
+    print_row('load level (us)', f'{json_time * 1e6:.0f}', f'{pack_time * 1e6:.0f}', f'{json_time / pack_time:.0f}x')
+
+    # Time spent on the game loop when a star record improves - rewriting levels.json vs queueing a progress.json save
+    with tempfile.TemporaryDirectory() as directory:
+        def save_json():
+            with open(os.path.join(directory, 'levels.json'), 'w') as f:
+                json.dump(json_levels, f, indent = 4)
+        progress = main.load_progress(pack_levels, directory) # Starts a fresh progress file in the temporary directory, never touching the player's
+        json_time, _ = time_call(save_json, repeat = repeat)
+        pack_time, _ = time_call(main.persistence.save_json, os.path.join(directory, 'progress.json'), progress, repeat = repeat)
+        main.persistence.flush() # Waits for the background saves to finish before the directory is removed
+    print_row('save stars (ms)', f'{json_time * 1000:.2f}', f'{pack_time * 1000:.2f}', f'{json_time / pack_time:.0f}x')
+
+def bench_saves(repeat):
+    clicks = 50
+    print(f'Saving (ms on the game loop per save, best of {repeat} x {clicks} rapid saves - writing on the game loop vs the persistence worker)')
+    print_row('file', 'game loop', 'worker', 'files written')
+    files = {
+        'settings.json': {'mute_sfx': False, 'sfx_volume': 1.0, 'mute_music': False, 'music_volume': 1.0},
+        'stats.json': {'shortest_time': {'normal': 11, 'darkness': 21}, 'best_streak': {'normal': 2, 'darkness': 2}}
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for filename, data in files.items():
+            path = os.path.join(directory, filename)
+            def save_on_game_loop(): # Like clicking through the volume bar before saves moved off the game loop
+                for _ in range(clicks):
+                    main.write_text_atomic(path, json.dumps(data, indent = 4))
+            def save_on_worker():
+                for _ in range(clicks):
+                    main.persistence.save_json(path, data)
+            loop_time, _ = time_call(save_on_game_loop, repeat = repeat)
+            main.persistence.writes = 0
+            worker_time, _ = time_call(save_on_worker, repeat = repeat)
+            main.persistence.flush()
+            print_row(filename, f'{loop_time * 1000 / clicks:.3f}', f'{worker_time * 1000 / clicks:.3f}', f'{main.persistence.writes} of {clicks * repeat}')
+
+def bench_assets(repeat):
+    main.assets = main.AssetCache() # Counts from an empty cache, as if the game had just started
+    game = main.Game()
+    start = time.perf_counter()
+    for name in game.state_classes: # Instantiates every state, like opening every screen once
+        getattr(game, name)
+    elapsed = time.perf_counter() - start
+    stats = main.assets.get_stats()
+    requests = stats['hits'] + stats['decoded']
+    print('Asset cache (after instantiating every game state)')
+    print_row('measure', 'value')
+    print_row('image requests', requests) # Every request decoded an image file before the asset cache
+    print_row('images decoded', stats['decoded'])
+    print_row('hit rate', f'{stats["hit_rate"]:.1%}')
+    print_row('images (MB)', f'{stats["image_bytes"] / 1e6:.2f}')
+    print_row('masks (KB)', f'{stats["mask_bytes"] / 1000:.1f}')
+    print_row('all states (ms)', f'{elapsed * 1000:.0f}')
+
+def bench_jumps(sizes, repeat):
+    directions = ('north', 'east', 'south', 'west')
+    print(f'Slides (us per Maze.target_node call over every cell and direction, best of {repeat} - walking cell by cell vs jump table)')
+    print_row('maze', 'layout', 'walk', 'jump table', 'speed-up', 'build (ms)')
+    level = main.load_level_pack(os.path.join(main.DATA_DIR, 'levels.bin'))[-1]
+    mazes = [('level 45', main.Maze(level['width'], level['height'], (0, 0), 575, 575, wall_masks = level['walls']))]
+    for size in sizes:
+        mazes.append(('dfs', main.Maze(size, size, (0, 0), 575, 575)))
+        # A maze of vertical corridors joined only along the bottom row, so north/south slides cross the whole maze
+        corridors = main.Maze(size, size, (0, 0), 575, 575)
+        for x in range(size):
+            for y in range(size):
+                corridors.array.set_walls(x * size + y, {'top': y == 0, 'bottom': y == size - 1, 'left': y < size - 1 or x == 0, 'right': y < size - 1 or x == size - 1})
+        mazes.append(('corridors', corridors))
+    for layout, maze in mazes:
+        slides = [(x, y, direction) for x in range(maze.width) for y in range(maze.height) for direction in directions]
+        def walk():
+            return [legacy_target_node(maze, (x, y), direction) for x, y, direction in slides]
+        def jump():
+            return [maze.target_node((x, y), direction) for x, y, direction in slides]
+        build_time, _ = time_call(maze.build_jump_table, repeat = repeat)
+        maze.get_jump_table()
+        walk_time, walk_stops = time_call(walk, repeat = repeat)
+        jump_time, jump_stops = time_call(jump, repeat = repeat)
+        assert walk_stops == jump_stops, 'jump table stops differ from walking'
+        print_row(f'{maze.width}x{maze.height}', layout, f'{walk_time * 1e6 / len(slides):.2f}', f'{jump_time * 1e6 / len(slides):.2f}', f'{walk_time / jump_time:.1f}x', f'{build_time * 1000:.2f}')
+
+def bench_junctions(sizes, repeat):
+    print(f'Junction graph (best of {repeat} - Dijkstra over every cell vs over junctions and dead ends)')
+    print_row('maze', 'layout', 'measure', 'cells', 'junctions', 'ratio')
+    for size in sizes:
+        for layout, make_maze in LAYOUTS.items():
+            maze = make_maze(size)
+            grid = maze.array
+            start_node = grid[0][0]
+            goal_node = grid[size - 1][size - 1]
+            build_time, graph = time_call(main.JunctionGraph, maze, repeat = repeat)
+            cell_time, cell_path = time_call(main.Dijkstra(maze).run, start_node, goal_node, repeat = repeat)
+            cell_expanded = grid.is_path_visited.count(1)
+            graph_time, path = time_call(graph.shortest_path, start_node.index, goal_node.index, repeat = repeat)
+            if layout == 'dfs': # A perfect maze has one path, so both searches must agree cell for cell
+                assert path == [node.index for node in cell_path], 'junction graph changed the path'
+            else: # Open rooms have many shortest paths, which may be broken differently
+                assert len(path) == len(cell_path), 'junction graph path is not the shortest'
+            print_row(f'{size}x{size}', layout, 'nodes', grid.size, len(graph.adjacent), f'{grid.size / len(graph.adjacent):.1f}x')
+            print_row(f'{size}x{size}', layout, 'expanded', cell_expanded, graph.expanded, f'{cell_expanded / graph.expanded:.1f}x')
+            print_row(f'{size}x{size}', layout, 'search (ms)', f'{cell_time * 1000:.2f}', f'{graph_time * 1000:.2f}', f'{cell_time / graph_time:.1f}x')
+            print_row(f'{size}x{size}', layout, 'build (ms)', '', f'{build_time * 1000:.2f}', '')
+
+def bench_par(sizes, repeat):
+    print(f'Par solver (best of {repeat} - solving the slide graph vs reading the cached/precomputed values)')
+    print_row('maze', 'path (cells)', 'par (moves)', 'solve (ms)', 'cached (us)')
+    levels = main.load_level_pack(os.path.join(main.DATA_DIR, 'levels.bin'))
+    mazes = [(f'level {level["number"]}', main.Maze(level['width'], level['height'], (0, 0), main.MAZE_SURFACE_WIDTH, main.MAZE_SURFACE_HEIGHT, wall_masks = level['walls'])) for level in (levels[0], levels[-1])]
+    mazes += [(f'{size}x{size}', main.Maze(size, size, (0, 0), main.MAZE_SURFACE_WIDTH, main.MAZE_SURFACE_HEIGHT)) for size in sizes]
+    for name, maze in mazes:
+        start = (0, 0)
+        goal = (maze.width - 1, maze.height - 1)
+        solve_time, (moves, frames) = time_call(maze.find_par, maze.array.index(*start), maze.array.index(*goal), main.PLAYER_SPEED, repeat = repeat)
+        maze.solve_par(start, goal)
+        cached_time, _ = time_call(maze.solve_par, start, goal, repeat = repeat)
+        print_row(name, len(maze.run_dijkstra(start, goal)), moves, f'{solve_time * 1000:.2f}', f'{cached_time * 1e6:.2f}')
+
+def bench_seeds(sizes, repeat):
+    print(f'Seeded mazes (ms per maze, best of {repeat} - regenerating from a seed vs unpacking stored wall masks)')
+    print_row('maze', 'stored (bytes)', 'seeded (bytes)', 'load', 'regenerate')
+    seeded_size = main.LEVEL_RECORD_HEADERS[main.LEVEL_PACK_VERSION].size
+    for size in [15, 20, 30] + sizes:
+        seed = random.getrandbits(32)
+        walls = main.Maze(size, size, (0, 0), 575, 575, seed = seed).array.walls # That seeds regenerate bit-identical walls is checked by 'python "JSON File Compiler.py" check'
+        packed = main.pack_walls(walls)
+        load_time, _ = time_call(lambda: main.Maze(size, size, (0, 0), 575, 575, wall_masks = main.unpack_walls(packed, size * size)), repeat = repeat)
+        regenerate_time, _ = time_call(lambda: main.Maze(size, size, (0, 0), 575, 575, seed = seed), repeat = repeat)
+        print_row(f'{size}x{size}', f'{seeded_size + len(packed):,}', seeded_size, f'{load_time * 1000:.2f}', f'{regenerate_time * 1000:.2f}')
+
+def bench_metrics(repeat):
+    count = 100
+    print(f'Difficulty metrics (mazes scored per second from their wall masks, over {count} mazes, best of {repeat})')
+    print_row('maze', 'all metrics', 'wall counts')
+    for size in (15, 20, 30):
+        levels = [{'width': size, 'height': size, 'walls': main.Maze(size, size, (0, 0), 575, 575).array.walls} for _ in range(count)]
+        metrics_time, _ = time_call(lambda: [main.get_level_metrics(level) for level in levels], repeat = repeat)
+        # Dead ends and junctions alone, counted from the translated wall masks without building a Maze
+        counts_time, _ = time_call(lambda: [(level['walls'].translate(main.OPEN_SIDES).count(1), level['walls'].translate(main.OPEN_SIDES).count(3)) for level in levels], repeat = repeat)
+        print_row(f'{size}x{size}', f'{count / metrics_time:,.0f}', f'{count / counts_time:,.0f}')
+
+def bench_solutions(repeat):
+    levels = main.load_level_pack(os.path.join(main.DATA_DIR, 'levels.bin'))
+    print(f'Solution cache (us per level opened, over all {len(levels)} levels, best of {repeat} - building the distance field every time vs the cache tiers, called like LevelsGameMode.solve_maze)')
+    print_row('tier', 'per level', 'speed-up', 'hits', 'misses')
+
+    def open_levels(get_cache, get_field): # Gets the distance field of a fresh maze of every level, like LevelsGameMode.play_level does, timing only that
+        best = float('inf')
+        for _ in range(repeat):
+            cache = get_cache()
+            mazes = [main.create_level_maze(level) for level in levels]
+            start = time.perf_counter()
+            fields = [get_field(cache, maze, level) for maze, level in zip(mazes, levels)]
+            best = min(best, time.perf_counter() - start)
+            main.persistence.flush() # Writes the disk tier outside the timed part, as the game does on its worker thread
+        return best / len(levels), fields, cache.get_stats()
+
+    def get_field(cache, maze, level):
+        return cache.get_distance_field(maze, (0, 0), (maze.width - 1, maze.height - 1), level)
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_time, built, _ = open_levels(lambda: main.SolutionCache(directory), lambda cache, maze, level: maze.get_distance_field((maze.width - 1, maze.height - 1)))
+        print_row('build', f'{build_time * 1e6:.0f}', '', '', '')
+        warm_cache = main.SolutionCache(directory)
+        for level in levels: # Fills the disk tier and the memory tier of warm_cache before anything is timed, so every tier hits even with --repeat 1
+            get_field(warm_cache, main.create_level_maze(level), level)
+        main.persistence.flush()
+        warm_cache.memory_hits = warm_cache.disk_hits = warm_cache.misses = 0 # Only the timed runs are counted
+        tiers = (
+            ('miss', lambda: main.SolutionCache(tempfile.mkdtemp(dir = directory))), # Empty in memory and on disk
+            ('disk', lambda: main.SolutionCache(directory)), # Empty in memory, filled on disk
+            ('memory', lambda: warm_cache)
+        )
+        for name, get_cache in tiers:
+            field_time, fields, stats = open_levels(get_cache, get_field)
+            assert [field.next for field in fields] == [field.next for field in built], f'{name} tier gave a different distance field'
+            assert [field.distance[0] + 1 for field in fields] == [level['path_length'] for level in levels], f'{name} tier disagrees with the level pack path lengths'
+            print_row(name, f'{field_time * 1e6:.0f}', f'{build_time / field_time:.1f}x', stats['memory_hits'] + stats['disk_hits'], stats['misses'])
+
+def bench_timestep():
+    seconds = 5
+    print(f'Fixed timestep (player speed in px per real second over {seconds} s of play - one update per rendered frame vs the fixed-timestep accumulator)')
+    print_row('render rate', 'per frame', 'fixed step', 'game time (s)')
+    game = main.Game()
+    maze = main.Maze(30, 30, (353, 101), 575, 575, seed = 0)
+    goal_pos = (maze.width - 1, maze.height - 1)
+    field = maze.get_distance_field(goal_pos)
+    directions = {(0, -1): main.pg.K_UP, (0, 1): main.pg.K_DOWN, (-1, 0): main.pg.K_LEFT, (1, 0): main.pg.K_RIGHT}
+    scenarios = { # Render frame times in seconds
+        '30 fps': [1 / 30] * (30 * seconds),
+        '60 fps': [1 / 60] * (60 * seconds),
+        '144 fps': [1 / 144] * (144 * seconds),
+        '60 fps, stutters': [0.1 if frame % 10 == 0 else 1 / 60 for frame in range(60 * seconds * 10 // 15)] # Every 10th frame takes 100 ms
+    }
+
+    def play(frame_times, fixed): # Slides along a shortest path to the goal, returning the distance travelled and game time passed
+        player = main.Player(game, maze)
+        timestep = main.FixedTimestep()
+        start_ticks = game.ticks
+        distance = 0
+        for frame_time in frame_times:
+            steps = timestep.advance(frame_time)[0] if fixed else 1
+            for _ in range(steps):
+                cell = maze.array.index(player.x, player.y)
+                if not player.is_moving and field.next[cell] != -1:
+                    (x1, y1), (x2, y2) = maze.array.pos(cell), maze.array.pos(field.next[cell])
+                    game.key_pressed = directions[(x2 - x1, y2 - y1)]
+                player.update()
+                game.ticks += main.TIMESTEP * 1000
+                game.key_pressed = None
+                distance += abs(player.px[0] - player.previous_px[0]) + abs(player.px[1] - player.previous_px[1])
+        return distance, (game.ticks - start_ticks) / 1000
+
+    for name, frame_times in scenarios.items():
+        real_time = sum(frame_times)
+        per_frame_distance, _ = play(frame_times, False)
+        fixed_distance, game_time = play(frame_times, True)
+        print_row(name, f'{per_frame_distance / real_time:.0f}', f'{fixed_distance / real_time:.0f}', f'{game_time:.2f}')
+
+def bench_replay(repeat):
+    print('Input log replay (an Endless run played through Game.run_frame with rendering, then re-simulated headless from its packed input log - replays include rebuilding and solving the maze)')
+    game = main.Game()
+    game.play_mode.endless_button_clicked()
+    endless = game.endless_game_mode
+    field = endless.maze.get_distance_field(endless.goal_node_pos)
+    directions = {(0, -1): main.pg.K_UP, (0, 1): main.pg.K_DOWN, (-1, 0): main.pg.K_LEFT, (1, 0): main.pg.K_RIGHT}
+    rng = random.Random(0)
+    start = time.perf_counter()
+    while not game.win: # Presses a key on a third of the frames the player is stopped on, one in five a random one
+        events = []
+        if not endless.player.is_moving and rng.random() < 0.3:
+            cell = endless.maze.array.index(endless.player.x, endless.player.y)
+            (x1, y1), (x2, y2) = endless.maze.array.pos(cell), endless.maze.array.pos(field.next[cell])
+            key_code = rng.choice(list(directions.values())) if rng.random() < 0.2 else directions[(x2 - x1, y2 - y1)]
+            events.append(main.pg.event.Event(main.pg.KEYDOWN, key = key_code))
+        game.run_frame(events)
+    played = time.perf_counter() - start
+    data = endless.input_log.to_bytes()
+    log = main.load_input_log(data)
+    assert log.keys == endless.input_log.keys and log.steps == endless.steps, 'input log changed when packed'
+    replay_time, replay = time_call(main.replay_input_log, log, [], repeat = repeat)
+    assert (replay.is_finished, replay.steps, replay.elapsed_time, replay.star_rating, replay.player.moves) == (True, endless.steps, endless.elapsed_time, endless.star_rating, endless.player.moves), 'replay got a different result'
+    ghost_time, replay = time_call(main.replay_input_log, log, [], True, repeat = repeat)
+    assert len(replay.ghost) == replay.steps
+    print(f'{endless.steps} steps ({endless.elapsed_time} s of game time, {replay.star_rating} stars, {replay.player.moves} moves), {len(log.keys)} key presses packed into {len(data)} bytes')
+    print_row('run', 'time (ms)', 'steps/s', 'x real time')
+    for name, elapsed in (('played', played), ('replay', replay_time), ('replay + ghost', ghost_time)):
+        print_row(name, f'{elapsed * 1000:.1f}', f'{endless.steps / elapsed:,.0f}', f'{endless.steps / main.FPS / elapsed:,.0f}')
+
+# Runs the game in a new process and exits as soon as the first frame has been shown
+STARTUP_SCRIPT = '''
+import os, sys
+os.environ['MAZE_MASTER_HEADLESS'] = '1'
+import main
+update = main.pg.display.update
+def first_update(*args):
+    update(*args)
+    print('first frame', flush = True)
+    os._exit(0)
+main.pg.display.update = first_update
+game = main.Game()
+if sys.argv[1] == 'eager': # Instantiates every state up front, like Game.__init__ did before states were created on first use
+    for name in game.state_classes:
+        getattr(game, name)
+game.run()
+'''
+
+def bench_prefetch(repeat):
+    game = main.Game()
+    endless = game.endless_game_mode
+    endless.reset() # The first round, as opening Endless does
+    rounds = 20
+    print(f'Endless replay (ms from pressing replay to the next maze being ready, over {rounds} rounds)')
+    print_row('next round', 'mean', 'max', 'queue depth')
+    times = []
+    for _ in range(rounds): # What reset used to do on the render thread
+        start = time.perf_counter()
+        endless.start_round(endless.build_round())
+        times.append((time.perf_counter() - start) * 1000)
+    print_row('built on replay', f'{sum(times) / rounds:.2f}', f'{max(times):.2f}', '-')
+    endless.prefetcher.round_times.clear()
+    endless.prefetcher.depths.clear()
+    endless.prefetcher.hits = endless.prefetcher.misses = 0 # Leaves out the round taken when Endless was opened
+    for _ in range(rounds):
+        time.sleep(0.05) # The player spends far longer than this on a round, giving the worker time to fill the queue
+        endless.reset()
+    stats = endless.prefetcher.get_stats()
+    times = endless.prefetcher.round_times
+    print_row('prefetched', f'{sum(times) / len(times):.2f}', f'{stats["max_round_ms"]:.2f}', f'{stats["mean_depth"]:.1f}')
+    print_row('hit rate', f'{stats["hit_rate"]:.0%}')
+
+def bench_startup(repeat):
+    print(f'Startup (ms from process start to the first frame shown, best of {repeat})')
+    print_row('states', 'startup')
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for mode in ('eager', 'lazy'):
+        def start_game():
+            process = subprocess.Popen([sys.executable, '-c', STARTUP_SCRIPT, mode], cwd = directory, stdout = subprocess.PIPE, text = True)
+            for line in process.stdout:
+                if line.strip() == 'first frame':
+                    break
+            process.wait()
+        startup_time, _ = time_call(start_game, repeat = repeat)
+        print_row(mode, f'{startup_time * 1000:.0f}')
+
+# Scripted input for the frame-time benchmark
+def key(key_code):
+    return main.pg.event.Event(main.pg.KEYDOWN, key = key_code)
+
+def click(pos):
+    return main.pg.event.Event(main.pg.MOUSEBUTTONDOWN, button = 1, pos = pos)
+
+ARROW_KEYS = [main.pg.K_RIGHT, main.pg.K_DOWN, main.pg.K_LEFT, main.pg.K_UP]
+
+def play_maze(frame): # Presses an arrow key every 10 frames, cycling through the directions
+    if frame % 10 == 0:
+        return [key(ARROW_KEYS[frame // 10 % len(ARROW_KEYS)])]
+    return []
+
+SCENARIOS = { # Each scenario is a list of clicks/key presses to start with and the input to send on every frame after that
+    'title screen': ([], lambda frame: []),
+    'levels': ([click((main.SCREEN_WIDTH // 2, 430)), click((main.SCREEN_WIDTH // 2, 426)), click((263, 211))], play_maze), # Play -> Levels -> Level 1
+    'endless': ([click((main.SCREEN_WIDTH // 2, 430)), click((main.SCREEN_WIDTH // 2, 564))], play_maze), # Play -> Endless
+    'visualiser': ([click((1146, 668))] + [click((main.SCREEN_WIDTH // 2 + 89 - 15, 682))] * 4 + [click((main.SCREEN_WIDTH // 2, 682))], lambda frame: []) # Education -> Speed up x4 to Max (clicking the solid part of the icon) -> Play
+}
+
+def bench_frames(frames, output):
+    random.seed(0) # Endless mode generates the same mazes every run
+    frame_times = {} # State class name -> list of frame times in ms
+    for name, (opening, script) in SCENARIOS.items():
+        game = main.Game()
+        while game.warm_up_states: # Measures steady-state frames, startup is measured by the startup benchmark
+            game.warm_up()
+        for event in opening: # One event per frame, like a player clicking through the menus
+            game.run_frame([event])
+        for frame in range(frames):
+            events = script(frame)
+            start = time.perf_counter()
+            game.run_frame(events)
+            elapsed = time.perf_counter() - start
+            frame_times.setdefault(type(game.state).__name__, []).append(elapsed * 1000)
+
+    print(f'Frame times (ms, {frames} frames per scenario, headless with no FPS cap)')
+    print_row('state', 'frames', 'mean', 'p50', 'p95', 'p99')
+    results = {}
+    for state, times in frame_times.items():
+        times.sort()
+        results[state] = {
+            'frames': len(times),
+            'mean': sum(times) / len(times),
+            'p50': percentile(times, 0.50),
+            'p95': percentile(times, 0.95),
+            'p99': percentile(times, 0.99)
+        }
+        print_row(state, results[state]['frames'], *(f'{results[state][measure]:.3f}' for measure in ('mean', 'p50', 'p95', 'p99')))
+    with open(output, 'w') as f:
+        json.dump(results, f, indent = 4)
+    print(f'Wrote {output}')
+
+BENCHMARKS = {
+    'solvers': lambda args: bench_solvers(args.sizes, args.repeat),
+    'bfs': lambda args: bench_bfs(args.sizes, args.repeat),
+    'field': lambda args: bench_field(args.sizes, args.repeat),
+    'maze': lambda args: bench_maze(args.sizes, args.repeat),
+    'draw': lambda args: bench_draw(args.repeat),
+    'visualiser': lambda args: bench_visualiser(args.repeat),
+    'camera': lambda args: bench_camera(args.frames),
+    'text': lambda args: bench_text(args.repeat),
+    'levels': lambda args: bench_levels(args.levels_json, args.repeat),
+    'saves': lambda args: bench_saves(args.repeat),
+    'par': lambda args: bench_par(args.sizes, args.repeat),
+    'junctions': lambda args: bench_junctions(args.sizes, args.repeat),
+    'jumps': lambda args: bench_jumps(args.sizes, args.repeat),
+    'assets': lambda args: bench_assets(args.repeat),
+    'seeds': lambda args: bench_seeds(args.sizes, args.repeat),
+    'metrics': lambda args: bench_metrics(args.repeat),
+    'prefetch': lambda args: bench_prefetch(args.repeat),
+    'solutions': lambda args: bench_solutions(args.repeat),
+    'timestep': lambda args: bench_timestep(),
+    'replay': lambda args: bench_replay(args.repeat),
+    'speeds': lambda args: bench_speeds(),
+    'startup': lambda args: bench_startup(args.repeat),
+    'frames': lambda args: bench_frames(args.frames, args.output)
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Maze Master performance benchmarks')
+    parser.add_argument('benchmarks', nargs = '*', help = f'benchmarks to run: {", ".join(BENCHMARKS)} (default: all)')
+    parser.add_argument('--sizes', nargs = '+', type = int, default = [100, 500], help = 'square maze sizes to benchmark')
+    parser.add_argument('--repeat', type = int, default = 3, help = 'runs per measurement (the best time is reported)')
+    parser.add_argument('--levels-json', default = None, help = 'levels.json file to compare the level pack against (default: the level pack written out in the levels.json format)')
+    parser.add_argument('--frames', type = int, default = 300, help = 'frames to step each scenario for in the frame-time and camera benchmarks')
+    parser.add_argument('--output', default = 'frame_times.json', help = 'where the frame-time benchmark writes its percentiles')
+    args = parser.parse_args()
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f'unknown benchmark {name!r}')
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name](args)
+        print()
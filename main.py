@@ -3,6 +3,23 @@ import sys
 import random
 import os
 import json
+import base64
+import hashlib
+import struct
+import threading
+import queue
+import heapq
+import time
+import itertools
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+
+# Headless mode runs without a window, a sound device or an FPS cap, for benchmarks and machines without a display
+HEADLESS = '--headless' in sys.argv or os.environ.get('MAZE_MASTER_HEADLESS') == '1'
+if HEADLESS:
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
 
 # Initialise Pygame
 pg.init()
@@ -11,7 +28,18 @@ pg.mixer.init()
 # Constants
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
-FPS = 60
+FPS = 60 # Simulation steps per second, and the render frame rate cap
+TIMESTEP = 1 / FPS # Seconds of game time each simulation step covers, whatever the render frame rate
+MAX_FRAME_TIME = 0.25 # Longest real time simulated after one frame, longer stalls are skipped rather than caught up on
+MAZE_SURFACE_WIDTH = 575 # Space the maze is drawn in during Levels and Endless game mode
+MAZE_SURFACE_HEIGHT = 575
+PLAYER_SPEED = 5 # Pixels the player slides per frame
+MIN_CELL_SIZE = 6 # Mazes too big to fit the maze surface at this cell size are scrolled by the camera instead of shrunk
+MAX_CELL_SIZE = 48 # Furthest the camera zooms in
+CHUNK_SIZE = 256 # Pixels along each side of a pre-rendered wall chunk
+CAMERA_SPEED = 10 # Pixels the camera pans per frame
+ANIMATION_BUDGET = 0.008 # Seconds of each simulation step the visualiser's Max speed spends on animation steps, leaving the rest of the frame for drawing
+MAX_MAZE_SIZE = 1000 # Largest maze width and height the visualiser generates
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 GREEN = (7, 168, 18)
@@ -23,6 +51,43 @@ RED = (192, 0, 0)
 CYAN = (102, 255, 255)
 PINK = (255, 0, 255)
 GOLD = (255, 215, 0)
+# Wall bitmask flags - each cell's walls are stored as a 4-bit mask
+TOP = 1
+BOTTOM = 2
+LEFT = 4
+RIGHT = 8
+ALL_WALLS = TOP | BOTTOM | LEFT | RIGHT
+WALL_FLAGS = {'top': TOP, 'bottom': BOTTOM, 'left': LEFT, 'right': RIGHT}
+GENERATOR_VERSION = 1 # Bumped whenever a change to Maze.generate would give different walls for the same seed
+SOLUTION_CACHE_VERSION = 1 # Bumped whenever a change to the solvers or the cached solution format would make cached solutions wrong
+# Binary level pack format (data/levels.bin), all integers little-endian:
+#   header - magic, format version, no. levels
+#   offset table - one 32-bit file offset per level
+#   level record - level number, width, height, shortest path length, par moves, par frames, generator version and seed,
+#                  then (only if the generator version is 0) the wall masks two cells per byte (low nibble first)
+# Version 1 packs also stored the normal and darkness star ratings after the height, these now live in data/progress.json
+# Version 2 packs had no path length or par values, these are worked out when the level is played instead
+# Version 3 packs always stored the wall masks, version 4 levels can instead be stored as a seed and regenerated by Maze.generate
+LEVEL_PACK_MAGIC = b'MMLP'
+LEVEL_PACK_VERSION = 4
+LEVEL_PACK_HEADER = struct.Struct('<4sBH')
+LEVEL_PACK_OFFSET = struct.Struct('<I')
+LEVEL_RECORD_HEADERS = {1: struct.Struct('<HBBBB'), 2: struct.Struct('<HBB'), 3: struct.Struct('<HBBHHH'), 4: struct.Struct('<HBBHHHBI')} # Level record header for each pack version
+# Input log format (one recorded run), all integers little-endian:
+#   header - magic, format version, game mode, darkness mode, level number, maze width, height, generator version and seed, steps taken to reach the goal
+#   key presses - one unsigned LEB128 varint per press, (steps since the previous press << 4) | the key's index in INPUT_LOG_KEYS
+# Levels generated from wall masks are recorded with generator version and seed 0, like in the level pack
+INPUT_LOG_MAGIC = b'MMIL'
+INPUT_LOG_VERSION = 1
+INPUT_LOG_HEADER = struct.Struct('<4sBBBHHHBII')
+INPUT_LOG_KEYS = (pg.K_UP, pg.K_DOWN, pg.K_LEFT, pg.K_RIGHT, pg.K_w, pg.K_s, pg.K_a, pg.K_d, pg.K_h) # Every key a run responds to, any other key press is left out of the log
+ENDLESS_RUN = 0 # Game mode values in the input log header
+LEVELS_RUN = 1
+THREE_STAR_SPEED = 6.02 # Solving speed (cells per second) required to achieve 3/3 stars - increasing it will make achieving 3/3 stars more difficult
+LOW_NIBBLE = bytes(i & 15 for i in range(256)) # Translation tables for splitting packed wall bytes into wall masks
+HIGH_NIBBLE = bytes(i >> 4 for i in range(256))
+IS_KEY_CELL = bytes(bin(i & ALL_WALLS).count('1') != 2 for i in range(256)) # Translation table marking wall masks of junctions and dead ends (cells that don't have exactly 2 open sides)
+OPEN_SIDES = bytes(4 - bin(i & ALL_WALLS).count('1') for i in range(256)) # Translation table from wall masks to no. open sides, 1 for dead ends and 3 or 4 for junctions
 
 # File directories
 MAIN_DIR = os.path.dirname(__file__)
@@ -37,12 +102,629 @@ MONTSERRAT_REG = os.path.join(FONTS_DIR, 'Montserrat_Font_Family', 'Montserrat R
 MONTSERRAT_BOLD = os.path.join(FONTS_DIR, 'Montserrat_Font_Family', 'Montserrat Bold 700.ttf')
 PARKVANE = os.path.join(FONTS_DIR, 'Parkvane_Font_Family', 'Parkvane Regular 400.ttf')
 
+# Global classes
+class TextCache: # Least recently used cache of rendered text surfaces, so that unchanged text isn't re-rendered every frame
+    def __init__(self, max_size = 256):
+        self.surfaces = OrderedDict() # Rendered surfaces keyed by (font, text, colour, antialias), oldest first
+        self.max_size = max_size # Bounds the cache, so changing text like the timer can't grow it forever
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, colour, antialias = True): # Returns the cached surface, only rendering text that isn't cached
+        key = (font, text, colour, antialias)
+        text_surface = self.surfaces.get(key)
+        if text_surface is not None:
+            self.surfaces.move_to_end(key) # Marks as most recently used
+            self.hits += 1
+            return text_surface
+        self.misses += 1
+        text_surface = font.render(text, antialias, colour)
+        self.surfaces[key] = text_surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last = False) # Evicts the least recently used surface
+        return text_surface
+
+    def get_stats(self): # Hit/miss counters for benchmarking
+        calls = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.surfaces),
+            'hit_rate': self.hits / calls if calls else 0
+        }
+
+text_cache = TextCache() # Shared by every call to draw_text
+
+class Persistence: # Background worker that writes the JSON save files, so that disk latency never holds up a frame
+    def __init__(self):
+        self.queue = queue.Queue() # File paths waiting to be written
+        self.pending = {} # File path -> newest JSON text waiting to be written
+        self.lock = threading.Lock()
+        self.thread = None
+        self.writes = 0 # No. files actually written, for benchmarking
+
+    def save_json(self, path, data): # Serialises now (so later changes to data aren't saved half-way) and writes on the worker thread
+        text = json.dumps(data, indent = 4)
+        with self.lock:
+            is_queued = path in self.pending
+            self.pending[path] = text
+        if not is_queued: # Rapid saves to the same file are coalesced into one write of the newest text
+            self.queue.put(path)
+        if self.thread is None:
+            self.thread = threading.Thread(target = self.run, daemon = True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            path = self.queue.get()
+            with self.lock:
+                text = self.pending.pop(path)
+            try:
+                write_text_atomic(path, text)
+                self.writes += 1
+            except OSError as error: # A failed save shouldn't crash the game, the old file is left untouched
+                print(f'Could not save {path}: {error}')
+            finally:
+                self.queue.task_done()
+
+    def flush(self): # Blocks until every queued save has been written
+        self.queue.join()
+
+persistence = Persistence() # Shared by everything that saves to the data directory
+
+class AssetCache: # Shared images and click masks, so that each image is only decoded and scaled once per size it's used at
+    def __init__(self):
+        self.images = {} # (filename, size) -> converted surface, size is None for the image's own size
+        self.masks = {} # (filename, size) -> click mask of that surface
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, filename, size = None): # Returned surfaces are shared, so they must only be blitted, never drawn on
+        key = (filename, size)
+        surface = self.images.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = load_image(filename)
+            if size:
+                surface = pg.transform.smoothscale(surface, size)
+            self.images[key] = surface
+        else:
+            self.hits += 1
+        return surface
+
+    def mask(self, filename, size = None):
+        key = (filename, size)
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = pg.mask.from_surface(self.image(filename, size))
+            self.masks[key] = mask
+        return mask
+
+    def get_stats(self): # Hit/miss counters and memory use for benchmarking
+        calls = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'decoded': self.misses, # Every miss decodes an image file
+            'images': len(self.images),
+            'masks': len(self.masks),
+            'image_bytes': sum(surface.get_pitch() * surface.get_height() for surface in self.images.values()),
+            'mask_bytes': sum((mask.get_size()[0] + 7) // 8 * mask.get_size()[1] for mask in self.masks.values()),
+            'hit_rate': self.hits / calls if calls else 0
+        }
+
+assets = AssetCache() # Shared by every screen and button
+
+class ChunkCache: # Least recently used cache of pre-rendered wall chunks, so only chunks in view are ever drawn and no maze needs one huge surface
+    def __init__(self, render_chunk, max_size = 64):
+        self.render_chunk = render_chunk # Draws the walls of one chunk in a wall colour onto a new surface
+        self.surfaces = OrderedDict() # (chunk x, chunk y) -> surface, oldest first
+        self.max_size = max_size # Bounds the memory used, chunks scrolled out of view are evicted first
+        self.key = None # (walls version, cell size, wall colour) the cached chunks were drawn with, every chunk is redrawn when it changes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, chunk_pos, version, cell_size, wall_colour):
+        key = (version, cell_size, wall_colour)
+        if key != self.key:
+            self.surfaces.clear()
+            self.key = key
+        surface = self.surfaces.get(chunk_pos)
+        if surface is not None:
+            self.surfaces.move_to_end(chunk_pos) # Marks as most recently used
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.render_chunk(chunk_pos, wall_colour)
+        self.surfaces[chunk_pos] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last = False) # Evicts the least recently used chunk
+            self.evictions += 1
+        return surface
+
+    def get_stats(self): # Hit/miss counters and memory use for benchmarking
+        calls = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'chunks': len(self.surfaces),
+            'chunk_bytes': sum(surface.get_pitch() * surface.get_height() for surface in self.surfaces.values()),
+            'hit_rate': self.hits / calls if calls else 0
+        }
+
+class MazePrefetcher: # Background worker that generates and solves the next Endless mazes while the current round is being played
+    def __init__(self, build_round, depth = 2):
+        self.build_round = build_round # Returns a new round, must not touch the game state as it runs on the worker thread
+        self.queue = queue.Queue(maxsize = depth) # Rounds ready to be swapped in
+        self.thread = None
+        self.hits = 0 # Rounds swapped straight in from the queue
+        self.misses = 0 # Rounds built on the render thread because the queue was empty
+        self.round_times = deque(maxlen = 100) # Recent time-to-next-round in ms
+        self.depths = deque(maxlen = 100) # Queue depth seen by each of those rounds
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target = self.run, daemon = True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            self.queue.put(self.build_round()) # Blocks while the queue is full
+
+    def get(self): # Swaps in a prefetched round, only building one on the spot if the worker hasn't caught up
+        start = time.perf_counter()
+        self.depths.append(self.queue.qsize())
+        try:
+            next_round = self.queue.get_nowait()
+            self.hits += 1
+        except queue.Empty:
+            next_round = self.build_round()
+            self.misses += 1
+        self.round_times.append((time.perf_counter() - start) * 1000)
+        return next_round
+
+    def get_stats(self): # Time-to-next-round and queue depth for benchmarking
+        rounds = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'depth': self.queue.qsize(),
+            'mean_depth': sum(self.depths) / len(self.depths) if self.depths else 0,
+            'last_round_ms': self.round_times[-1] if self.round_times else 0,
+            'max_round_ms': max(self.round_times, default = 0),
+            'hit_rate': self.hits / rounds if rounds else 0
+        }
+
+class SolutionCache: # Solutions of mazes that have already been solved, kept in memory and on disk so that the same layout is only ever searched once
+    def __init__(self, directory, max_size = 64):
+        self.directory = directory # One JSON file per solved maze, named after its key
+        self.solutions = OrderedDict() # Key -> solution, oldest first
+        self.max_size = max_size # Bounds the in-memory tier, the disk tier keeps everything
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get_key(self, maze, start_node_pos, goal_node_pos): # Content hash of everything a solution depends on, so a changed maze never gets a stale solution
+        header = struct.pack('<9H', SOLUTION_CACHE_VERSION, maze.width, maze.height, *start_node_pos, *goal_node_pos, maze.cell_size, PLAYER_SPEED) # Par frames depend on the cell size and player speed
+        return hashlib.blake2b(header + maze.array.walls, digest_size = 16).hexdigest()
+
+    def get_path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def solve(self, maze, start_node_pos, goal_node_pos): # Returns the maze's shortest path length, par values and distance field, only searching on a miss in both tiers
+        key = self.get_key(maze, start_node_pos, goal_node_pos)
+        solution = self.lookup(key, maze)
+        if solution is None:
+            self.misses += 1
+            solution = self.search(maze, start_node_pos, goal_node_pos)
+            self.save(key, solution)
+            self.remember(key, solution)
+        self.install(maze, solution, goal_node_pos)
+        return solution
+
+    def get_distance_field(self, maze, start_node_pos, goal_node_pos, par_values): # For mazes whose path length and par values are already known (levels from the level pack) - a miss only builds the distance field, then caches it with the known values
+        key = self.get_key(maze, start_node_pos, goal_node_pos)
+        solution = self.lookup(key, maze)
+        if solution is None:
+            self.misses += 1
+            solution = {name: par_values[name] for name in ('path_length', 'par_moves', 'par_frames')}
+            solution['distance_field'] = maze.get_distance_field(goal_node_pos)
+            self.save(key, solution)
+            self.remember(key, solution)
+        self.install(maze, solution, goal_node_pos)
+        return solution['distance_field']
+
+    def lookup(self, key, maze): # Returns a solution from the memory tier, then the disk tier, or None if neither has it
+        solution = self.solutions.get(key)
+        if solution is not None:
+            self.solutions.move_to_end(key) # Marks as most recently used
+            self.memory_hits += 1
+            return solution
+        solution = self.load(key, maze)
+        if solution is not None:
+            self.disk_hits += 1
+            self.remember(key, solution)
+        return solution
+
+    def remember(self, key, solution): # Adds a solution to the memory tier
+        self.solutions[key] = solution
+        if len(self.solutions) > self.max_size:
+            self.solutions.popitem(last = False) # Evicts the least recently used solution
+
+    def install(self, maze, solution, goal_node_pos): # Distance fields are only read once built, so mazes with the same layout can share one
+        maze.distance_field = solution['distance_field']
+        maze.distance_field_key = (maze.array.version, goal_node_pos)
+
+    def search(self, maze, start_node_pos, goal_node_pos):
+        par_moves, par_frames = maze.solve_par(start_node_pos, goal_node_pos)
+        distance_field = maze.get_distance_field(goal_node_pos)
+        return {
+            'path_length': distance_field.distance[maze.array.index(*start_node_pos)] + 1,
+            'par_moves': par_moves,
+            'par_frames': par_frames,
+            'distance_field': distance_field
+        }
+
+    def load(self, key, maze): # Reads a solution from the disk tier, or None if it isn't there or can't be read
+        try:
+            with open(self.get_path(key), 'r') as f:
+                data = json.load(f)
+            distance = array('i', base64.b64decode(data['distance']))
+            next_cells = array('i', base64.b64decode(data['next']))
+        except (OSError, ValueError, KeyError, TypeError): # A missing or damaged file is just a miss, it's overwritten once the maze is solved again
+            return None
+        if len(distance) != maze.array.size or len(next_cells) != maze.array.size:
+            return None
+        return {
+            'path_length': data['path_length'],
+            'par_moves': data['par_moves'],
+            'par_frames': data['par_frames'],
+            'distance_field': DistanceField(maze, data['goal'], distance, next_cells)
+        }
+
+    def save(self, key, solution): # Writes a solution to the disk tier on the persistence worker
+        distance_field = solution['distance_field']
+        try:
+            os.makedirs(self.directory, exist_ok = True)
+        except OSError as error: # The solution is still cached in memory
+            print(f'Could not create {self.directory}: {error}')
+            return
+        persistence.save_json(self.get_path(key), {
+            'path_length': solution['path_length'],
+            'par_moves': solution['par_moves'],
+            'par_frames': solution['par_frames'],
+            'goal': distance_field.goal,
+            'distance': base64.b64encode(distance_field.distance.tobytes()).decode('ascii'), # Packed arrays, far smaller than JSON lists
+            'next': base64.b64encode(distance_field.next.tobytes()).decode('ascii')
+        })
+
+    def get_stats(self): # Hit/miss counters for benchmarking
+        calls = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'size': len(self.solutions),
+            'hit_rate': (self.memory_hits + self.disk_hits) / calls if calls else 0
+        }
+
+solutions = SolutionCache(os.path.join(DATA_DIR, 'solutions')) # Shared by every game mode
+
+class FixedTimestep: # Turns the real time between rendered frames into a whole no. fixed-length simulation steps
+    def __init__(self, timestep = TIMESTEP, max_frame_time = MAX_FRAME_TIME):
+        self.timestep = timestep
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0 # Real time not simulated yet, in seconds
+
+    def advance(self, elapsed): # Returns the no. steps to simulate and how far through the next step the frame is (0 to 1), for render interpolation
+        self.accumulator += min(elapsed, self.max_frame_time)
+        steps = int(self.accumulator / self.timestep)
+        self.accumulator -= steps * self.timestep
+        return steps, self.accumulator / self.timestep
+
+class InputLog: # Every key pressed during one run and the simulation step it was pressed on - with the maze it was played on, enough to replay the run exactly
+    def __init__(self, mode, darkness_mode = False, level_number = 0, width = 0, height = 0, seed = 0, generator_version = GENERATOR_VERSION):
+        self.mode = mode # ENDLESS_RUN or LEVELS_RUN
+        self.darkness_mode = darkness_mode
+        self.level_number = level_number # 0 for Endless runs
+        self.width = width
+        self.height = height
+        self.seed = seed # Seed of the maze's walls, 0 for levels stored as wall masks
+        self.generator_version = generator_version
+        self.keys = [] # (step, key) for every key press, in order
+        self.steps = 0 # Steps taken to reach the goal, 0 until the run is finished
+
+    def record(self, step, key): # Called every simulation step with Game.key_pressed
+        if key in INPUT_LOG_KEYS:
+            self.keys.append((step, key))
+
+    def finish(self, steps):
+        self.steps = steps
+
+    def to_bytes(self): # Packs the log, delta encoding the steps so that most key presses take 1 or 2 bytes
+        data = bytearray(INPUT_LOG_HEADER.pack(INPUT_LOG_MAGIC, INPUT_LOG_VERSION, self.mode, self.darkness_mode, self.level_number, self.width, self.height, self.generator_version, self.seed, self.steps))
+        previous_step = 0
+        for step, key in self.keys:
+            value = (step - previous_step) << 4 | INPUT_LOG_KEYS.index(key)
+            previous_step = step
+            while value >= 0x80: # 7 bits per byte, the top bit marks that another byte follows
+                data.append(value & 0x7f | 0x80)
+                value >>= 7
+            data.append(value)
+        return bytes(data)
+
+class Replay: # Re-simulates a recorded run without rendering, stepping the player and timer exactly like GameMode.update, thousands of steps per second
+    def __init__(self, log, maze, path_length, par_frames):
+        self.log = log
+        self.maze = maze
+        self.path_length = path_length # Star rating values, as in GameMode.set_solution
+        self.par_frames = par_frames
+        self.goal_node_pos = (maze.width - 1, maze.height - 1)
+        self.key_pressed = None # Stands in for Game.key_pressed, read by the player
+        self.alpha = 1 # Stands in for Game.alpha, so the player's draw position is its simulated position
+        self.player = Player(self, maze) # The camera never moves on replays, which doesn't change how the player slides
+        self.steps = 0
+        self.elapsed_time = 0
+        self.star_rating = 3
+        self.is_finished = False # Whether the replayed player reached the goal
+        self.ghost = None # Player's pixel coords relative to the maze after every step, if recorded
+
+    def run(self, record_ghost = False): # Steps through the log until the goal is reached or the recorded steps run out
+        keys = dict(self.log.keys) # A frame only ever records its last key press, so there's at most one per step
+        if record_ghost:
+            self.ghost = []
+        while self.steps < self.log.steps and not self.is_finished:
+            self.key_pressed = keys.get(self.steps)
+            self.player.update()
+            self.star_rating = get_star_rating(self.elapsed_time, self.path_length, self.par_frames) # Rated before the timer ticks, like GameMode.update
+            self.steps += 1
+            self.elapsed_time = self.steps // FPS
+            if record_ghost:
+                self.ghost.append((self.player.px[0] - self.maze.start_x, self.player.px[1] - self.maze.start_y))
+            self.is_finished = (self.player.x, self.player.y) == self.goal_node_pos
+        return self
+
+class AnimationStepper: # Runs the steps of an animation at a set rate, as many per simulation step as the rate needs - or at Max speed, as many as fit in a time budget
+    def __init__(self, budget = ANIMATION_BUDGET):
+        self.budget = budget
+        self.owed = 1 # Animation steps owed, fractions carry over so that slow speeds run one step every few simulation steps
+        self.history = deque(maxlen = FPS) # Animation steps run in each of the last second's simulation steps
+
+    def run(self, step, rate): # Calls step (which returns True once the animation is over) for rate steps per second, or until the budget is spent if rate is None
+        count = 0
+        if rate is None:
+            deadline = time.perf_counter() + self.budget
+            while True:
+                count += 1
+                if step() or time.perf_counter() >= deadline:
+                    break
+        else:
+            self.owed += rate / FPS
+            while self.owed >= 1:
+                self.owed -= 1
+                count += 1
+                if step():
+                    self.owed = 0
+                    break
+        self.history.append(count)
+        return count
+
+    def get_steps_per_second(self): # Measured over the last second of game time
+        return sum(self.history)
+
+    def reset(self):
+        self.owed = 1 # The first step runs straight away
+        self.history.clear()
+
 # Global functions
 def load_image(filename):
     return pg.image.load(os.path.join(IMAGES_DIR, filename)).convert_alpha()
 
+def pack_walls(walls): # Packs 4-bit wall masks two to a byte
+    if len(walls) % 2: # Pads odd-sized mazes with an empty half byte
+        walls = walls + bytes(1)
+    walls = bytes(walls)
+    return bytes(low | high << 4 for low, high in zip(walls[0::2], walls[1::2]))
+
+def get_wall_runs(masks, flag, offset = 0): # Start and end (exclusive) of every run of consecutive wall masks with a wall flag set, numbered from offset
+    runs = []
+    run_start = None
+    for i, mask in enumerate(masks, offset):
+        if mask & flag:
+            if run_start is None:
+                run_start = i
+        elif run_start is not None:
+            runs.append((run_start, i))
+            run_start = None
+    if run_start is not None:
+        runs.append((run_start, offset + len(masks)))
+    return runs
+
+def unpack_walls(data, size): # Splits packed bytes back into one wall mask per cell
+    walls = bytearray(len(data) * 2)
+    walls[0::2] = data.translate(LOW_NIBBLE)
+    walls[1::2] = data.translate(HIGH_NIBBLE)
+    del walls[size:]
+    return walls
+
+def load_level_pack(path): # Reads every level from a binary level pack into a list of level dictionaries
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, count = LEVEL_PACK_HEADER.unpack_from(data)
+    if magic != LEVEL_PACK_MAGIC:
+        raise ValueError(f'{path} is not a level pack')
+    if version not in LEVEL_RECORD_HEADERS:
+        raise ValueError(f'{path} is level pack version {version}, expected version {LEVEL_PACK_VERSION} or older')
+    record_header = LEVEL_RECORD_HEADERS[version]
+    levels = []
+    for i in range(count):
+        offset = LEVEL_PACK_OFFSET.unpack_from(data, LEVEL_PACK_HEADER.size + i * LEVEL_PACK_OFFSET.size)[0]
+        number, width, height, *extra = record_header.unpack_from(data, offset)
+        start = offset + record_header.size
+        level = {
+            'number': number,
+            'width': width,
+            'height': height
+        }
+        if version == 1: # Star ratings, kept so that load_progress can migrate them
+            level['stars'] = {'normal': extra[0], 'darkness': extra[1]}
+        elif version >= 3:
+            level['path_length'], level['par_moves'], level['par_frames'] = extra[:3]
+        if version >= 4 and extra[3]: # Seeded level, the walls are regenerated when the level's maze is created
+            if extra[3] != GENERATOR_VERSION:
+                raise ValueError(f'Level {number} in {path} needs maze generator version {extra[3]}, this is version {GENERATOR_VERSION}')
+            level['seed'] = extra[4]
+        else:
+            level['walls'] = unpack_walls(data[start:start + (width * height + 1) // 2], width * height)
+        levels.append(level)
+    return levels
+
+def create_level_maze(level, surface_pos = (0, 0), surface_width = MAZE_SURFACE_WIDTH, surface_height = MAZE_SURFACE_HEIGHT): # Creates a level's maze from its wall masks, or regenerates it from its seed
+    return Maze(level['width'], level['height'], surface_pos, surface_width, surface_height, wall_masks = level.get('walls'), seed = level.get('seed'))
+
+def get_level_par(level): # Works out a level's shortest path length and par values as it's played in Levels game mode, where the player slides from the top left to the bottom right
+    maze = create_level_maze(level)
+    goal_node_pos = (level['width'] - 1, level['height'] - 1)
+    par_moves, par_frames = maze.solve_par((0, 0), goal_node_pos)
+    return {'path_length': maze.get_distance_field(goal_node_pos).distance[0] + 1, 'par_moves': par_moves, 'par_frames': par_frames}
+
+def get_star_rating(elapsed_time, path_length, par_frames): # Calculates the time brackets for achieving 1, 2 or 3 stars
+    three_star_time = max(path_length / THREE_STAR_SPEED, par_frames / FPS) # Max time to achieve 3/3 stars - never less than the fastest possible solve
+    if elapsed_time <= three_star_time:
+        return 3
+    elif elapsed_time <= three_star_time + 5:
+        return 2
+    else:
+        return 1
+
+def load_input_log(data): # Reads a run packed by InputLog.to_bytes
+    if len(data) < INPUT_LOG_HEADER.size:
+        raise ValueError('Input log is too short')
+    magic, version, mode, darkness_mode, level_number, width, height, generator_version, seed, steps = INPUT_LOG_HEADER.unpack_from(data)
+    if magic != INPUT_LOG_MAGIC:
+        raise ValueError('Not an input log')
+    if version != INPUT_LOG_VERSION:
+        raise ValueError(f'Unsupported input log version {version}')
+    log = InputLog(mode, bool(darkness_mode), level_number, width, height, seed, generator_version)
+    log.steps = steps
+    step = value = shift = 0
+    for byte in data[INPUT_LOG_HEADER.size:]:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80: # More bytes of this varint follow
+            shift += 7
+            continue
+        if value & 15 >= len(INPUT_LOG_KEYS):
+            raise ValueError(f'Unknown key {value & 15} in input log')
+        step += value >> 4
+        log.keys.append((step, INPUT_LOG_KEYS[value & 15]))
+        value = shift = 0
+    if shift:
+        raise ValueError('Input log is truncated')
+    return log
+
+def replay_input_log(log, levels, record_ghost = False): # Rebuilds the maze a run was played on and re-simulates the run, raises ValueError if the maze can't be rebuilt exactly
+    if log.generator_version and log.generator_version != GENERATOR_VERSION:
+        raise ValueError(f'Run needs maze generator version {log.generator_version}, this is version {GENERATOR_VERSION}')
+    goal_node_pos = (log.width - 1, log.height - 1)
+    if log.mode == LEVELS_RUN:
+        if not 1 <= log.level_number <= len(levels):
+            raise ValueError(f'There is no level {log.level_number}')
+        level = levels[log.level_number - 1]
+        if (level['width'], level['height'], level.get('seed', 0)) != (log.width, log.height, log.seed):
+            raise ValueError(f'Level {log.level_number} has changed since the run was played')
+        maze = create_level_maze(level)
+        solution = level if 'par_frames' in level else solutions.solve(maze, (0, 0), goal_node_pos) # Par values from the level pack, as the game uses
+    elif log.mode == ENDLESS_RUN:
+        maze = Maze(log.width, log.height, (0, 0), MAZE_SURFACE_WIDTH, MAZE_SURFACE_HEIGHT, seed = log.seed)
+        solution = solutions.search(maze, (0, 0), goal_node_pos) # Endless mazes are only played once, so not worth caching
+    else:
+        raise ValueError(f'Unknown game mode {log.mode} in input log')
+    return Replay(log, maze, solution['path_length'], solution['par_frames']).run(record_ghost)
+
+def get_level_metrics(level): # Measures how hard a level is, played from the top left to the bottom right like in Levels game mode
+    maze = create_level_maze(level)
+    return maze.get_metrics((0, 0), (level['width'] - 1, level['height'] - 1))
+
+def save_level_pack(path, levels): # Writes a list of level dictionaries as a binary level pack in one pass, working out any missing par values
+    record_header = LEVEL_RECORD_HEADERS[LEVEL_PACK_VERSION]
+    offset = LEVEL_PACK_HEADER.size + len(levels) * LEVEL_PACK_OFFSET.size
+    offsets = []
+    for level in levels: # Record sizes only depend on the maze size, so the offset table can be written before any record
+        offsets.append(LEVEL_PACK_OFFSET.pack(offset))
+        offset += record_header.size
+        if 'seed' not in level: # Seeded levels store no wall masks
+            offset += (level['width'] * level['height'] + 1) // 2
+    with open(path, 'wb') as f:
+        f.write(LEVEL_PACK_HEADER.pack(LEVEL_PACK_MAGIC, LEVEL_PACK_VERSION, len(levels)))
+        f.write(b''.join(offsets))
+        for level in levels:
+            if 'par_moves' not in level:
+                level.update(get_level_par(level))
+            if 'seed' in level:
+                f.write(record_header.pack(level['number'], level['width'], level['height'], level['path_length'], level['par_moves'], level['par_frames'], GENERATOR_VERSION, level['seed']))
+            else: # Generator version 0 marks a level stored as wall masks
+                f.write(record_header.pack(level['number'], level['width'], level['height'], level['path_length'], level['par_moves'], level['par_frames'], 0, 0))
+                f.write(pack_walls(level['walls']))
+
+def level_from_json(level): # Converts a level from the old levels.json format, where each cell's walls are a dictionary (star ratings are migrated by load_progress)
+    width = len(level['maze'])
+    height = len(level['maze'][0])
+    grid = CompactMaze(width, height)
+    for x in range(width):
+        for y in range(height):
+            grid.set_walls(x * height + y, level['maze'][x][y])
+    return {'number': level['number'], 'width': width, 'height': height, 'walls': grid.walls}
+
+def write_text_atomic(path, text): # Writes to a temporary file then renames it over the original, so a crash mid-write never leaves a half-written file
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno()) # Makes sure the new contents are on disk before they replace the old file
+    os.replace(temp_path, path)
+
+def load_progress(levels, directory = DATA_DIR): # Loads the player's star ratings for each level, migrating them out of older level files on the first run
+    path = os.path.join(directory, 'progress.json')
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            progress = json.load(f)
+    else:
+        progress = {'stars': {'normal': [], 'darkness': []}}
+        old_levels = levels # Version 1 level packs stored the star ratings
+        levels_json_path = os.path.join(directory, 'levels.json')
+        if os.path.exists(levels_json_path): # Versions before the level pack stored the star ratings in levels.json
+            with open(levels_json_path, 'r') as f:
+                old_levels = json.load(f)
+        for level in old_levels:
+            stars = level.get('stars', 0)
+            if isinstance(stars, int): # The oldest levels.json files only stored the normal mode star rating
+                stars = {'normal': stars, 'darkness': 0}
+            progress['stars']['normal'].append(stars['normal'])
+            progress['stars']['darkness'].append(stars['darkness'])
+    for mode in ('normal', 'darkness'): # Levels added since the last save start unplayed
+        progress['stars'][mode] += [0] * (len(levels) - len(progress['stars'][mode]))
+    progress.setdefault('runs', {'normal': {}, 'darkness': {}}) # Input logs of the runs that set each level's star rating, keyed by level number
+    if not os.path.exists(path): # Written on the persistence worker, as this can run while a frame is being drawn
+        persistence.save_json(path, progress)
+    return progress
+
+def load_stats(): # Loads the player's Endless stats
+    with open(os.path.join(DATA_DIR, 'stats.json'), 'r') as f: # Loads from JSON
+        stats = json.load(f)
+    stats.setdefault('best_runs', {}) # Input log of the run that set each mode's shortest time
+    return stats
+
+def play_music(filename): # Loads and loops a soundtrack
+    path = os.path.join(SOUNDS_DIR, filename)
+    if os.path.exists(path):
+        pg.mixer.music.load(path)
+        pg.mixer.music.play(-1)
+    else: # Stays silent if a soundtrack is missing from the assets instead of crashing
+        pg.mixer.music.stop()
+
 def draw_text(screen, text, x, y, font, colour = WHITE, align = 'topleft'):
-    text_surface = font.render(text, True, colour)
+    text_surface = text_cache.render(font, text, colour)
 
     rect = text_surface.get_rect()
     if align == 'center':
@@ -67,6 +749,7 @@ class Game:
         pg.display.set_icon(load_image('maze_icon.png'))
 
         self.clock = pg.time.Clock()
+        self.fps = 0 if HEADLESS else FPS # 0 removes the frame rate cap
         self.is_running = True
         # Sound initialisation
         with open(os.path.join(DATA_DIR, 'settings.json'), 'r') as f:
@@ -81,16 +764,20 @@ class Game:
             pg.mixer.music.set_volume(0)
         else:
             pg.mixer.music.set_volume(self.music_volume)
-        # Instantiate the different game states
-        self.title_screen = TitleScreen(self)
-        self.education_mode = EducationMode(self)
-        self.play_mode = PlayMode(self)
-        self.levels_game_mode = LevelsGameMode(self)
-        self.endless_game_mode = EndlessGameMode(self)
-        self.pause_menu = PauseMenu(self)
-        self.endless_win_screen = EndlessWinScreen(self)
-        self.levels_win_screen = LevelsWinScreen(self)
-        self.settings = Settings(self)
+        # The different game states - each is only instantiated the first time it is used (see __getattr__)
+        self.state_classes = {
+            'title_screen': TitleScreen,
+            'education_mode': EducationMode,
+            'play_mode': PlayMode,
+            'levels_game_mode': LevelsGameMode,
+            'endless_game_mode': EndlessGameMode,
+            'pause_menu': PauseMenu,
+            'endless_win_screen': EndlessWinScreen,
+            'levels_win_screen': LevelsWinScreen,
+            'settings': Settings
+        }
+        # States instantiated one per frame while the title screen is idle, in the order the player is likely to need them
+        self.warm_up_states = ['play_mode', 'levels_game_mode', 'endless_game_mode', 'settings', 'pause_menu', 'levels_win_screen', 'endless_win_screen', 'education_mode']
         self.is_paused = False
         self.win = False
         self.show_settings = False
@@ -99,67 +786,126 @@ class Game:
         self.mouse_pos = pg.mouse.get_pos()
         self.mouse_x = self.mouse_pos[0]
         self.mouse_y = self.mouse_pos[1]
-        self.key_pressed = None # Current key pressed in a frame
+        self.key_pressed = None # Key pressed since the last simulation step
+        self.mouse_wheel = 0 # Mouse wheel clicks scrolled since the last simulation step, positive is away from the player
+        self.ticks = 0 # Game time in ms, advanced by each simulation step so timers keep pace with the simulation rather than the render rate
+        self.alpha = 1 # How far the rendered frame is between the last two simulation steps, for interpolating movement
+
+    def __getattr__(self, name): # Only called for missing attributes - instantiates a game state on first use
+        state_classes = self.__dict__.get('state_classes', {})
+        if name not in state_classes:
+            raise AttributeError(f"'Game' object has no attribute '{name}'")
+        state = state_classes[name](self)
+        setattr(self, name, state) # Later lookups find the state directly and skip __getattr__
+        return state
+
+    def get_created_state(self, name): # Returns a game state only if it has already been instantiated, else None
+        return self.__dict__.get(name)
+
+    def warm_up(self): # Instantiates the next state that hasn't been used yet, so entering it later doesn't stall
+        while self.warm_up_states:
+            name = self.warm_up_states.pop(0)
+            if name not in self.__dict__:
+                getattr(self, name)
+                return
 
     def run(self):
+        timestep = FixedTimestep()
+        previous_time = time.perf_counter()
         while self.is_running:
-            # Event handler
-            self.key_pressed = None
-            for event in pg.event.get():
-                if event.type == pg.QUIT: # Close window
-                    self.is_running = False
-                if event.type == pg.MOUSEBUTTONDOWN and event.button == 1: # Mouse left-click
-                    if self.show_settings: # Processes buttons clicked of states in order of priority
-                        self.settings.buttons_clicked()
-                    elif self.is_paused:
-                        self.pause_menu.buttons_clicked()
-                    elif self.win:
-                        if self.state == self.endless_game_mode:
-                            self.endless_win_screen.buttons_clicked() 
-                        elif self.state == self.levels_game_mode:
-                            self.levels_win_screen.buttons_clicked()
-                    else:
-                        self.state.buttons_clicked()
-                if event.type == pg.KEYDOWN: # Updates current key pressed
-                    self.key_pressed = event.key
-            
-            # Update mouse coords
-            self.mouse_pos = pg.mouse.get_pos()
-            self.mouse_x = self.mouse_pos[0]
-            self.mouse_y = self.mouse_pos[1]
+            if HEADLESS: # One step per frame with no FPS cap, so headless runs simulate faster than real time
+                self.run_frame(pg.event.get())
+                continue
+            current_time = time.perf_counter()
+            steps, alpha = timestep.advance(current_time - previous_time) # Dropped frames are made up with extra steps, fast frames may have none
+            previous_time = current_time
+            self.run_frame(pg.event.get(), steps, alpha)
+            self.clock.tick(self.fps)
+        pg.quit()
+        sys.exit() # Safely exits the game
 
-            self.state.draw()
+    def get_ticks(self): # Game time in ms, used in place of pg.time.get_ticks so that game time only passes as the game is simulated
+        return int(self.ticks)
+
+    def run_frame(self, events, steps = 1, alpha = 1): # Processes one frame's events, runs the simulation for a no. fixed timesteps, then draws the current state
+        # Event handler
+        for event in events:
+            if event.type == pg.QUIT: # Close window
+                self.is_running = False
+                persistence.flush() # Finishes writing any saves before the game closes
+            if event.type == pg.MOUSEBUTTONDOWN and event.button == 1: # Mouse left-click
+                # Uses the position the click happened at
+                self.mouse_pos = event.pos
+                self.mouse_x = self.mouse_pos[0]
+                self.mouse_y = self.mouse_pos[1]
+                if self.show_settings: # Processes buttons clicked of states in order of priority
+                    self.settings.buttons_clicked()
+                elif self.is_paused:
+                    self.pause_menu.buttons_clicked()
+                elif self.win:
+                    if self.state == self.endless_game_mode:
+                        self.endless_win_screen.buttons_clicked() 
+                    elif self.state == self.levels_game_mode:
+                        self.levels_win_screen.buttons_clicked()
+                else:
+                    self.state.buttons_clicked()
+            if event.type == pg.KEYDOWN: # Updates current key pressed
+                self.key_pressed = event.key
+            if event.type == pg.MOUSEWHEEL:
+                self.mouse_wheel += event.y
             
-            if self.show_settings: # Draws/updates states in order of priority
-                self.settings.draw()
-                self.settings.update()
-            elif self.is_paused:
-                self.pause_menu.draw()
-            elif self.win:
-                if self.state == self.endless_game_mode:
-                    self.endless_win_screen.update()
-                    self.endless_win_screen.draw()   
-                elif self.state == self.levels_game_mode:
-                    self.levels_win_screen.update()
-                    self.levels_win_screen.draw()                                        
-            else:
-                self.state.update()
+        # Update mouse coords
+        self.mouse_pos = pg.mouse.get_pos()
+        self.mouse_x = self.mouse_pos[0]
+        self.mouse_y = self.mouse_pos[1]
 
-            pg.display.update()
-            self.clock.tick(FPS)
-        pg.quit()
-        sys.exit() # Safely exits the game
+        for _ in range(steps):
+            self.update()
+        self.alpha = alpha
+        self.draw()
+        pg.display.update()
+
+        if self.state == self.title_screen and not self.show_settings: # Title screen is shown and idle
+            self.warm_up()
+
+    def update(self): # Runs one fixed-length simulation step of the states being shown, in order of priority
+        self.ticks += TIMESTEP * 1000
+        if self.show_settings:
+            self.settings.update()
+        elif self.is_paused:
+            pass
+        elif self.win:
+            if self.state == self.endless_game_mode:
+                self.endless_win_screen.update()
+            elif self.state == self.levels_game_mode:
+                self.levels_win_screen.update()
+        else:
+            self.state.update()
+        # Input is only seen by the first step after it happened
+        self.key_pressed = None
+        self.mouse_wheel = 0
+
+    def draw(self): # Draws the current state, with the states shown over it in order of priority
+        self.state.draw()
+        if self.show_settings:
+            self.settings.draw()
+        elif self.is_paused:
+            self.pause_menu.draw()
+        elif self.win:
+            if self.state == self.endless_game_mode:
+                self.endless_win_screen.draw()
+            elif self.state == self.levels_game_mode:
+                self.levels_win_screen.draw()
 
 class TitleScreen:
     def __init__(self, game):
         self.game = game
-        self.image = load_image('title_screen.png')
+        self.image = assets.image('title_screen.png')
         self.buttons = [
             Button(self.game, SCREEN_WIDTH // 2, 430, 'play_button1.png', self.play_button_clicked),
             Button(self.game, 1146, 668, 'education_button.png', self.education_button_clicked)
         ]
-        pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'normal_bg_music.mp3'))
-        pg.mixer.music.play(-1)
+        play_music('normal_bg_music.mp3')
     
     def draw(self):
         self.game.screen.blit(self.image,(0,0))
@@ -183,7 +929,7 @@ class TitleScreen:
 class PlayMode:
     def __init__(self, game):
         self.game = game
-        self.image = load_image('play_mode.png')
+        self.image = assets.image('play_mode.png')
         self.buttons = [
             Button(self.game, 56, 670, 'back_button.png', self.back_button_clicked, 81, 72),
             Button(self.game, 1230, 670, 'settings_button.png', self.settings_button_clicked, 72, 72),
@@ -195,6 +941,8 @@ class PlayMode:
         self.darkness_mode = False
         self.black_surface = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.black_surface.fill(BLACK)
+        self.progress = None # Save files read for the menu text until the game modes that own them are created
+        self.stats = None
     
     def draw(self):
         self.game.screen.blit(self.image, (0, 0))
@@ -222,38 +970,62 @@ class PlayMode:
         self.game.state = self.game.endless_game_mode
         self.game.endless_game_mode.reset()
         if self.darkness_mode: # Chooses which soundtrack to play
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'darkness_gameplay_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('darkness_gameplay_music.mp3')
         else:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'normal_gameplay_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('normal_gameplay_music.mp3')
     
     def darkness_mode_button_clicked(self):
         self.darkness_mode = not self.darkness_mode # Toggles darkness mode on/off
         if self.darkness_mode: # Choose which theme to draw and which soundtrack to play
-            self.image = load_image('dark_play_mode.png')
-            self.game.levels_game_mode.image = self.black_surface
-            self.game.endless_game_mode.image = self.black_surface
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'darkness_bg_music.mp3'))
-            pg.mixer.music.play(-1)
+            self.image = assets.image('dark_play_mode.png')
+            play_music('darkness_bg_music.mp3')
         else:
-            self.image = load_image('play_mode.png')
-            self.game.levels_game_mode.image = load_image('blank.png')
-            self.game.endless_game_mode.image = load_image('blank.png')
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'normal_bg_music.mp3'))
-            pg.mixer.music.play(-1)
+            self.image = assets.image('play_mode.png')
+            play_music('normal_bg_music.mp3')
+        for name in ('levels_game_mode', 'endless_game_mode'): # Game modes created later pick their background in GameMode.__init__
+            game_mode = self.game.get_created_state(name)
+            if game_mode is not None:
+                game_mode.image = self.get_game_mode_background()
+
+    def get_game_mode_background(self):
+        if self.darkness_mode:
+            return self.black_surface
+        else:
+            return assets.image('blank.png')
+
+    def get_mode(self):
+        if self.darkness_mode:
+            return 'darkness'
+        else:
+            return 'normal'
+
+    def get_levels_completed(self): # From Levels game mode if it has been created, else from the save file, so drawing this menu never creates it mid-frame
+        levels_game_mode = self.game.get_created_state('levels_game_mode')
+        if levels_game_mode is not None:
+            return levels_game_mode.get_levels_completed()
+        if self.progress is None:
+            self.progress = load_progress(load_level_pack(os.path.join(DATA_DIR, 'levels.bin')))
+        return sum(stars > 0 for stars in self.progress['stars'][self.get_mode()])
+
+    def get_shortest_time(self): # From Endless game mode if it has been created, else from the save file, so drawing this menu never generates a maze
+        endless_game_mode = self.game.get_created_state('endless_game_mode')
+        if endless_game_mode is not None:
+            return endless_game_mode.get_shortest_time()
+        if self.stats is None:
+            self.stats = load_stats()
+        return self.stats['shortest_time'][self.get_mode()]
 
     def draw_UI_elements(self):
         draw_text( # Levels button text - shows no. levels completed out of 45
             self.game.screen,
-            f'{self.game.levels_game_mode.get_levels_completed()} / 45',
+            f'{self.get_levels_completed()} / 45',
             SCREEN_WIDTH // 2,
             426,
             self.UI_text_font,
             WHITE,
             'center'
         )
-        shortest_time = self.game.endless_game_mode.get_shortest_time()
+        shortest_time = self.get_shortest_time()
         minutes = shortest_time // 60
         seconds = shortest_time % 60
         time = f'{minutes:01d} : {seconds:02d}' # Clock display MM : SS
@@ -272,7 +1044,7 @@ class PlayMode:
 class GameMode: # Parent Class
     def __init__(self, game):
         self.game = game
-        self.image = load_image('blank.png')
+        self.image = self.game.play_mode.get_game_mode_background()
         self.buttons = [
             Button(self.game, 50, 50, 'pause_button.png', self.pause_button_clicked, 72, 72)
         ]
@@ -282,17 +1054,17 @@ class GameMode: # Parent Class
         self.maze_height = None
         # Where to draw the maze
         self.maze_surface_pos = (353, 101)
-        self.maze_surface_width = 575
-        self.maze_surface_height = 575
+        self.maze_surface_width = MAZE_SURFACE_WIDTH
+        self.maze_surface_height = MAZE_SURFACE_HEIGHT
 
         self.maze = None
         self.player = None
-        self.start_time = pg.time.get_ticks() # Timer value when started
+        self.steps = 0 # Simulation steps since the run started - the timer counts these, so a replayed run always gets the same time
         self.elapsed_time = 0 # Seconds since level started
-        self.start_pause_time = 0 # Timer value when paused
-        self.elapsed_pause_time = 0 # Pause duration
         self.minutes = 0 # Clock display
         self.seconds = 0 # Clock display
+        self.input_log = None # Keys pressed this run, see InputLog
+        self.run_mode = None # Game mode value in the input log header
         self.goal_node_pos = None
         self.goal_node_image = None
         self.goal_node_rect = None
@@ -301,17 +1073,22 @@ class GameMode: # Parent Class
         self.title = None
         self.title_colour = None
         self.title_text_font = pg.font.Font(PARKVANE, 50)
-        self.path = None # List of nodes that form the shortest path maze solution
-        self.zero_star_image = pg.transform.smoothscale(load_image('0 star.png'), (153, 51))
+        self.path_length = 0 # Length of the shortest path maze solution
+        self.par_moves = 0 # Fewest slides needed to reach the goal
+        self.par_frames = 0 # Fewest frames spent sliding to reach the goal, by any route - not necessarily one of par moves
+        self.distance_field = None # Every cell's distance to the goal and next step towards it
+        self.player_cell = None # Cell the player last stopped in
+        self.detour = 0 # Extra cells travelled compared with always following a shortest path, 0 while still on one
+        self.show_hint = False # Toggled with H - shows the next step towards the goal
+        self.zero_star_image = assets.image('0 star.png', (153, 51))
         self.zero_star_rect = self.zero_star_image.get_rect()
-        self.one_star_image = pg.transform.smoothscale(load_image('1 star.png'), (153, 51))
+        self.one_star_image = assets.image('1 star.png', (153, 51))
         self.one_star_rect = self.one_star_image.get_rect()
-        self.two_star_image = pg.transform.smoothscale(load_image('2 star.png'), (153, 51))
+        self.two_star_image = assets.image('2 star.png', (153, 51))
         self.two_star_rect = self.two_star_image.get_rect()
-        self.three_star_image = pg.transform.smoothscale(load_image('3 star.png'), (153, 51))
+        self.three_star_image = assets.image('3 star.png', (153, 51))
         self.three_star_rect = self.three_star_image.get_rect()
         self.star_rating = 3
-        self.speed_constant = 6.02 # Solving speed required to achieve 3/3 stars - increasing it will make achieving 3/3 stars more difficult
 
     def get_mode(self):
         if self.game.play_mode.darkness_mode:
@@ -320,8 +1097,7 @@ class GameMode: # Parent Class
             return 'normal'      
 
     def pause_button_clicked(self):
-        self.game.is_paused = True
-        self.start_pause_time = pg.time.get_ticks()
+        self.game.is_paused = True # The timer stops with the simulation, as no steps are taken while paused
         pg.mixer.music.pause()
 
     def draw_title(self):
@@ -335,8 +1111,18 @@ class GameMode: # Parent Class
             'topleft'
         )
 
+    def start_run(self, level_number = 0): # Resets the timer and star rating, and starts recording the run
+        self.steps = 0
+        self.elapsed_time = 0
+        self.minutes = 0
+        self.seconds = 0
+        self.star_rating = 3
+        generator_version = GENERATOR_VERSION if self.maze.seed is not None else 0
+        self.input_log = InputLog(self.run_mode, self.game.play_mode.darkness_mode, level_number, self.maze.width, self.maze.height, self.maze.seed or 0, generator_version)
+
     def update_timer(self):
-        self.elapsed_time = (pg.time.get_ticks() - self.start_time) // 1000 # Elapsed time in seconds
+        self.steps += 1
+        self.elapsed_time = self.steps // FPS # Elapsed time in seconds
         self.minutes = self.elapsed_time // 60
         self.seconds = self.elapsed_time % 60
     
@@ -382,28 +1168,92 @@ class GameMode: # Parent Class
             'center'
         )
 
+    def draw_par(self):
+        draw_text(
+            self.game.screen,
+            'Par:',
+            (SCREEN_WIDTH + self.maze_surface_pos[0] + self.maze_surface_width) // 2,
+            480,
+            self.UI_label_font,
+            SPRING_GREEN,
+            'center'
+        )
+        draw_text(
+            self.game.screen,
+            str(self.par_moves), # Fewest moves the maze can be solved in
+            (SCREEN_WIDTH + self.maze_surface_pos[0] + self.maze_surface_width) // 2,
+            550,
+            self.UI_text_font,
+            SPRING_GREEN,
+            'center'
+        )
+
+    def start_tracking(self): # Starts tracking how far the player strays from a shortest path, using the maze's distance field (built once per maze)
+        self.distance_field = self.maze.get_distance_field(self.goal_node_pos)
+        self.player_cell = self.maze.array.index(self.player.x, self.player.y)
+        self.detour = 0
+
+    def update_tracking(self): # Adds how many more cells the last slide travelled than it brought the player closer to the goal - O(1) per slide, no search
+        if self.game.key_pressed == pg.K_h:
+            self.show_hint = not self.show_hint
+        cell = self.maze.array.index(self.player.x, self.player.y)
+        if cell != self.player_cell:
+            (x1, y1), (x2, y2) = self.maze.array.pos(self.player_cell), self.maze.array.pos(cell)
+            travelled = abs(x2 - x1) + abs(y2 - y1) # Slides are straight lines
+            distance = self.distance_field.distance
+            self.detour += travelled - (distance[self.player_cell] - distance[cell])
+            self.player_cell = cell
+
+    def update_camera(self): # Keeps the player in view on mazes too big for the maze surface
+        dx, dy = self.maze.follow(self.player.px)
+        if dx or dy:
+            self.player.shift(dx, dy)
+
+    def draw_maze(self): # Draws the maze, goal node and player, cut down to the part of the maze in view
+        clip = self.game.screen.get_clip()
+        self.game.screen.set_clip(self.maze.get_view_rect())
+        self.maze.draw(self.game.screen)
+        self.draw_goal_node()
+        self.player.draw()
+        self.game.screen.set_clip(clip)
+
+    def draw_hint(self): # Draws an arrow from the player towards the next cell on a shortest path, green while the player hasn't strayed from one
+        if not self.show_hint or self.player.is_moving:
+            return
+        next_cell = self.distance_field.next[self.player_cell]
+        if next_cell == -1: # At the goal
+            return
+        start = pg.Vector2(self.maze.pos_to_px(self.maze.array.pos(self.player_cell)))
+        end = pg.Vector2(self.maze.pos_to_px(self.maze.array.pos(next_cell)))
+        direction = (end - start).normalize()
+        side = pg.Vector2(-direction.y, direction.x)
+        head = self.maze.cell_size / 3
+        colour = SPRING_GREEN if self.detour == 0 else ORANGE
+        pg.draw.line(self.game.screen, colour, start + direction * head, end - direction * head, max(self.maze.cell_size // 8, 2))
+        pg.draw.polygon(self.game.screen, colour, [end, end - direction * head + side * head / 2, end - direction * head - side * head / 2])
+
+    def set_solution(self, path_length, par_moves, par_frames): # Stores the values the star rating and par are based on
+        self.path_length = path_length
+        self.par_moves = par_moves
+        self.par_frames = par_frames
+
     def is_winning(self): # Win condition
         if (self.player.x, self.player.y) == self.goal_node_pos:
             if not self.game.win:
                 pg.mixer.music.stop()
+                self.input_log.finish(self.steps)
             self.game.win = True
-            if self.game.state == self.game.endless_game_mode:
-                self.game.endless_win_screen.next_animation_time = pg.time.get_ticks() # Passes timer value to WinScreen when game won
-            elif self.game.state == self.game.levels_game_mode:
-                self.game.levels_win_screen.next_animation_time = pg.time.get_ticks() # Passes timer value to WinScreen when game won
+            if isinstance(self.game.state, EndlessGameMode): # Checking the class, as comparing with game.endless_game_mode would create it
+                self.game.endless_win_screen.next_animation_time = self.game.get_ticks() # Passes timer value to WinScreen when game won
+            elif isinstance(self.game.state, LevelsGameMode):
+                self.game.levels_win_screen.next_animation_time = self.game.get_ticks() # Passes timer value to WinScreen when game won
 
     def draw_goal_node(self):
         self.goal_node_rect.center = self.maze.pos_to_px(self.goal_node_pos)
         self.game.screen.blit(self.goal_node_image, self.goal_node_rect)
 
-    def update_star_rating(self): # Calculates the time brackets for achieving 1, 2 or 3 stars
-        three_star_time = len(self.path) / self.speed_constant # Max time to achieve 3/3 stars
-        if self.elapsed_time <= three_star_time:
-            self.star_rating = 3
-        elif self.elapsed_time <= three_star_time + 5:
-            self.star_rating = 2
-        else:
-            self.star_rating = 1
+    def update_star_rating(self):
+        self.star_rating = get_star_rating(self.elapsed_time, self.path_length, self.par_frames)
     
     def draw_star_rating(self):
         match self.star_rating:
@@ -420,8 +1270,9 @@ class GameMode: # Parent Class
     def draw_darkness_mode_overlay(self): # Limits the players vision
         self.darkness_mode_overlay = pg.Surface((self.maze_surface_width, self.maze_surface_height), pg.SRCALPHA)
         self.darkness_mode_overlay.fill((0, 0, 0, 255))
-        pixel_x = int(self.player.px[0] - self.maze.start_x) # Relative x-coord of darkness overlay surface
-        pixel_y = int(self.player.px[1] - self.maze.start_y) # Relative y-coord of darkness overlay surface
+        px = self.player.get_draw_px()
+        pixel_x = int(px[0] - self.maze.start_x) # Relative x-coord of darkness overlay surface
+        pixel_y = int(px[1] - self.maze.start_y) # Relative y-coord of darkness overlay surface
         radius = int(self.maze.cell_size * 2.5) # Give a 5 cell thick diameter
         pg.draw.circle(self.darkness_mode_overlay, (0, 0, 0, 0), (pixel_x, pixel_y), radius) # Draws transparent circle as a hole
         self.game.screen.blit(self.darkness_mode_overlay, self.maze_surface_pos)
@@ -430,19 +1281,30 @@ class GameMode: # Parent Class
 class EndlessGameMode(GameMode):
     def __init__(self, game):
         super().__init__(game)
-        with open(os.path.join(DATA_DIR, 'stats.json'), 'r') as f: # Loads from JSON
-            self.stats = json.load(f) # Stats dictionary
+        self.stats = load_stats() # Stats dictionary
         self.current_streak = 0 # Refers to the no. of consecutive three-star runs currently achieved
         self.maze_width = 20
         self.maze_height = 20
-        self.maze = Maze(self.maze_width, self.maze_height, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height) # Generates new maze
-        self.player = Player(self.game, self.maze, self.start_node_pos[0], self.start_node_pos[1]) # Instantiates player
         self.goal_node_pos = (self.maze_width - 1, self.maze_height - 1)
-        self.goal_node_image = pg.transform.smoothscale(load_image('goal_node.png'), (self.maze.cell_size, self.maze.cell_size))
-        self.goal_node_rect = self.goal_node_image.get_rect()
+        self.prefetcher = MazePrefetcher(self.build_round) # Next mazes are generated and solved off the render thread
+        self.prefetcher.start() # Started before anything is played, the first round is swapped in by reset when Endless is opened
         self.title = 'Endless'
         self.title_colour = PINK
-        self.path = self.maze.run_dijkstra(self.start_node_pos, self.goal_node_pos) # List of nodes that form the shortest path maze solution
+        self.run_mode = ENDLESS_RUN
+
+    def build_round(self): # Generates a new maze and works out its shortest path length and par values, runs on the prefetch worker
+        maze = Maze(self.maze_width, self.maze_height, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height)
+        par_moves, par_frames = maze.solve_par(self.start_node_pos, self.goal_node_pos)
+        distance_field = maze.get_distance_field(self.goal_node_pos) # Kept on the maze, so swapping the round in doesn't search again
+        return maze, distance_field.distance[maze.array.index(*self.start_node_pos)] + 1, par_moves, par_frames
+
+    def start_round(self, next_round): # Swaps in a round from build_round
+        self.maze, path_length, par_moves, par_frames = next_round
+        self.player = Player(self.game, self.maze, self.start_node_pos[0], self.start_node_pos[1]) # Instantiates player
+        self.set_solution(path_length, par_moves, par_frames)
+        self.start_tracking()
+        self.goal_node_image = assets.image('goal_node.png', (self.maze.cell_size, self.maze.cell_size)) # Shared through the asset cache, as every round's maze is the same size
+        self.goal_node_rect = self.goal_node_image.get_rect()
 
     def get_shortest_time(self): # Gets either normal mode or darkness mode's shortest time stat
         return self.stats['shortest_time'][self.get_mode()]
@@ -455,37 +1317,32 @@ class EndlessGameMode(GameMode):
         if not self.game.is_paused and not self.game.win:
             for button in self.buttons: # Only activates these buttons if not paused or game is not won
                 button.draw()
-        self.maze.draw(self.game.screen)
-        self.draw_goal_node()
-        self.player.draw()
+        self.draw_maze()
         self.draw_title()
         if self.game.play_mode.darkness_mode:
             self.draw_darkness_mode_overlay()
+        self.draw_hint()
         if not self.game.win:
             self.draw_timer()
             self.draw_moves_counter()
+            self.draw_par()
             self.draw_current_streak()
             self.draw_best_streak()
             self.draw_star_rating()
 
     def update(self):
         if not self.game.win:
+            self.input_log.record(self.steps, self.game.key_pressed)
             self.player.update()
+            self.update_camera()
+            self.update_tracking()
             self.update_star_rating()
             self.update_timer()
             self.is_winning()
     
     def reset(self):
-        self.maze = Maze(self.maze_width, self.maze_height, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height) # Generates a new maze
-        self.player = Player(self.game, self.maze, self.start_node_pos[0], self.start_node_pos[1]) # Instantiates player
-        self.start_time = pg.time.get_ticks() # Timer value when started
-        self.elapsed_time = 0 # Seconds since level started
-        self.start_pause_time = 0 # Timer value when paused
-        self.elapsed_pause_time = 0 # Pause duration
-        self.minutes = 0 # Clock display
-        self.seconds = 0 # Clock display
-        self.path = self.maze.run_dijkstra(self.start_node_pos, self.goal_node_pos) # List of nodes that form the shortest path maze solution
-        self.star_rating = 3
+        self.start_round(self.prefetcher.get()) # Swaps in the next maze, already generated and solved in the background
+        self.start_run()
         self.game.win = False
 
     def buttons_clicked(self):
@@ -535,25 +1392,26 @@ class EndlessGameMode(GameMode):
 class LevelsGameMode(GameMode):
     def __init__(self, game):
         super().__init__(game)
-        with open(os.path.join(DATA_DIR, 'levels.json'), 'r') as f: # Loads from JSON
-            self.levels = json.load(f) # Levels dictionary
+        self.levels = load_level_pack(os.path.join(DATA_DIR, 'levels.bin')) # List of level dictionaries (level geometry only, never rewritten by the game)
+        self.run_mode = LEVELS_RUN
+        self.progress = load_progress(self.levels) # Star ratings per mode, indexed by level number - 1
         self.current_level = self.levels[0] # Loads 1st level by default, changed later on
-        self.maze_width = len(self.current_level['maze']) # Length of the 1st dimension in the 2D array
-        self.maze_height = len(self.current_level['maze'][0]) # Length of the 2nd dimension in the 2D array
-        self.maze = Maze(self.maze_width, self.maze_height, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height, self.current_level['maze']) # Loads current level maze layout
+        self.maze_width = self.current_level['width'] # Length of the 1st dimension in the 2D array
+        self.maze_height = self.current_level['height'] # Length of the 2nd dimension in the 2D array
+        self.maze = create_level_maze(self.current_level, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height) # Loads current level maze layout
         self.player = Player(self.game, self.maze, self.start_node_pos[0], self.start_node_pos[1]) # Instantiates player
         self.goal_node_pos = (self.maze_width - 1, self.maze_height - 1)
-        self.goal_node_image = pg.transform.smoothscale(load_image('goal_node.png'), (self.maze.cell_size, self.maze.cell_size))
+        self.goal_node_image = assets.image('goal_node.png', (self.maze.cell_size, self.maze.cell_size))
         self.goal_node_rect = self.goal_node_image.get_rect()
-        self.path = self.maze.run_dijkstra(self.start_node_pos, self.goal_node_pos) # List of nodes that form the shortest path maze solution
+        self.solve_maze()
         self.star_rating = 3
         self.page = 1 # Loads the first page, which is the easy levels page
         self.page_image = [ # Images of the three dots which indicate what page the user is on
-            pg.transform.smoothscale(load_image('page1.png'), (60, 14)),
-            pg.transform.smoothscale(load_image('page2.png'), (60, 14)),
-            pg.transform.smoothscale(load_image('page3.png'), (60, 14))
+            assets.image('page1.png', (60, 14)),
+            assets.image('page2.png', (60, 14)),
+            assets.image('page3.png', (60, 14))
         ]
-        self.star_image = pg.transform.smoothscale(load_image('yellow_star.png'), (30, 30))
+        self.star_image = assets.image('yellow_star.png', (30, 30))
         self.select_title_text_font = pg.font.Font(PARKVANE, 80)
         self.level_number_font = pg.font.Font(MONTSERRAT_BOLD, 64)
         self.stars_collected_font = pg.font.Font(MONTSERRAT_REG, 24)
@@ -585,17 +1443,26 @@ class LevelsGameMode(GameMode):
             self.levels_icons.append(Button(self.game, x, y, [image, 'dark_icon.png'], self.play_level, 182, 182, i + 1))
         self.play_buttons = self.buttons # Taken from parent class and also used for endless game mode
 
+    def solve_maze(self): # Uses the par values stored in the level pack, so opening a level never searches for them
+        if 'par_moves' in self.current_level:
+            self.set_solution(self.current_level['path_length'], self.current_level['par_moves'], self.current_level['par_frames'])
+            solutions.get_distance_field(self.maze, self.start_node_pos, self.goal_node_pos, self.current_level) # Only the hint and detour tracking need a search, a BFS out from the goal that's cached after the level's first open
+        else: # Level packs older than version 3 have no par values, the solution cache works them out once
+            solution = solutions.solve(self.maze, self.start_node_pos, self.goal_node_pos)
+            self.set_solution(solution['path_length'], solution['par_moves'], solution['par_frames'])
+        self.start_tracking() # Uses the distance field the solution cache put on the maze
+
     def get_levels_completed(self): # Counts the no. levels completed (levels that have >= 1 star rating achieved)
         levels_completed = 0
-        for level in self.levels:
-            if level['stars'][self.get_mode()] > 0:
+        for stars in self.progress['stars'][self.get_mode()]:
+            if stars > 0:
                 levels_completed += 1
         return levels_completed
     
     def get_stars_collected(self): # Counts the number of stars collected in total from all levels
         stars_collected = 0
-        for level in self.levels:
-            stars_collected += level['stars'][self.get_mode()]
+        for stars in self.progress['stars'][self.get_mode()]:
+            stars_collected += stars
         return stars_collected
 
     def draw(self):
@@ -643,35 +1510,33 @@ class LevelsGameMode(GameMode):
             if not self.game.is_paused and not self.game.win:
                 for button in self.play_buttons: # Only activates these buttons if not paused or game is not won
                     button.draw()
-            self.maze.draw(self.game.screen)
-            self.draw_goal_node()
-            self.player.draw()
+            self.draw_maze()
             self.title = f'Level {self.current_level["number"]}'
             self.draw_title()
             if self.game.play_mode.darkness_mode:
                 self.draw_darkness_mode_overlay()
+            self.draw_hint()
             self.draw_instructions()
             if not self.game.win:
                 self.draw_timer()
                 self.draw_moves_counter()
+                self.draw_par()
                 self.draw_star_rating()
 
     def update(self):
         if not self.game.win and self.state == 'play':
+            self.input_log.record(self.steps, self.game.key_pressed)
             self.player.update()
+            self.update_camera()
+            self.update_tracking()
             self.update_star_rating()
             self.update_timer()
             self.is_winning()
     
     def reset(self):
         self.player = Player(self.game, self.maze, self.start_node_pos[0], self.start_node_pos[1])
-        self.start_time = pg.time.get_ticks() # Timer value when started
-        self.elapsed_time = 0 # Seconds since level started
-        self.start_pause_time = 0 # Timer value when paused
-        self.elapsed_pause_time = 0 # Pause duration
-        self.minutes = 0 # Clock display
-        self.seconds = 0 # Clock display
-        self.star_rating = 3
+        self.start_tracking()
+        self.start_run(self.current_level['number'])
         self.game.win = False
 
     
@@ -711,23 +1576,21 @@ class LevelsGameMode(GameMode):
     
     def play_level(self, num):
         self.current_level = self.levels[num - 1]
-        self.maze_width = len(self.current_level['maze'])
-        self.maze_height = len(self.current_level['maze'][0])
-        self.maze = Maze(self.maze_width, self.maze_height, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height, self.current_level['maze']) # Loads maze layout for the current level
+        self.maze_width = self.current_level['width']
+        self.maze_height = self.current_level['height']
+        self.maze = create_level_maze(self.current_level, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height) # Loads maze layout for the current level
         self.player = Player(self.game, self.maze, self.start_node_pos[0], self.start_node_pos[1]) # Instantiates player
         self.goal_node_pos = (self.maze_width - 1, self.maze_height - 1)
-        self.goal_node_image = pg.transform.smoothscale(load_image('goal_node.png'), (self.maze.cell_size, self.maze.cell_size))
+        self.goal_node_image = assets.image('goal_node.png', (self.maze.cell_size, self.maze.cell_size))
         self.goal_node_rect = self.goal_node_image.get_rect()
-        self.path = self.maze.run_dijkstra(self.start_node_pos, self.goal_node_pos) # List of nodes that form the shortest path maze solution
+        self.solve_maze()
         self.star_rating = 3
         self.state = 'play'
         self.reset()
         if self.game.play_mode.darkness_mode: # Chooses which soundtrack to play
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'darkness_gameplay_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('darkness_gameplay_music.mp3')
         else:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'normal_gameplay_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('normal_gameplay_music.mp3')
         
     def draw_icon_info(self): # Draw the numbers and star rating on each level icon button
         match self.page:
@@ -749,7 +1612,7 @@ class LevelsGameMode(GameMode):
                 'center'
             )
             # Draws the level star ratings
-            match self.levels[i]['stars'][self.get_mode()]:
+            match self.progress['stars'][self.get_mode()][i]:
                 case 0:
                     star_rating_image = self.zero_star_image
                     star_rating_rect = self.zero_star_rect
@@ -824,6 +1687,15 @@ class LevelsGameMode(GameMode):
                 WHITE,
                 'center'
             )
+            draw_text( # Line 6
+                self.game.screen,
+                'H for a hint',
+                (self.maze_surface_pos[0]) // 2,
+                SCREEN_HEIGHT // 2 + 225,
+                self.UI_text_font,
+                SPRING_GREEN,
+                'center'
+            )
     
     def draw_stars_collected(self): # Draws total no. stars collected from every level out of 135 stars (45 * 3 = 135)
         draw_text(
@@ -842,20 +1714,11 @@ class Button:
         self.game = game
         self.x = x
         self.y = y
-        self.images = [] # List of image variants or 'costumes'
-        if width and height:
-            if isinstance(images, list): # If list and has width and height scaling
-                for image in images:
-                    self.images.append(pg.transform.smoothscale(load_image(image), (width, height)))
-            else: # If not list and has width and height scaling
-                self.images.append(pg.transform.smoothscale(load_image(images), (width, height)))
-        else:
-            if isinstance(images, list): # If list and has no width and height scaling
-                for image in images:
-                    self.images.append(load_image(image))
-            else: # Not list and has no width and height scaling
-                self.images.append(load_image(images))
-        self.mask = pg.mask.from_surface(self.images[0]) # Creates mask of button
+        if not isinstance(images, list): # A single image is one costume
+            images = [images]
+        size = (width, height) if width and height else None # Scaled if width and height given
+        self.images = [assets.image(image, size) for image in images] # List of image variants or 'costumes', shared with other buttons using the same images
+        self.mask = assets.mask(images[0], size) # Mask of button, shared with other buttons using the same image
         self.rect = self.images[0].get_rect(center = (x, y))
         self.action = action
         self.name = name # This is an option attribute that stores the button's name
@@ -882,190 +1745,488 @@ class Button:
                     self.game.click_sound.set_volume(self.game.sfx_volume)
                 self.game.click_sound.play()
 
-class Node: # Nodes are each square that forms the 2D maze array
-    def __init__(self, x, y):
+class CompactMaze: # Flat array-backed 2D array of the maze - cell (x, y) is stored at index x * height + y
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.walls = bytearray([ALL_WALLS]) * self.size # 4-bit wall mask per cell, every wall is up until generated
+        self.version = 0 # Incremented whenever a wall changes, so that anything drawn from the walls knows when to redraw
+        self.reset_pathfinding()
+
+    def __len__(self): # Length of the 1st dimension, like a list of columns
+        return self.width
+
+    def __getitem__(self, x): # Allows array[x][y] indexing, which returns a Node view of the cell
+        if not 0 <= x < self.width:
+            raise IndexError('maze column out of range')
+        return NodeColumn(self, x)
+
+    def __iter__(self): # Iterates over columns of Node views
+        for x in range(self.width):
+            yield NodeColumn(self, x)
+
+    def reset_pathfinding(self): # Resets all cells' pathfinding attributes (parallel flat arrays)
+        self.distance = array('d', [float('inf')]) * self.size # Distance from the start node
+        self.previous = array('l', [-1]) * self.size # Index of the previous node on the path, -1 if none
+        self.is_path_visited = bytearray(self.size) # Visited flag for pathfinding
+
+    def index(self, x, y): # Converts a position in the maze to a flat array index
+        return x * self.height + y
+
+    def pos(self, index): # Converts a flat array index to a position in the maze
+        return divmod(index, self.height)
+
+    def node(self, index): # Node view of the cell at a flat array index
+        x, y = divmod(index, self.height)
+        return Node(self, x, y, index)
+
+    def get_reachable_neighbours(self, index): # Returns the indexes of adjacent cells with no wall in between
+        walls = self.walls[index]
+        neighbours = []
+        if not walls & TOP:
+            neighbours.append(index - 1)
+        if not walls & BOTTOM:
+            neighbours.append(index + 1)
+        if not walls & LEFT:
+            neighbours.append(index - self.height)
+        if not walls & RIGHT:
+            neighbours.append(index + self.height)
+        return neighbours
+
+    def get_walls(self, index): # Converts a cell's wall mask into a JSON-friendly walls dictionary
+        walls = self.walls[index]
+        return {side: bool(walls & flag) for side, flag in WALL_FLAGS.items()}
+
+    def set_walls(self, index, walls_dict): # Converts a walls dictionary into a cell's wall mask
+        mask = 0
+        for side, flag in WALL_FLAGS.items():
+            if walls_dict[side]:
+                mask |= flag
+        self.walls[index] = mask
+        self.version += 1
+
+class NodeColumn: # One column of Node views, so that array[x][y] indexing keeps working
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.x = x
+
+    def __len__(self):
+        return self.grid.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.grid.height:
+            raise IndexError('maze row out of range')
+        return Node(self.grid, self.x, y, self.x * self.grid.height + y)
+
+    def __iter__(self):
+        for y in range(self.grid.height):
+            yield self[y]
+
+class NodeWalls(MutableMapping): # Dictionary-like view of a cell's wall mask, e.g. node.walls['top']
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+    def __getitem__(self, side):
+        return bool(self.grid.walls[self.index] & WALL_FLAGS[side])
+
+    def __setitem__(self, side, value):
+        if value:
+            self.grid.walls[self.index] |= WALL_FLAGS[side]
+        else:
+            self.grid.walls[self.index] &= ~WALL_FLAGS[side]
+        self.grid.version += 1
+
+    def __delitem__(self, side):
+        raise TypeError('walls cannot be deleted')
+
+    def __iter__(self):
+        return iter(WALL_FLAGS)
+
+    def __len__(self):
+        return len(WALL_FLAGS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class Node: # Nodes are each square that forms the 2D maze array - a lightweight view of one cell of a CompactMaze
+    __slots__ = ('grid', 'x', 'y', 'index')
+
+    def __init__(self, grid, x, y, index = None):
+        self.grid = grid
         self.x = x
         self.y = y
-        self.is_visited = False # Visited flag for maze generation
-        self.is_path_visited = False # Visited flag for pathfinding
-        self.walls = {'top':True, 'bottom':True, 'left':True, 'right':True}
-        self.distance = float('inf') # Set to infinity
-        self.previous_node = None
-        self.heuristic = 0
+        self.index = grid.index(x, y) if index is None else index
+
+    def __eq__(self, other): # Views of the same cell are equal
+        return isinstance(other, Node) and self.index == other.index and self.grid is other.grid
+
+    def __hash__(self):
+        return self.index
+
+    def __repr__(self):
+        return f'Node({self.x}, {self.y})'
+
+    @property
+    def walls(self):
+        return NodeWalls(self.grid, self.index)
+
+    @walls.setter
+    def walls(self, walls_dict):
+        self.grid.set_walls(self.index, walls_dict)
+
+    @property
+    def is_path_visited(self): # Visited flag for pathfinding
+        return bool(self.grid.is_path_visited[self.index])
+
+    @is_path_visited.setter
+    def is_path_visited(self, value):
+        self.grid.is_path_visited[self.index] = value
+
+    @property
+    def distance(self):
+        return self.grid.distance[self.index]
+
+    @distance.setter
+    def distance(self, value):
+        self.grid.distance[self.index] = value
+
+    @property
+    def previous_node(self):
+        index = self.grid.previous[self.index]
+        return None if index == -1 else self.grid.node(index)
+
+    @previous_node.setter
+    def previous_node(self, node):
+        self.grid.previous[self.index] = -1 if node is None else node.index
 
 class Maze:
-    def __init__(self, width, height, surface_pos, surface_width, surface_height, walls_dict = None):
+    def __init__(self, width, height, surface_pos, surface_width, surface_height, walls_dict = None, wall_masks = None, seed = None):
         self.width = width
         self.height = height
+        self.seed = seed # Seed the walls were generated from, None for mazes loaded from wall masks
         self.stack = [] # Temporary stack used for the DFS maze generation algorithm
-        self.array = self.create_2D_array(width, height) # Creates a 2D array full of Node objects
+        self.array = self.create_2D_array(width, height) # Creates a compact 2D array of the maze's cells
+        self.viewport = pg.Rect(surface_pos, (surface_width, surface_height)) # Space the maze is drawn in, the camera scrolls mazes bigger than this
         # Determining the appropriate cell size from the ratio of space given to maze size
-        self.cell_size = min(surface_width // self.width, surface_height // self.height) # Take the smallest value as the node is a square
-        # Determine the coords of where to start drawing from to ensure the maze is aligned at the centre
-        self.start_x = surface_pos[0] + (surface_width - self.cell_size * self.width) // 2
-        self.start_y = surface_pos[1] + (surface_height - self.cell_size * self.height) // 2
-        if walls_dict: # If walls dict provided (from Levels game mode) then fill in walls to acheive the maze layout of the current level to be played
+        self.cell_size = max(min(surface_width // self.width, surface_height // self.height), MIN_CELL_SIZE) # Take the smallest value as the node is a square
+        # Determine the coords of where to start drawing from - centred along each axis the maze fits in, else the top-left of the maze is in view
+        self.start_x = self.viewport.x
+        self.start_y = self.viewport.y
+        self.clamp_camera()
+        # Pre-rendered walls in fixed-size chunks, cached until the walls, cell size or wall colour change
+        self.chunks = ChunkCache(self.render_chunk)
+        # Pathfinding visualiser colour coding at one pixel per cell, kept between frames and repainted cell by cell
+        self.overlay = None
+        self.overlay_algorithm = None
+        self.overlay_path_cells = set()
+        self.overlay_view = None # The part of the overlay in view, scaled up to the cell size
+        self.overlay_view_key = None
+        # Where a slide stops from every cell in every direction, rebuilt only when the walls change
+        self.jump_table = None
+        self.jump_table_version = None
+        # Corridors collapsed into a graph of junctions and dead ends for solving, rebuilt only when the walls change
+        self.junction_graph = None
+        self.junction_graph_version = None
+        # Par values per (start, goal, speed), cleared when the walls change
+        self.par_cache = {}
+        self.par_cache_version = None
+        # Every cell's distance to the goal and next step towards it, rebuilt only when the walls or goal change
+        self.distance_field = None
+        self.distance_field_key = None
+        if wall_masks is not None: # If wall masks provided (from the level pack in Levels game mode) then copy them in to acheive the maze layout of the current level to be played
+            self.array.walls[:] = wall_masks
+        elif walls_dict: # If walls dict provided (in the old levels.json format) then fill in walls cell by cell
             for x in range(self.width):
                 for y in range(self.height):
-                    self.array[x][y].walls = walls_dict[x][y]
-        else: # Else generate walls (for Endless game mode)
-            self.generate()
+                    self.array.set_walls(x * self.height + y, walls_dict[x][y])
+        else: # Else generate walls (for Endless game mode and seeded levels), from a new seed unless one is given so that every generated maze can be reproduced
+            if self.seed is None:
+                self.seed = random.getrandbits(32)
+            self.generate(self.seed)
+        self.get_jump_table() # Built once the layout is final, so the first keypress doesn't pay for it
 
     def to_dict(self): # This function is redundant as it was used solely for making the maze layout for levels 1-45 in Levels game mode
         array = []     # Converts Maze object into a JSON-friendly dictionary (so that it can be saved to JSON)
         for x in range(self.width):
             array.append([])
             for y in range(self.height):
-                array[x].append(self.array[x][y].walls)
+                array[x].append(self.array.get_walls(x * self.height + y))
         return array
 
-    def create_2D_array(self, width, height): # Creates a 2D array full of Node objects
-        array = []
-        for x in range(width):
-            array.append([])
-            for y in range(height):
-                array[x].append(Node(x, y))
-        return array
+    def create_2D_array(self, width, height): # Creates a compact 2D array of the maze's cells, indexed as array[x][y]
+        return CompactMaze(width, height)
     
-    def get_unvisited_neighbours(self, node): # Returns a list of univisited neighbouring nodes for maze generation
+    def get_unvisited_neighbours(self, index, is_visited): # Returns a list of univisited neighbouring cell indexes for maze generation
         neighbours = []
+        x, y = divmod(index, self.height)
 
-        if node.y > 0: # Checks top neighbour (only if exists)
-            if self.array[node.x][node.y - 1].is_visited == False:
-                neighbours.append(self.array[node.x][node.y - 1])
+        if y > 0: # Checks top neighbour (only if exists)
+            if not is_visited[index - 1]:
+                neighbours.append(index - 1)
         
-        if node.y < self.height - 1: # Checks bottom neighbour (only if exists)
-            if self.array[node.x][node.y + 1].is_visited == False:
-                neighbours.append(self.array[node.x][node.y + 1])
+        if y < self.height - 1: # Checks bottom neighbour (only if exists)
+            if not is_visited[index + 1]:
+                neighbours.append(index + 1)
 
-        if node.x > 0: # Checks left neighbour (only if exists)
-            if self.array[node.x - 1][node.y].is_visited == False:
-                neighbours.append(self.array[node.x - 1][node.y])   
+        if x > 0: # Checks left neighbour (only if exists)
+            if not is_visited[index - self.height]:
+                neighbours.append(index - self.height)
 
-        if node.x < self.width - 1: # Checks right neighbour (only if exists)
-            if self.array[node.x + 1][node.y].is_visited == False:
-                neighbours.append(self.array[node.x + 1][node.y])
+        if x < self.width - 1: # Checks right neighbour (only if exists)
+            if not is_visited[index + self.height]:
+                neighbours.append(index + self.height)
 
         return neighbours
     
-    def remove_walls(self, node1, node2): # Removes the walls seperating two nodes
-        if node1.x == node2.x and node1.y == node2.y + 1: # Top of node1
-            node1.walls['top'] = False
-            node2.walls['bottom'] = False
-        elif node1.x == node2.x and node1.y == node2.y - 1: # Bottom of node1
-            node1.walls['bottom'] = False
-            node2.walls['top'] = False
-        elif node1.x == node2.x + 1 and node1.y == node2.y: # Left of node1
-            node1.walls['left'] = False
-            node2.walls['right'] = False
-        elif node1.x == node2.x - 1 and node1.y == node2.y: # Right of node1
-            node1.walls['right'] = False
-            node2.walls['left'] = False
+    def remove_walls(self, index1, index2): # Removes the walls seperating two cells
+        walls = self.array.walls
+        if index1 == index2 + 1: # Top of cell 1
+            walls[index1] &= ~TOP
+            walls[index2] &= ~BOTTOM
+        elif index1 == index2 - 1: # Bottom of cell 1
+            walls[index1] &= ~BOTTOM
+            walls[index2] &= ~TOP
+        elif index1 == index2 + self.height: # Left of cell 1
+            walls[index1] &= ~LEFT
+            walls[index2] &= ~RIGHT
+        elif index1 == index2 - self.height: # Right of cell 1
+            walls[index1] &= ~RIGHT
+            walls[index2] &= ~LEFT
+        self.array.version += 1
         
-    def generate(self): # Randomly generates maze using DFS algorithm (aka recursive backtracking algorithm)
-        start_node = self.array[0][0]
-        start_node.is_visited = True
-        self.stack.append(start_node)
+    def generate(self, seed): # Randomly generates maze using DFS algorithm (aka recursive backtracking algorithm), the same seed and GENERATOR_VERSION always give the same walls
+        rng = random.Random(seed) # Private generator, so nothing else drawing random numbers can change the maze
+        is_visited = bytearray(self.width * self.height) # Visited flags for maze generation
+        start_index = 0
+        is_visited[start_index] = True
+        self.stack.append(start_index)
 
         while len(self.stack) > 0:
-            current_node = self.stack[-1]
-            neighbouring_nodes = self.get_unvisited_neighbours(current_node)
-
-            if len(neighbouring_nodes) > 0:
-                next_node = random.choice(neighbouring_nodes)
-                self.remove_walls(current_node, next_node)
-                next_node.is_visited = True
-                self.stack.append(next_node)
+            current_index = self.stack[-1]
+            neighbouring_indexes = self.get_unvisited_neighbours(current_index, is_visited)
+
+            if len(neighbouring_indexes) > 0:
+                next_index = rng.choice(neighbouring_indexes)
+                self.remove_walls(current_index, next_index)
+                is_visited[next_index] = True
+                self.stack.append(next_index)
             else:
                 self.stack.pop()
 
-    def draw(self, screen, pathfinding_algorithm = None, path = None, path_pointer = None, wall_colour = WHITE): # Draws the maze
-        wall_thickness = max(self.cell_size // 12, 1) # Range check - cell size : wall thickness ratio - minimum 1px
+    def draw(self, screen, pathfinding_algorithm = None, path = None, path_pointer = None, wall_colour = WHITE): # Draws the part of the maze in view
+        clip = screen.get_clip()
+        screen.set_clip(self.get_view_rect().clip(clip)) # Nothing scrolled out of view is drawn over the rest of the screen
 
         # Draws the colour coding of the pathfinding algorithm visualiser
         if pathfinding_algorithm:
-            for x in range(self.width):
-                for y in range(self.height):
-                    cell = self.array[x][y]
-                    x_pos = self.start_x + x * self.cell_size
-                    y_pos = self.start_y + y * self.cell_size
-                    cell_rect = pg.Rect(x_pos, y_pos, self.cell_size, self.cell_size)
-
-                    if cell == pathfinding_algorithm.start_node:
-                        colour = CYAN # Represents start node
-                    elif cell == pathfinding_algorithm.goal_node:
-                        colour = GOLD # Represents goal node
-                    elif path and cell in path[:path_pointer + 1]: # Includes presence check
-                        colour = DARK_GREEN # Represents path node if exists
-                    elif cell == pathfinding_algorithm.current_node:
-                        colour = RED # Represents current node
-                    elif cell in pathfinding_algorithm.open_set:
-                        colour = PINK # Represents queued node
-                    elif cell.is_path_visited:
-                        colour = GREEN # Represents visited node
-                    else:
-                        colour = None
-                    if colour:
-                        pg.draw.rect(screen, colour, cell_rect)
+            self.update_overlay(pathfinding_algorithm, path, path_pointer)
+            self.draw_overlay(screen)
+
+        # Draws the pre-rendered walls and border, one blit per chunk in view
+        wall_thickness = max(self.cell_size // 12, 1) # Range check - cell size : wall thickness ratio - minimum 1px
+        chunk_cells = self.get_chunk_cells()
+        x0, y0, x1, y1 = self.get_visible_cells()
+        for chunk_x in range(x0 // chunk_cells, (x1 - 1) // chunk_cells + 1):
+            for chunk_y in range(y0 // chunk_cells, (y1 - 1) // chunk_cells + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y), self.array.version, self.cell_size, wall_colour)
+                screen.blit(chunk, (self.start_x + chunk_x * chunk_cells * self.cell_size - wall_thickness, self.start_y + chunk_y * chunk_cells * self.cell_size - wall_thickness))
+        screen.set_clip(clip)
+
+    def update_overlay(self, pathfinding_algorithm, path = None, path_pointer = None): # Repaints only the cells whose colour coding changed since the last frame
+        if self.overlay is None or self.overlay_algorithm is not pathfinding_algorithm or (self.overlay_path_cells and not path):
+            # Starts a new overlay when the visualiser is set up again, and paints every coloured cell once
+            self.overlay = pg.Surface((self.width, self.height), pg.SRCALPHA)
+            self.overlay_algorithm = pathfinding_algorithm
+            self.overlay_path_cells = set() # Indexes of the final path cells drawn so far
+            self.overlay_view = None
+            changed_cells = set(itertools.compress(range(self.array.size), self.array.is_path_visited)) # Only visited, queued, current, start and goal cells have a colour
+            changed_cells.update(pathfinding_algorithm.open_set, (pathfinding_algorithm.start_node.index, pathfinding_algorithm.goal_node.index))
+            if pathfinding_algorithm.current_node:
+                changed_cells.add(pathfinding_algorithm.current_node.index)
+        else:
+            changed_cells = pathfinding_algorithm.changed_cells
+        if path: # Adds the final path cells revealed since the last frame
+            new_path_cells = {node.index for node in path[len(self.overlay_path_cells):path_pointer + 1]}
+            self.overlay_path_cells |= new_path_cells
+            changed_cells = new_path_cells.union(changed_cells)
+        x0, y0, x1, y1 = self.get_visible_cells()
+        if self.overlay_view_key != (x0, y0, x1, y1, self.cell_size): # The view has moved, so it's scaled up again when next drawn
+            self.overlay_view = None
+        for index in changed_cells:
+            colour = self.get_cell_colour(index, pathfinding_algorithm) or (0, 0, 0, 0)
+            x, y = divmod(index, self.height)
+            self.overlay.set_at((x, y), colour)
+            if self.overlay_view is not None and x0 <= x < x1 and y0 <= y < y1: # Also repaints the cell in the scaled up view, if it's in it
+                self.overlay_view.fill(colour, ((x - x0) * self.cell_size, (y - y0) * self.cell_size, self.cell_size, self.cell_size))
+        pathfinding_algorithm.changed_cells.clear()
+
+    def draw_overlay(self, screen): # Scales up only the part of the overlay in view, only when the view has changed
+        x0, y0, x1, y1 = self.get_visible_cells()
+        key = (x0, y0, x1, y1, self.cell_size)
+        if self.overlay_view is None or self.overlay_view_key != key:
+            area = self.overlay.subsurface((x0, y0, x1 - x0, y1 - y0))
+            self.overlay_view = pg.transform.scale(area, ((x1 - x0) * self.cell_size, (y1 - y0) * self.cell_size))
+            self.overlay_view_key = key
+        screen.blit(self.overlay_view, (self.start_x + x0 * self.cell_size, self.start_y + y0 * self.cell_size))
+
+    def get_cell_colour(self, index, pathfinding_algorithm): # Colour coding of one cell in the pathfinding algorithm visualiser
+        if index == pathfinding_algorithm.start_node.index:
+            return CYAN # Represents start node
+        elif index == pathfinding_algorithm.goal_node.index:
+            return GOLD # Represents goal node
+        elif index in self.overlay_path_cells:
+            return DARK_GREEN # Represents path node if exists
+        elif pathfinding_algorithm.current_node and index == pathfinding_algorithm.current_node.index:
+            return RED # Represents current node
+        elif index in pathfinding_algorithm.open_set:
+            return PINK # Represents queued node
+        elif self.array.is_path_visited[index]:
+            return GREEN # Represents visited node
+        return None
+
+    def get_chunk_cells(self): # Cells along each side of a wall chunk, so every chunk is about CHUNK_SIZE pixels whatever the zoom
+        if self.cell_size * self.width <= self.viewport.width and self.cell_size * self.height <= self.viewport.height:
+            return max(self.width, self.height) # A maze that fits the viewport is one chunk, drawn in a single blit
+        return max(CHUNK_SIZE // self.cell_size, 1)
+
+    def render_chunk(self, chunk_pos, wall_colour = WHITE): # Pre-renders the walls of one chunk onto an off-screen surface, overhanging the chunk by one wall thickness on each side as the walls do
+        chunk_cells = self.get_chunk_cells()
+        x0, y0 = chunk_pos[0] * chunk_cells, chunk_pos[1] * chunk_cells
+        x1, y1 = min(x0 + chunk_cells, self.width), min(y0 + chunk_cells, self.height)
+        wall_thickness = max(self.cell_size // 12, 1) # Range check - cell size : wall thickness ratio - minimum 1px
+        surface = pg.Surface(((x1 - x0) * self.cell_size + 2 * wall_thickness, (y1 - y0) * self.cell_size + 2 * wall_thickness), pg.SRCALPHA)
+        if pg.display.get_surface(): # Matches the display's pixel format for faster blits
+            surface = surface.convert_alpha()
+        self.draw_chunk_walls(surface, x0, y0, x1, y1, wall_colour, (wall_thickness - x0 * self.cell_size, wall_thickness - y0 * self.cell_size))
+        return surface
+
+    def draw_chunk_walls(self, screen, x0, y0, x1, y1, wall_colour = WHITE, origin = None): # Draws the walls of cells x0 <= x < x1, y0 <= y < y1, with the maze's top-left corner at origin
+        # Walls are always removed in pairs, so the bottom wall of one cell and the top wall of the cell below are drawn as one rect,
+        # and each run of walls along a grid line is merged into one rect too - the same pixels as draw_walls and draw_border in far fewer fills
+        wall_thickness = max(self.cell_size // 12, 1) # Range check - cell size : wall thickness ratio - minimum 1px
+        start_x, start_y = origin if origin else (self.start_x, self.start_y)
+        walls = self.array.walls
+        for y in range(y0, y1 + (y1 == self.height)): # Horizontal grid lines, the last chunk in a column also draws the bottom border
+            if y == 0 or y == self.height: # Border
+                runs = [(x0, x1)]
+            else:
+                runs = get_wall_runs(walls[x0 * self.height + y:x1 * self.height + y:self.height], TOP, x0)
+            for run_start, run_end in runs:
+                screen.fill(wall_colour, (start_x + run_start * self.cell_size - wall_thickness, start_y + y * self.cell_size - wall_thickness, (run_end - run_start) * self.cell_size + 2 * wall_thickness, 2 * wall_thickness))
+        for x in range(x0, x1 + (x1 == self.width)): # Vertical grid lines, the last chunk in a row also draws the right border
+            if x == 0 or x == self.width: # Border
+                runs = [(y0, y1)]
+            else:
+                runs = get_wall_runs(walls[x * self.height + y0:x * self.height + y1], LEFT, y0)
+            for run_start, run_end in runs:
+                screen.fill(wall_colour, (start_x + x * self.cell_size - wall_thickness, start_y + run_start * self.cell_size - wall_thickness, 2 * wall_thickness, (run_end - run_start) * self.cell_size + 2 * wall_thickness))
 
-        # Draw cell walls
+    def draw_walls(self, screen, wall_colour = WHITE, origin = None): # Draws every cell wall, with the maze's top-left corner at origin
+        wall_thickness = max(self.cell_size // 12, 1) # Range check - cell size : wall thickness ratio - minimum 1px
+        start_x, start_y = origin if origin else (self.start_x, self.start_y)
         for x in range(self.width):
             for y in range(self.height):
-                cell = self.array[x][y]
-                x_pos = self.start_x + x * self.cell_size
-                y_pos = self.start_y + y * self.cell_size
+                walls = self.array.walls[x * self.height + y] # Wall mask of the cell
+                x_pos = start_x + x * self.cell_size
+                y_pos = start_y + y * self.cell_size
 
-                if cell.walls['top'] == True: # Draws top wall
+                if walls & TOP: # Draws top wall
                     top = pg.Rect(x_pos - wall_thickness, y_pos, self.cell_size + 2 * wall_thickness, wall_thickness)
                     pg.draw.rect(screen, wall_colour, top)
 
-                if cell.walls['bottom'] == True: # Draws bottom wall
+                if walls & BOTTOM: # Draws bottom wall
                     bottom = pg.Rect(x_pos - wall_thickness, y_pos + self.cell_size - wall_thickness, self.cell_size + 2 * wall_thickness, wall_thickness)
                     pg.draw.rect(screen, wall_colour, bottom)
 
-                if cell.walls['left'] == True: # Draws left wall
+                if walls & LEFT: # Draws left wall
                     left = pg.Rect(x_pos, y_pos - wall_thickness, wall_thickness, self.cell_size + 2 * wall_thickness)
                     pg.draw.rect(screen, wall_colour, left)
 
-                if cell.walls['right'] == True: # Draws right wall
+                if walls & RIGHT: # Draws right wall
                     right = pg.Rect(x_pos + self.cell_size - wall_thickness, y_pos - wall_thickness, wall_thickness, self.cell_size + 2 * wall_thickness)
                     pg.draw.rect(screen, wall_colour, right)
-        
-        # Draws border around the maze
-        self.draw_border(screen, wall_colour)
 
-    def draw_border(self, screen, wall_colour = WHITE): # Draws border around the maze
+    def draw_border(self, screen, wall_colour = WHITE, origin = None): # Draws border around the maze, with the maze's top-left corner at origin
         wall_thickness = max(self.cell_size // 12, 1) # Range check - cell size : wall thickness ratio - minimum 1px
+        start_x, start_y = origin if origin else (self.start_x, self.start_y)
         # Draws border
         top_border = pg.Rect( # Draws top border
-            self.start_x - wall_thickness,
-            self.start_y - wall_thickness,
+            start_x - wall_thickness,
+            start_y - wall_thickness,
             self.cell_size * self.width + 2 * wall_thickness,
             wall_thickness * 2
         )
         pg.draw.rect(screen, wall_colour, top_border)
         bottom_border = pg.Rect( # Draws bottom border
-            self.start_x - wall_thickness,
-            self.start_y + self.cell_size * self.height - wall_thickness,
+            start_x - wall_thickness,
+            start_y + self.cell_size * self.height - wall_thickness,
             self.cell_size * self.width + 2 * wall_thickness,
             wall_thickness * 2
         )
         pg.draw.rect(screen, wall_colour, bottom_border)
         left_border = pg.Rect( # Draws left border
-            self.start_x - wall_thickness,
-            self.start_y - wall_thickness,
+            start_x - wall_thickness,
+            start_y - wall_thickness,
             wall_thickness * 2,
             self.cell_size * self.height + 2 * wall_thickness
         )
         pg.draw.rect(screen, wall_colour, left_border)
         right_border = pg.Rect( # Draws right border
-            self.start_x + self.cell_size * self.width - wall_thickness,
-            self.start_y - wall_thickness,
+            start_x + self.cell_size * self.width - wall_thickness,
+            start_y - wall_thickness,
             wall_thickness * 2,
             self.cell_size * self.height + 2 * wall_thickness
         )
         pg.draw.rect(screen, wall_colour, right_border)
 
+    def clamp_camera(self): # Centres the maze along each axis it fits in, otherwise keeps the viewport covered by the maze
+        maze_width_px = self.cell_size * self.width
+        maze_height_px = self.cell_size * self.height
+        if maze_width_px <= self.viewport.width:
+            self.start_x = self.viewport.x + (self.viewport.width - maze_width_px) // 2
+        else:
+            self.start_x = min(max(self.start_x, self.viewport.right - maze_width_px), self.viewport.x)
+        if maze_height_px <= self.viewport.height:
+            self.start_y = self.viewport.y + (self.viewport.height - maze_height_px) // 2
+        else:
+            self.start_y = min(max(self.start_y, self.viewport.bottom - maze_height_px), self.viewport.y)
+
+    def pan(self, dx, dy): # Scrolls the maze by up to (dx, dy) pixels, returning how far it actually moved so anything drawn in screen coords can move with it
+        old_x, old_y = self.start_x, self.start_y
+        self.start_x += int(dx)
+        self.start_y += int(dy)
+        self.clamp_camera()
+        return self.start_x - old_x, self.start_y - old_y
+
+    def follow(self, px): # Scrolls the maze to bring a pixel position to the middle of the viewport, as far as the maze allows
+        return self.pan(self.viewport.centerx - px[0], self.viewport.centery - px[1])
+
+    def get_zoom_range(self): # Smallest and largest cell size - mazes that fit the viewport can't be zoomed out of it
+        fit_cell_size = min(self.viewport.width // self.width, self.viewport.height // self.height)
+        return max(fit_cell_size, MIN_CELL_SIZE), max(fit_cell_size, MAX_CELL_SIZE)
+
+    def zoom(self, cell_size, anchor): # Changes the cell size, keeping the point of the maze under the anchor pixel still
+        min_cell_size, max_cell_size = self.get_zoom_range()
+        cell_size = min(max(cell_size, min_cell_size), max_cell_size)
+        self.start_x = round(anchor[0] - (anchor[0] - self.start_x) * cell_size / self.cell_size)
+        self.start_y = round(anchor[1] - (anchor[1] - self.start_y) * cell_size / self.cell_size)
+        self.cell_size = cell_size
+        self.clamp_camera()
+
+    def get_view_rect(self): # Part of the screen the maze is drawn on - the whole maze and its border, cut down to the viewport for mazes that are scrolled
+        wall_thickness = max(self.cell_size // 12, 1) # Range check - cell size : wall thickness ratio - minimum 1px
+        maze_rect = pg.Rect(self.start_x, self.start_y, self.cell_size * self.width, self.cell_size * self.height).inflate(2 * wall_thickness, 2 * wall_thickness)
+        return maze_rect.clip(self.viewport.inflate(2 * wall_thickness, 2 * wall_thickness))
+
+    def get_visible_cells(self): # Range of cells in view, as x0, y0, x1, y1 with the ends exclusive
+        x0 = max((self.viewport.x - self.start_x) // self.cell_size, 0)
+        y0 = max((self.viewport.y - self.start_y) // self.cell_size, 0)
+        x1 = min(-(-(self.viewport.right - self.start_x) // self.cell_size), self.width) # Rounds up to include cells partly in view
+        y1 = min(-(-(self.viewport.bottom - self.start_y) // self.cell_size), self.height)
+        return x0, y0, x1, y1
+
     def pos_to_px(self, pos): # Converts position in the maze to pixel position on the screen
         return [self.start_x + (pos[0] + 0.5) * self.cell_size, self.start_y + (pos[1] + 0.5) * self.cell_size]
 
@@ -1073,51 +2234,147 @@ class Maze:
         return [(px[0] - self.start_x) / self.cell_size - 0.5, (px[1] - self.start_y) / self.cell_size - 0.5]
     
     def target_node(self, pos, direction): # Finds the furthest node a player can reach when travelling in one direction without crossing a junction
-        x = pos[0]
-        y = pos[1]
-        match direction:
-            case 'north':
-                while not self.array[x][y].walls['top']:
-                    y -= 1
-                    if not self.array[x][y].walls['left'] or not self.array[x][y].walls['right']:
-                        return (x, y) # When a junction is reached
-                
-            case 'east':
-                while not self.array[x][y].walls['right']:
-                    x += 1
-                    if not self.array[x][y].walls['top'] or not self.array[x][y].walls['bottom']:
-                        return (x, y) # When a junction is reached
-                    
-            case 'south':
-                while not self.array[x][y].walls['bottom']:
-                    y += 1
-                    if not self.array[x][y].walls['left'] or not self.array[x][y].walls['right']:
-                        return (x, y) # When a junction is reached
-                    
-            case 'west':
-                while not self.array[x][y].walls['left']:
-                    x -= 1
-                    if not self.array[x][y].walls['top'] or not self.array[x][y].walls['bottom']:
-                        return (x, y) # When a junction is reached
-        return (x, y) # When a dead end is reached
+        stop_index = self.get_jump_table()[direction][pos[0] * self.height + pos[1]]
+        return divmod(stop_index, self.height) # (x, y) of the junction or dead end reached
+
+    def get_jump_table(self): # Returns the jump table, rebuilding it if the walls have changed since it was built
+        if self.jump_table_version != self.array.version:
+            self.jump_table = self.build_jump_table()
+            self.jump_table_version = self.array.version
+        return self.jump_table
+
+    def build_jump_table(self): # Finds the stop cell of every slide with one sweep per direction
+        walls = self.array.walls # Wall masks of every cell
+        height = self.height
+        size = self.array.size
+        # Each direction is a flat array of cell indexes, every cell starts as its own stop cell (a wall in that direction)
+        north = array('i', range(size))
+        south = array('i', range(size))
+        east = array('i', range(size))
+        west = array('i', range(size))
+        # Each sweep visits cells in the order a slide would be walked backwards, so the cell slid into already knows where its slide stops
+        for column in range(0, size, height):
+            for index in range(column + 1, column + height): # Top to bottom
+                if not walls[index] & TOP:
+                    above = index - 1
+                    if (walls[above] & (LEFT | RIGHT)) != LEFT | RIGHT: # Stops at a junction
+                        north[index] = above
+                    else:
+                        north[index] = north[above]
+            for index in range(column + height - 2, column - 1, -1): # Bottom to top
+                if not walls[index] & BOTTOM:
+                    below = index + 1
+                    if (walls[below] & (LEFT | RIGHT)) != LEFT | RIGHT:
+                        south[index] = below
+                    else:
+                        south[index] = south[below]
+        for index in range(height, size): # Left to right
+            if not walls[index] & LEFT:
+                left = index - height
+                if (walls[left] & (TOP | BOTTOM)) != TOP | BOTTOM:
+                    west[index] = left
+                else:
+                    west[index] = west[left]
+        for index in range(size - height - 1, -1, -1): # Right to left
+            if not walls[index] & RIGHT:
+                right = index + height
+                if (walls[right] & (TOP | BOTTOM)) != TOP | BOTTOM:
+                    east[index] = right
+                else:
+                    east[index] = east[right]
+        return {'north': north, 'east': east, 'south': south, 'west': west}
     
     def get_reachable_neighbours(self, node): # Returns a list of adjacent nodes with no wall in between
-        neighbours = []
-        if not node.walls['top']:
-            neighbours.append(self.array[node.x][node.y - 1])
-        if not node.walls['bottom']:
-            neighbours.append(self.array[node.x][node.y + 1])
-        if not node.walls['left']:
-            neighbours.append(self.array[node.x - 1][node.y])
-        if not node.walls['right']:
-            neighbours.append(self.array[node.x + 1][node.y])
-        return neighbours
+        return [self.array.node(index) for index in self.array.get_reachable_neighbours(node.index)]
     
-    def run_dijkstra(self, start_node_pos, goal_node_pos): # Runs Dijkstra's algorithm to find the shortest path
-        start_node = self.array[start_node_pos[0]][start_node_pos[1]]
-        goal_node = self.array[goal_node_pos[0]][goal_node_pos[1]]
-        return Dijkstra(self).run(start_node, goal_node)
+    def get_slide_frames(self, index, stop_index, speed): # Frames a slide between two cells takes, matching Player.move - moving until the target is passed, then one frame to snap to it
+        x, y = divmod(index, self.height)
+        stop_x, stop_y = divmod(stop_index, self.height)
+        distance = (abs(stop_x - x) + abs(stop_y - y)) * self.cell_size
+        return -(-distance // speed) + 1 # Ceiling division
+
+    def solve_par(self, start_node_pos, goal_node_pos, speed = PLAYER_SPEED): # Returns the fewest slide moves and the fewest frames spent sliding to get from start to goal, or None if the goal can't be reached
+        if self.par_cache_version != self.array.version:
+            self.par_cache = {}
+            self.par_cache_version = self.array.version
+        key = (start_node_pos, goal_node_pos, speed)
+        if key not in self.par_cache:
+            self.par_cache[key] = self.find_par(self.array.index(*start_node_pos), self.array.index(*goal_node_pos), speed)
+        return self.par_cache[key]
+
+    def find_par(self, start, goal, speed):
+        # Every cell's four slides, as stop cell indexes
+        slides = [self.get_jump_table()[direction] for direction in ('north', 'east', 'south', 'west')]
+        # Fewest moves - breadth-first search, as every slide is one move
+        moves = {start: 0}
+        queue = deque([start])
+        while queue and goal not in moves:
+            index = queue.popleft()
+            for slide in slides:
+                stop_index = slide[index]
+                if stop_index not in moves:
+                    moves[stop_index] = moves[index] + 1
+                    queue.append(stop_index)
+        if goal not in moves:
+            return None
+        # Fewest frames over every route, found separately from the fewest moves - the fastest route can take more slides than par, and the star rating needs the fastest possible solve
+        # Dijkstra's algorithm, as slides take longer the further they go
+        frames = {start: 0}
+        open_set = [(0, start)]
+        while open_set:
+            current_frames, index = heapq.heappop(open_set)
+            if index == goal:
+                break
+            if current_frames > frames[index]: # Stale entry, a faster route was already found
+                continue
+            for slide in slides:
+                stop_index = slide[index]
+                if stop_index != index:
+                    new_frames = current_frames + self.get_slide_frames(index, stop_index, speed)
+                    if new_frames < frames.get(stop_index, float('inf')):
+                        frames[stop_index] = new_frames
+                        heapq.heappush(open_set, (new_frames, stop_index))
+        return moves[goal], frames[goal]
+
+    def get_distance_field(self, goal_node_pos): # Returns the distance field to a goal, rebuilding it if the walls or goal have changed since it was built
+        key = (self.array.version, goal_node_pos)
+        if self.distance_field_key != key:
+            self.distance_field = DistanceField(self, self.array.index(*goal_node_pos))
+            self.distance_field_key = key
+        return self.distance_field
+
+    def get_junction_graph(self): # Returns the junction graph, rebuilding it if the walls have changed since it was built
+        if self.junction_graph_version != self.array.version:
+            self.junction_graph = JunctionGraph(self)
+            self.junction_graph_version = self.array.version
+        return self.junction_graph
+
+    def run_dijkstra(self, start_node_pos, goal_node_pos): # Runs Dijkstra's algorithm on the junction graph to find the shortest path
+        path = self.get_junction_graph().shortest_path(self.array.index(*start_node_pos), self.array.index(*goal_node_pos))
+        if path is not None:
+            return [self.array.node(index) for index in path] # Path of nodes from goal node to start node, like Dijkstra.retrace
     
+    def get_metrics(self, start_node_pos, goal_node_pos): # Measures of how hard the maze is to solve, or None if the goal can't be reached
+        graph = self.get_junction_graph()
+        path = self.get_distance_field(goal_node_pos).path_from(self.array.index(*start_node_pos))
+        par = self.solve_par(start_node_pos, goal_node_pos)
+        if path is None or par is None:
+            return None
+        open_sides = self.array.walls.translate(OPEN_SIDES)
+        corridors = [length for a, b, length, cells in graph.edges]
+        steps = [b - a for a, b in zip(path, path[1:])]
+        # Every open side of a solution cell leads along the solution or off it, and each step along it uses up two
+        side_branches = sum(open_sides[index] for index in path) - 2 * len(steps)
+        return {
+            'solution_length': len(path),
+            'slide_moves': par[0],
+            'dead_ends': open_sides.count(1),
+            'junctions': open_sides.count(3) + open_sides.count(4),
+            'mean_corridor_length': sum(corridors) / len(corridors) if corridors else 0,
+            'turns': sum(step != next_step for step, next_step in zip(steps, steps[1:])),
+            'branching_factor': side_branches / len(path) # Wrong turns on offer per solution cell
+        }
+
     def setup_dijkstra(self, start_node_pos, goal_node_pos): # Sets up the animation for the Dijkstra's algorithm visualiser
         start_node = self.array[start_node_pos[0]][start_node_pos[1]]
         goal_node = self.array[goal_node_pos[0]][goal_node_pos[1]]
@@ -1132,6 +2389,22 @@ class Maze:
         astar.setup(start_node, goal_node)
         return astar
 
+    def run_bfs(self, start_node_pos, goal_node_pos): # Runs a breadth-first search cell by cell, returning the same path of nodes from goal node to start node as run_dijkstra
+        return BFS(self).run(self.array.node(self.array.index(*start_node_pos)), self.array.node(self.array.index(*goal_node_pos)))
+
+    def run_bidirectional_bfs(self, start_node_pos, goal_node_pos): # Runs breadth-first searches from both ends, returning the same path of nodes from goal node to start node as run_dijkstra
+        return BidirectionalBFS(self).run(self.array.node(self.array.index(*start_node_pos)), self.array.node(self.array.index(*goal_node_pos)))
+
+    def setup_bfs(self, start_node_pos, goal_node_pos): # Sets up the animation for the BFS visualiser
+        bfs = BFS(self)
+        bfs.setup(self.array.node(self.array.index(*start_node_pos)), self.array.node(self.array.index(*goal_node_pos)))
+        return bfs
+
+    def setup_bidirectional_bfs(self, start_node_pos, goal_node_pos): # Sets up the animation for the bidirectional BFS visualiser
+        bidirectional_bfs = BidirectionalBFS(self)
+        bidirectional_bfs.setup(self.array.node(self.array.index(*start_node_pos)), self.array.node(self.array.index(*goal_node_pos)))
+        return bidirectional_bfs
+
 class Player:
     def __init__(self, game, maze, x = 0, y = 0):
         self.game = game # Reference to the Game object
@@ -1139,6 +2412,7 @@ class Player:
         self.x = x # Position in the maze array
         self.y = y # Position in the maze array
         self.px = self.maze.pos_to_px((self.x, self.y)) # Converts player position to pixel coords
+        self.previous_px = list(self.px) # Pixel coords before the last simulation step, for render interpolation
         self.direction = None
         self.queued_direction = None
         self.is_moving = False
@@ -1146,16 +2420,21 @@ class Player:
         self.target_node_pos = None
         self.target_node_px = None
 
-        self.speed = 5 # Moves 5 pixels per frame
+        self.speed = PLAYER_SPEED # Moves 5 pixels per frame
         self.colour = GREEN
         self.trail_colour = GREEN
         self.trail = [(self.x, self.y)] # Trail path nodes
         self.moves = 0 # No. moves made
 
     def update(self):
+        self.previous_px = list(self.px)
         self.handle_input()
         self.move()
 
+    def get_draw_px(self): # Pixel coords between the last two simulation steps, so movement is smooth at any render frame rate
+        alpha = self.game.alpha
+        return [previous + (current - previous) * alpha for previous, current in zip(self.previous_px, self.px)]
+
     def handle_input(self):
         if not self.is_moving: # Resets queued direction to none when stationary
             self.queued_direction = None
@@ -1291,7 +2570,7 @@ class Player:
             pg.draw.rect(self.game.screen, self.trail_colour, static_rect)
 
         last_px = self.maze.pos_to_px(self.trail[-1]) # Draws the dynamic part of the trail
-        dynamic_rect = self.create_rect(last_px, self.px, trail_thickness)
+        dynamic_rect = self.create_rect(last_px, self.get_draw_px(), trail_thickness)
         pg.draw.rect(self.game.screen, self.trail_colour, dynamic_rect)
 
     def create_rect(self, start_px, end_px, thickness): # Draws a vertical or horizontal rectangle based on the two points given
@@ -1311,14 +2590,24 @@ class Player:
         if len(self.trail) > 1 and self.target_node_pos == self.trail[-2]:
             self.trail.pop() # Remove last item if player is backtracking
 
+    def shift(self, dx, dy): # Moves the player's pixel coords along with the maze when the camera scrolls
+        self.px[0] += dx
+        self.px[1] += dy
+        self.previous_px[0] += dx
+        self.previous_px[1] += dy
+        if self.target_node_px:
+            self.target_node_px[0] += dx
+            self.target_node_px[1] += dy
+
     def draw(self): # Draws player as a circle and the trail
         self.draw_trail()
-        pg.draw.circle(self.game.screen, self.colour, (int(self.px[0]), int(self.px[1])), self.maze.cell_size // 2.5)
+        px = self.get_draw_px()
+        pg.draw.circle(self.game.screen, self.colour, (int(px[0]), int(px[1])), self.maze.cell_size // 2.5)
 
 class PauseMenu:
     def __init__(self, game):
         self.game = game
-        self.image = pg.transform.smoothscale(load_image('paused.png'), (419, 161)) # Pause title
+        self.image = assets.image('paused.png', (419, 161)) # Pause title
         self.buttons = [
             Button(self.game, SCREEN_WIDTH // 2, 421, 'play_button2.png', self.play_button_clicked, 206, 206),
             Button(self.game, 452, 421, 'home_button.png', self.home_button_clicked, 139, 139),
@@ -1339,24 +2628,20 @@ class PauseMenu:
 
     def play_button_clicked(self):
         self.game.is_paused = False # Exits pause menu state
-        self.game.state.elapsed_pause_time = pg.time.get_ticks() - self.game.state.start_pause_time # Calculate pause duration
-        self.game.state.start_time += self.game.state.elapsed_pause_time # Shifts start time forward when unpaused
         pg.mixer.music.unpause()
 
     def home_button_clicked(self):
         self.game.is_paused = False # Exits pause menu state
         # Returns to correct game mode
-        if self.game.state == self.game.levels_game_mode:
+        if isinstance(self.game.state, LevelsGameMode):
             self.game.state.state = 'select'
         else:
             self.game.state = self.game.play_mode
         # Choose which soundtrack to play based on the darkness mode theme being on/off
         if self.game.play_mode.darkness_mode:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'darkness_bg_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('darkness_bg_music.mp3')
         else:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'normal_bg_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('normal_bg_music.mp3')
         pg.mixer.music.unpause()
 
     def controls_button_clicked(self):
@@ -1365,15 +2650,15 @@ class PauseMenu:
 class WinScreen: # Parent class
     def __init__(self, game):
         self.game = game
-        self.image1 = pg.transform.smoothscale(load_image('win1.png'), (720, 649)) # Win screen image without icons for time taken and moves made
-        self.image2 = pg.transform.smoothscale(load_image('win2.png'), (720, 649)) # Win screen image with icons for time taken and no. moves made
+        self.image1 = assets.image('win1.png', (720, 649)) # Win screen image without icons for time taken and moves made
+        self.image2 = assets.image('win2.png', (720, 649)) # Win screen image with icons for time taken and no. moves made
         self.overlay = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA) # Darkens screen
         self.overlay.fill((0, 0, 0, 180))
         self.font = pg.font.Font(MONTSERRAT_BOLD, 32)
-        self.zero_star_image = pg.transform.smoothscale(load_image('0 star.png'), (261, 87))
-        self.one_star_image = pg.transform.smoothscale(load_image('1 star.png'), (261, 87))
-        self.two_star_image = pg.transform.smoothscale(load_image('2 star.png'), (261, 87))
-        self.three_star_image = pg.transform.smoothscale(load_image('3 star.png'), (261, 87))
+        self.zero_star_image = assets.image('0 star.png', (261, 87))
+        self.one_star_image = assets.image('1 star.png', (261, 87))
+        self.two_star_image = assets.image('2 star.png', (261, 87))
+        self.three_star_image = assets.image('3 star.png', (261, 87))
         self.current_star = 0 # Current star value during animation
         self.current_star_image = self.zero_star_image # Current star animated
         self.next_animation_time = 0
@@ -1406,7 +2691,7 @@ class WinScreen: # Parent class
 
     def animate(self):
         if self.game.win and not self.stop_animation:
-            current_time = pg.time.get_ticks() 
+            current_time = self.game.get_ticks() 
             if self.current_star < self.game.state.star_rating: # Animates until star rating is displayed
                 if current_time - self.next_animation_time > self.animation_delay: # Display each star at intervals
                     self.current_star += 1
@@ -1441,15 +2726,24 @@ class WinScreen: # Parent class
         self.reset()
         # Choose which soundtrack to play based on the darkness mode theme being on/off
         if self.game.play_mode.darkness_mode:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'darkness_gameplay_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('darkness_gameplay_music.mp3')
         else:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'normal_gameplay_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('normal_gameplay_music.mp3')
 
     def controls_button_clicked(self):
         self.game.show_settings = True
 
+    def get_verified_run(self): # Replays the run from its packed input log, returning the log as text to save if the replay gets the same result, else None
+        data = self.game.state.input_log.to_bytes()
+        try:
+            levels = self.game.state.levels if isinstance(self.game.state, LevelsGameMode) else [] # Endless runs need no levels, and this keeps Levels game mode from being created
+            replay = replay_input_log(load_input_log(data), levels)
+        except ValueError: # A log that cannot be replayed is not saved, but the run itself still counts
+            return None
+        if not replay.is_finished or (replay.elapsed_time, replay.star_rating, replay.player.moves) != (self.game.state.elapsed_time, self.game.state.star_rating, self.game.state.player.moves):
+            return None
+        return base64.b64encode(data).decode('ascii')
+
 class EndlessWinScreen(WinScreen):
     def __init__(self, game):
         super().__init__(game)
@@ -1464,23 +2758,24 @@ class EndlessWinScreen(WinScreen):
         self.game.state = self.game.play_mode
         # Choose which soundtrack to play based on the darkness mode theme being on/off
         if self.game.play_mode.darkness_mode:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'darkness_bg_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('darkness_bg_music.mp3')
         else:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'normal_bg_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('normal_bg_music.mp3')
 
     def update_score(self):
         if self.game.state.elapsed_time < self.game.state.get_shortest_time(): # Check high score for time
             self.game.state.stats['shortest_time'][self.game.state.get_mode()] = self.game.state.elapsed_time
-            with open(os.path.join(DATA_DIR, 'stats.json'), 'w') as f: # Update .json file if there is a change
-                json.dump(self.game.state.stats, f, indent = 4)
+            run = self.get_verified_run()
+            if run is None: # Only runs that replay to the same result keep their input log
+                self.game.state.stats['best_runs'].pop(self.game.state.get_mode(), None)
+            else:
+                self.game.state.stats['best_runs'][self.game.state.get_mode()] = run
+            persistence.save_json(os.path.join(DATA_DIR, 'stats.json'), self.game.state.stats) # Update .json file if there is a change
         if self.game.state.star_rating == 3:
             self.game.state.current_streak += 1 # Increment current streak
             if self.game.state.current_streak > self.game.state.get_best_streak(): # Check high score for streak
                 self.game.state.stats['best_streak'][self.game.state.get_mode()] = self.game.state.current_streak
-                with open(os.path.join(DATA_DIR, 'stats.json'), 'w') as f: # Update .json file if there is a change
-                    json.dump(self.game.state.stats, f, indent = 4)
+                persistence.save_json(os.path.join(DATA_DIR, 'stats.json'), self.game.state.stats) # Update .json file if there is a change
         else:
             self.game.state.current_streak = 0 # Streak broken
 
@@ -1500,11 +2795,9 @@ class LevelsWinScreen(WinScreen):
         self.game.state.state = 'select'
         # Choose which soundtrack to play based on the darkness mode theme being on/off
         if self.game.play_mode.darkness_mode:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'darkness_bg_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('darkness_bg_music.mp3')
         else:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'normal_bg_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('normal_bg_music.mp3')
     
     def continue_button_clicked(self): # Continues to next level
         if self.game.state.current_level['number'] == 45: # Quits to levels selector on last level
@@ -1514,15 +2807,20 @@ class LevelsWinScreen(WinScreen):
             self.game.state.play_level(self.game.state.current_level['number'] + 1)
     
     def update_score(self):
-        if self.game.state.star_rating > self.game.state.levels[self.game.state.current_level['number'] - 1]['stars'][self.game.state.get_mode()]: # Check high score for star rating
-            self.game.state.levels[self.game.state.current_level['number'] - 1]['stars'][self.game.state.get_mode()] = self.game.state.star_rating
-            with open(os.path.join(DATA_DIR, 'levels.json'), 'w') as f: # Update .json file if there is a change
-                json.dump(self.game.state.levels, f, indent = 4)
+        stars = self.game.state.progress['stars'][self.game.state.get_mode()]
+        if self.game.state.star_rating > stars[self.game.state.current_level['number'] - 1]: # Check high score for star rating
+            stars[self.game.state.current_level['number'] - 1] = self.game.state.star_rating
+            run = self.get_verified_run()
+            if run is None: # Only runs that replay to the same result keep their input log
+                self.game.state.progress['runs'][self.game.state.get_mode()].pop(str(self.game.state.current_level['number']), None)
+            else:
+                self.game.state.progress['runs'][self.game.state.get_mode()][str(self.game.state.current_level['number'])] = run
+            persistence.save_json(os.path.join(DATA_DIR, 'progress.json'), self.game.state.progress) # Update progress file if there is a change
 
 class Settings:
     def __init__(self, game):
         self.game = game
-        self.image = pg.transform.smoothscale(load_image('settings.png'), (508, 170)) # Settings title
+        self.image = assets.image('settings.png', (508, 170)) # Settings title
         self.buttons = [
             Button(self.game, 56, 670, 'back_button.png', self.back_button_clicked, 81, 72),
             Button(self.game, 466, 360, ['sfx_on.png', 'sfx_off.png'], self.sfx_button_clicked, 76, 76),
@@ -1606,165 +2904,541 @@ class Settings:
             'mute_music': self.game.mute_music,
             'music_volume': self.game.music_volume
         }
-        with open(os.path.join(DATA_DIR, 'settings.json'), 'w') as f:
-            json.dump(settings_info, f, indent = 4)
+        persistence.save_json(os.path.join(DATA_DIR, 'settings.json'), settings_info)
+
+class PriorityQueue: # Binary heap of the nodes a pathfinding algorithm is queueing (the open set)
+    def __init__(self):
+        self.heap = [] # Heap entries of [priority, insertion order, node]
+        self.entries = {} # Maps each queued node to its live heap entry
+        self.counter = itertools.count() # Insertion order - breaks ties so nodes with equal priority leave in the order they were queued
+
+    def __len__(self): # No. nodes queued
+        return len(self.entries)
+
+    def __contains__(self, node): # Presence check in O(1)
+        return node in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def push(self, node, priority): # Queues a node, or updates its priority if it is already queued (decrease-key)
+        if node in self.entries:
+            old_entry = self.entries[node]
+            order = old_entry[1] # Keeps its original place in the queue for tie-breaks
+            old_entry[2] = None # Lazy deletion - the old entry is skipped when it reaches the top of the heap
+        else:
+            order = next(self.counter)
+        entry = [priority, order, node]
+        self.entries[node] = entry
+        heapq.heappush(self.heap, entry)
+
+    def pop(self): # Removes and returns the node with the lowest priority
+        while self.heap:
+            node = heapq.heappop(self.heap)[2]
+            if node is not None: # Skips entries removed by lazy deletion
+                del self.entries[node]
+                return node
+        raise IndexError('pop from an empty priority queue')
+
+class FifoQueue: # First in, first out queue of the nodes a breadth-first search is queueing, with the same interface as PriorityQueue
+    def __init__(self):
+        self.queue = deque()
+        self.entries = set() # Queued nodes, for presence checks in O(1)
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __contains__(self, node):
+        return node in self.entries
+
+    def __iter__(self):
+        return iter(self.queue)
+
+    def push(self, node, priority = None): # Priority is ignored, every edge costs the same so the order nodes are found in is the order of their distance
+        self.queue.append(node)
+        self.entries.add(node)
+
+    def pop(self):
+        node = self.queue.popleft()
+        self.entries.discard(node)
+        return node
+
+class Frontiers: # Both open sets of a bidirectional search, seen as one open set by the visualiser
+    def __init__(self):
+        self.queues = (FifoQueue(), FifoQueue()) # Searching forwards from the start, backwards from the goal
+
+    def __len__(self):
+        return len(self.queues[0]) + len(self.queues[1])
+
+    def __contains__(self, node):
+        return node in self.queues[0] or node in self.queues[1]
+
+    def __iter__(self):
+        return itertools.chain(*self.queues)
 
 class Dijkstra:
     def __init__(self, maze):
         self.maze = maze
         self.current_node = None
-        self.open_set = None # List of nodes the algorithm is queueing
+        self.open_set = None # Priority queue of node indexes the algorithm is queueing
+        self.changed_cells = set() # Indexes of cells whose visualiser colour changed since they were last drawn
 
     def reset_nodes(self): # Resets all nodes' pathfinding attributes
-        for column in self.maze.array:
-            for node in column:
-                node.is_path_visited = False
-                node.distance = float('inf') # Set to infinity
-                node.previous_node = None
-                node.heuristic = 0
+        self.maze.array.reset_pathfinding()
 
     def retrace(self, goal_node): # Outputs the path of nodes from goal node to start node
-        current_node = goal_node
+        grid = self.maze.array
         path = [goal_node]
-        while current_node.previous_node:
-            current_node = current_node.previous_node
-            path.append(current_node) # Connects the previous node pointers to form a list
+        index = grid.previous[goal_node.index]
+        while index != -1:
+            path.append(grid.node(index)) # Connects the previous node pointers to form a list
+            index = grid.previous[index]
         return path
 
     def run(self, start_node, goal_node): # Gives the shortest path instantly
         self.reset_nodes()
-        start_node.distance = 0
-        open_set = [] # List of nodes the algorithm is queueing
-        open_set.append(start_node)
+        grid = self.maze.array
+        distance = grid.distance
+        previous = grid.previous
+        is_path_visited = grid.is_path_visited
+        goal_index = goal_node.index
+        distance[start_node.index] = 0
+        open_set = PriorityQueue() # Node indexes the algorithm is queueing, ordered by distance cost
+        open_set.push(start_node.index, 0)
 
         while open_set:
-            closest_node = open_set[0]
-            index = 0
-            # Finds the closest node in the open set based on distance cost
-            for i in range(len(open_set)):
-                if open_set[i].distance < closest_node.distance:
-                    closest_node = open_set[i]
-                    index = i
             # Visits the closest node in the open set and removes it from open set
-            current_node = open_set.pop(index)
-            current_node.is_path_visited = True 
+            current_index = open_set.pop()
+            is_path_visited[current_index] = True
             # Algorithm stops if the goal node is found
-            if current_node == goal_node:
+            if current_index == goal_index:
                 return self.retrace(goal_node) # Returns the path nodes list if goal node is found
             # Investigates the current node's neighbours
-            neighbouring_nodes = self.maze.get_reachable_neighbours(current_node)
-            for i in range(len(neighbouring_nodes)): # Find an unvisited neighbouring node
-                if not neighbouring_nodes[i].is_path_visited:
-                    new_distance = current_node.distance + 1 # Distance from start increases by 1 each square
-                    if new_distance < neighbouring_nodes[i].distance: # Updates the nodes' distance from start if a shorter distance is found
-                        neighbouring_nodes[i].distance = new_distance
-                        neighbouring_nodes[i].previous_node = current_node
-                        open_set.append(neighbouring_nodes[i])
+            new_distance = distance[current_index] + 1 # Distance from start increases by 1 each square
+            for neighbour_index in grid.get_reachable_neighbours(current_index): # Find an unvisited neighbouring node
+                if not is_path_visited[neighbour_index] and new_distance < distance[neighbour_index]: # Updates the nodes' distance from start if a shorter distance is found
+                    distance[neighbour_index] = new_distance
+                    previous[neighbour_index] = current_index
+                    open_set.push(neighbour_index, new_distance)
 
     def setup(self, start_node, goal_node): # Sets up the animation for the Dijkstra's algorithm visualiser
         self.reset_nodes()
         self.start_node = start_node
         self.goal_node = goal_node
-        self.start_node.distance = 0
-        self.open_set = [] # List of nodes the algorithm is queueing
-        self.open_set.append(self.start_node)
+        self.maze.array.distance[self.start_node.index] = 0
+        self.changed_cells = set() # A newly set up solver gets a new overlay, which paints every coloured cell itself
+        self.open_set = PriorityQueue() # Node indexes the algorithm is queueing, ordered by distance cost
+        self.open_set.push(self.start_node.index, 0)
 
     
     def run_frame(self):
         if self.open_set:
-            self.closest_node = self.open_set[0]
-            index = 0
-             # Finds the closest node in the open set based on distance cost
-            for i in range(len(self.open_set)):
-                if self.open_set[i].distance < self.closest_node.distance:
-                    self.closest_node = self.open_set[i]
-                    index = i
+            grid = self.maze.array
             # Visits the closest node in the open set and removes it from open set
-            self.current_node = self.open_set.pop(index)
-            self.current_node.is_path_visited = True
+            current_index = self.open_set.pop()
+            if self.current_node: # The previous current node is now only visited
+                self.changed_cells.add(self.current_node.index)
+            self.current_node = grid.node(current_index)
+            self.changed_cells.add(current_index)
+            grid.is_path_visited[current_index] = True
             # Algorithm stops if the goal node is found
-            if self.current_node == self.goal_node:
+            if current_index == self.goal_node.index:
                 return self.retrace(self.goal_node) # Returns the path nodes list if goal node is found
             # Investigates the current node's neighbours
-            self.neighbouring_nodes = self.maze.get_reachable_neighbours(self.current_node)
-            for i in range(len(self.neighbouring_nodes)): # Find an unvisited neighbouring node
-                if not self.neighbouring_nodes[i].is_path_visited:
-                    new_distance = self.current_node.distance + 1 # Distance from start increases by 1 each square
-                    if new_distance < self.neighbouring_nodes[i].distance: # Updates the nodes' distance from start if a shorter distance is found
-                        self.neighbouring_nodes[i].distance = new_distance
-                        self.neighbouring_nodes[i].previous_node = self.current_node
-                        self.open_set.append(self.neighbouring_nodes[i])
+            new_distance = grid.distance[current_index] + 1 # Distance from start increases by 1 each square
+            for neighbour_index in grid.get_reachable_neighbours(current_index): # Find an unvisited neighbouring node
+                if not grid.is_path_visited[neighbour_index] and new_distance < grid.distance[neighbour_index]: # Updates the nodes' distance from start if a shorter distance is found
+                    grid.distance[neighbour_index] = new_distance
+                    grid.previous[neighbour_index] = current_index
+                    self.open_set.push(neighbour_index, new_distance)
+                    self.changed_cells.add(neighbour_index)
             
             return False # Returns False if search needs to carry on
         else:
             return True # Returns True if search is finished
 
-class AStar:
-    def __init__(self, maze):
-        self.maze = maze
-        self.current_node = None
-        self.open_set = None # List of nodes the algorithm is queueing
-
-    def get_heuristic(self, node):
-        return abs(node.x - self.goal_node.x) + abs(node.y - self.goal_node.y) # Returns the manhattan distance as the heuristic value
-
-    def reset_nodes(self): # Resets all nodes' pathfinding attributes
-        for column in self.maze.array:
-            for node in column:
-                node.is_path_visited = False
-                node.distance = float('inf') # Set to infinity
-                node.previous_node = None
-                node.heuristic = self.get_heuristic(node)
-
-    def retrace(self, goal_node): # Outputs the path of nodes from goal node to start node
-        current_node = goal_node
-        path = [goal_node]
-        while current_node.previous_node:
-            current_node = current_node.previous_node
-            path.append(current_node) # Connects the previous node pointers to form a list
-        return path
+class AStar(Dijkstra): # Shares the node bookkeeping with Dijkstra's, but orders the open set by distance + heuristic
+    def get_heuristic(self, index):
+        x, y = self.maze.array.pos(index)
+        return abs(x - self.goal_node.x) + abs(y - self.goal_node.y) # Returns the manhattan distance as the heuristic value
 
     def setup(self, start_node, goal_node): # Sets up the animation for the A* algorithm visualiser
         self.start_node = start_node
         self.goal_node = goal_node
         self.reset_nodes()
-        self.start_node.distance = 0
-        self.open_set = [] # List of nodes the algorithm is queueing
-        self.open_set.append(self.start_node)
+        self.maze.array.distance[self.start_node.index] = 0
+        self.changed_cells = set() # A newly set up solver gets a new overlay, which paints every coloured cell itself
+        self.open_set = PriorityQueue() # Node indexes the algorithm is queueing, ordered by distance + heuristic cost
+        self.open_set.push(self.start_node.index, self.get_heuristic(self.start_node.index))
     
     def run_frame(self):
         if self.open_set:
-            self.closest_node = self.open_set[0]
-            index = 0
-            # Finds the closest node in the open set based on distance + heuristic cost
-            for i in range(len(self.open_set)):
-                if self.open_set[i].distance + self.open_set[i].heuristic < self.closest_node.distance + self.closest_node.heuristic:
-                    self.closest_node = self.open_set[i]
-                    index = i
+            grid = self.maze.array
             # Visits the closest node in the open set and removes it from open set
-            self.current_node = self.open_set.pop(index)
-            self.current_node.is_path_visited = True
+            current_index = self.open_set.pop()
+            if self.current_node: # The previous current node is now only visited
+                self.changed_cells.add(self.current_node.index)
+            self.current_node = grid.node(current_index)
+            self.changed_cells.add(current_index)
+            grid.is_path_visited[current_index] = True
             # Algorithm stops if the goal node is found
-            if self.current_node == self.goal_node:
+            if current_index == self.goal_node.index:
                 return self.retrace(self.goal_node) # Returns the path nodes list if goal node is found
             # Investigates the current node's neighbours
-            self.neighbouring_nodes = self.maze.get_reachable_neighbours(self.current_node)
-            for i in range(len(self.neighbouring_nodes)): # Find an unvisited neighbouring node
-                if not self.neighbouring_nodes[i].is_path_visited:
-                    new_distance = self.current_node.distance + 1 # Distance from start increases by 1 each square
-                    if new_distance < self.neighbouring_nodes[i].distance: # Updates the nodes' distance from start if a shorter distance is found
-                        self.neighbouring_nodes[i].distance = new_distance
-                        self.neighbouring_nodes[i].previous_node = self.current_node
-                        self.open_set.append(self.neighbouring_nodes[i])
+            new_distance = grid.distance[current_index] + 1 # Distance from start increases by 1 each square
+            for neighbour_index in grid.get_reachable_neighbours(current_index): # Find an unvisited neighbouring node
+                if not grid.is_path_visited[neighbour_index] and new_distance < grid.distance[neighbour_index]: # Updates the nodes' distance from start if a shorter distance is found
+                    grid.distance[neighbour_index] = new_distance
+                    grid.previous[neighbour_index] = current_index
+                    self.open_set.push(neighbour_index, new_distance + self.get_heuristic(neighbour_index))
+                    self.changed_cells.add(neighbour_index)
             
             return False # Returns False if search needs to carry on
         else:
             return True # Returns True if search is finished
 
+class BFS(Dijkstra): # Breadth-first search - every step costs 1, so a first in, first out queue visits nodes in order of distance without a heap
+    def run(self, start_node, goal_node): # Gives the shortest path instantly
+        self.reset_nodes()
+        grid = self.maze.array
+        distance = grid.distance
+        previous = grid.previous
+        is_path_visited = grid.is_path_visited
+        goal_index = goal_node.index
+        distance[start_node.index] = 0
+        open_set = deque([start_node.index])
+
+        while open_set:
+            current_index = open_set.popleft()
+            is_path_visited[current_index] = True
+            if current_index == goal_index:
+                return self.retrace(goal_node)
+            new_distance = distance[current_index] + 1
+            for neighbour_index in grid.get_reachable_neighbours(current_index):
+                if distance[neighbour_index] == float('inf'): # Found for the first time, which is always along a shortest path
+                    distance[neighbour_index] = new_distance
+                    previous[neighbour_index] = current_index
+                    open_set.append(neighbour_index)
+
+    def setup(self, start_node, goal_node): # Sets up the animation for the BFS visualiser
+        self.reset_nodes()
+        self.start_node = start_node
+        self.goal_node = goal_node
+        self.maze.array.distance[self.start_node.index] = 0
+        self.changed_cells = set() # A newly set up solver gets a new overlay, which paints every coloured cell itself
+        self.open_set = FifoQueue() # Node indexes the algorithm is queueing, in the order they were found
+        self.open_set.push(self.start_node.index)
+
+    def run_frame(self):
+        if self.open_set:
+            grid = self.maze.array
+            # Visits the node queued the longest and removes it from open set
+            current_index = self.open_set.pop()
+            if self.current_node: # The previous current node is now only visited
+                self.changed_cells.add(self.current_node.index)
+            self.current_node = grid.node(current_index)
+            self.changed_cells.add(current_index)
+            grid.is_path_visited[current_index] = True
+            # Algorithm stops if the goal node is found
+            if current_index == self.goal_node.index:
+                return self.retrace(self.goal_node) # Returns the path nodes list if goal node is found
+            # Queues the current node's neighbours that haven't been found yet
+            new_distance = grid.distance[current_index] + 1
+            for neighbour_index in grid.get_reachable_neighbours(current_index):
+                if grid.distance[neighbour_index] == float('inf'):
+                    grid.distance[neighbour_index] = new_distance
+                    grid.previous[neighbour_index] = current_index
+                    self.open_set.push(neighbour_index)
+                    self.changed_cells.add(neighbour_index)
+
+            return False # Returns False if search needs to carry on
+        else:
+            return True # Returns True if search is finished
+
+class BidirectionalBFS(Dijkstra): # Breadth-first searches from the start and from the goal that stop where they meet - on perfect mazes from corner to corner this saves nothing over BFS, it only helps on open or braided mazes
+    def reset_nodes(self):
+        super().reset_nodes()
+        grid = self.maze.array
+        self.goal_distance = array('d', [float('inf')]) * grid.size # Distance from the goal node, for the backward search
+        self.next = array('l', [-1]) * grid.size # Index of the next node towards the goal, -1 if none
+
+    def join(self, forward_index, backward_index): # Outputs the path of nodes from goal node to start node through where the searches met
+        grid = self.maze.array
+        path = []
+        index = backward_index
+        while index != -1: # From the meeting point to the goal, then reversed
+            path.append(grid.node(index))
+            index = self.next[index]
+        path.reverse()
+        index = forward_index
+        while index != -1:
+            path.append(grid.node(index))
+            index = grid.previous[index]
+        return path
+
+    def expand(self, current_index, side, neighbours): # Queues the neighbours one search hasn't found yet, returning the best meeting with the other search as (length, forward index, backward index)
+        grid = self.maze.array
+        distances = (grid.distance, self.goal_distance)
+        links = (grid.previous, self.next)
+        distance = distances[side]
+        other_distance = distances[1 - side]
+        new_distance = distance[current_index] + 1
+        best_meeting = None
+        for neighbour_index in neighbours:
+            if other_distance[neighbour_index] != float('inf'): # The other search already reached this neighbour
+                length = new_distance + other_distance[neighbour_index]
+                if best_meeting is None or length < best_meeting[0]:
+                    best_meeting = (length, current_index, neighbour_index) if side == 0 else (length, neighbour_index, current_index)
+            elif distance[neighbour_index] == float('inf'):
+                distance[neighbour_index] = new_distance
+                links[side][neighbour_index] = current_index
+                self.open_set.queues[side].push(neighbour_index)
+                self.changed_cells.add(neighbour_index)
+        return best_meeting
+
+    def start_level(self): # Picks the smaller frontier to expand a whole level of next, returns False if either search has run out of nodes
+        queues = self.open_set.queues
+        if not queues[0] or not queues[1]:
+            return False
+        self.side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        self.level_remaining = len(queues[self.side])
+        return True
+
+    def run(self, start_node, goal_node): # Gives the shortest path instantly
+        self.reset_nodes()
+        if start_node == goal_node:
+            return [goal_node]
+        grid = self.maze.array
+        distances = (grid.distance, self.goal_distance)
+        links = (grid.previous, self.next)
+        is_path_visited = grid.is_path_visited
+        distances[0][start_node.index] = 0
+        distances[1][goal_node.index] = 0
+        queues = (deque([start_node.index]), deque([goal_node.index]))
+        meeting = None
+
+        while queues[0] and queues[1]:
+            side = 0 if len(queues[0]) <= len(queues[1]) else 1 # Expands a whole level of the smaller frontier
+            distance = distances[side]
+            other_distance = distances[1 - side]
+            link = links[side]
+            queue = queues[side]
+            for _ in range(len(queue)):
+                current_index = queue.popleft()
+                is_path_visited[current_index] = True
+                new_distance = distance[current_index] + 1
+                for neighbour_index in grid.get_reachable_neighbours(current_index):
+                    if other_distance[neighbour_index] != float('inf'): # The searches meet
+                        length = new_distance + other_distance[neighbour_index]
+                        if meeting is None or length < meeting[0]:
+                            meeting = (length, current_index, neighbour_index) if side == 0 else (length, neighbour_index, current_index)
+                    elif distance[neighbour_index] == float('inf'):
+                        distance[neighbour_index] = new_distance
+                        link[neighbour_index] = current_index
+                        queue.append(neighbour_index)
+            if meeting: # Only stops once the level is finished, in case a later node in it meets the other search sooner
+                return self.join(meeting[1], meeting[2])
+
+    def setup(self, start_node, goal_node): # Sets up the animation for the bidirectional BFS visualiser
+        self.reset_nodes()
+        self.start_node = start_node
+        self.goal_node = goal_node
+        self.maze.array.distance[self.start_node.index] = 0
+        self.goal_distance[self.goal_node.index] = 0
+        self.changed_cells = set() # A newly set up solver gets a new overlay, which paints every coloured cell itself
+        self.open_set = Frontiers() # Node indexes each search is queueing, in the order they were found
+        self.open_set.queues[0].push(self.start_node.index)
+        self.open_set.queues[1].push(self.goal_node.index)
+        self.side = 0 # Search expanding the current level - 0 forwards, 1 backwards
+        self.level_remaining = 0 # Nodes left to expand in the current level
+        # Shortest (length, forward index, backward index) found where the searches meet - the level it was found in is
+        # finished before stopping, as a later node in the same level can still meet the other search sooner
+        self.meeting = (0, self.start_node.index, -1) if start_node == goal_node else None
+
+    def run_frame(self):
+        if self.meeting is not None and not self.level_remaining:
+            return self.join(self.meeting[1], self.meeting[2]) # Returns the path nodes list once the searches have met
+        if not self.level_remaining and not self.start_level():
+            return True # Returns True if search is finished without the searches meeting
+        grid = self.maze.array
+        # Visits the node the current search queued the longest and removes it from open set
+        current_index = self.open_set.queues[self.side].pop()
+        self.level_remaining -= 1
+        if self.current_node: # The previous current node is now only visited
+            self.changed_cells.add(self.current_node.index)
+        self.current_node = grid.node(current_index)
+        self.changed_cells.add(current_index)
+        grid.is_path_visited[current_index] = True
+        meeting = self.expand(current_index, self.side, grid.get_reachable_neighbours(current_index))
+        if meeting and (self.meeting is None or meeting[0] < self.meeting[0]):
+            self.meeting = meeting
+        return False # Returns False if search needs to carry on
+
+class DistanceField: # Every cell's distance to one goal and its next step towards it, from a single breadth-first search out from the goal
+    def __init__(self, maze, goal, distance = None, next_cells = None): # Arrays that are passed in (e.g. from the solution cache) are used as they are, without searching
+        grid = maze.array
+        self.goal = goal
+        if distance is not None:
+            self.distance = distance
+            self.next = next_cells
+            return
+        self.distance = array('i', [-1]) * grid.size # Steps to the goal, -1 if the goal can't be reached
+        self.next = array('i', [-1]) * grid.size # Next cell on a shortest path to the goal, -1 for the goal itself
+        self.distance[goal] = 0
+        open_set = deque([goal])
+        while open_set:
+            current_index = open_set.popleft()
+            new_distance = self.distance[current_index] + 1
+            for neighbour_index in grid.get_reachable_neighbours(current_index):
+                if self.distance[neighbour_index] == -1:
+                    self.distance[neighbour_index] = new_distance
+                    self.next[neighbour_index] = current_index
+                    open_set.append(neighbour_index)
+
+    def path_from(self, index): # Shortest path of cell indexes from a cell to the goal, found by following next steps without searching, or None if the goal can't be reached
+        if self.distance[index] == -1:
+            return None
+        path = [index]
+        while index != self.goal:
+            index = self.next[index]
+            path.append(index)
+        return path
+
+class JunctionGraph: # The maze with its corridors collapsed, so that a search only expands junctions and dead ends
+    def __init__(self, maze):
+        self.maze = maze
+        grid = maze.array
+        self.is_key = grid.walls.translate(IS_KEY_CELL) # 1 for junctions and dead ends (the graph's nodes), 0 for corridor cells
+        # Each edge is a corridor: (end cell a, end cell b, length in steps, corridor cells in order from a to b)
+        self.edges = []
+        self.adjacent = {index: [] for index in range(grid.size) if self.is_key[index]} # Key cell -> ids of the edges leaving it
+        self.edge_of = array('i', [-1]) * grid.size # Corridor cell -> id of the edge it is part of
+        self.offset = array('i', [0]) * grid.size # Corridor cell -> position in its edge's corridor cells
+        self.expanded = 0 # No. key cells expanded by the last search, for benchmarking
+        walls = grid.walls
+        is_key = self.is_key
+        steps = [] # Wall mask -> index offsets of the open sides, in top, bottom, left, right order
+        for mask in range(ALL_WALLS + 1):
+            steps.append([step for flag, step in ((TOP, -1), (BOTTOM, 1), (LEFT, -grid.height), (RIGHT, grid.height)) if not mask & flag])
+        for a in self.adjacent:
+            for step in steps[walls[a]]:
+                # Follows the corridor until it reaches another key cell
+                cells = []
+                previous = a
+                current = a + step
+                while not is_key[current]:
+                    cells.append(current)
+                    first, second = steps[walls[current]]
+                    previous, current = current, current + first if current + first != previous else current + second
+                b = current
+                # Every corridor is found from both ends, only the first is kept
+                if a < b or (a == b and cells[0] < cells[-1]):
+                    self.add_edge(a, b, cells)
+
+    def add_edge(self, a, b, cells):
+        edge_id = len(self.edges)
+        self.edges.append((a, b, len(cells) + 1, cells))
+        if a != b: # Loops back to the same junction are never part of a shortest path
+            self.adjacent[a].append(edge_id)
+            self.adjacent[b].append(edge_id)
+        for position, cell in enumerate(cells):
+            self.edge_of[cell] = edge_id
+            self.offset[cell] = position
+
+    def get_position(self, cell, edge_id): # Position of a cell along an edge, counting steps from end a
+        a, b, length, cells = self.edges[edge_id]
+        if self.is_key[cell]:
+            return 0 if cell == a else length
+        return self.offset[cell] + 1
+
+    def get_exits(self, cell): # Key cells a search can start from/finish at, as (key cell, steps to it, edge id, key cell's position on the edge)
+        if self.is_key[cell]:
+            return [(cell, 0, None, None)]
+        edge_id = self.edge_of[cell]
+        a, b, length, cells = self.edges[edge_id]
+        position = self.offset[cell] + 1
+        return [(a, position, edge_id, 0), (b, length - position, edge_id, length)]
+
+    def path_along(self, edge_id, start_position, end_position): # Cells along an edge from one position to another, both ends included
+        a, b, length, cells = self.edges[edge_id]
+        sequence = [a] + cells + [b]
+        if start_position <= end_position:
+            return sequence[start_position:end_position + 1]
+        return sequence[end_position:start_position + 1][::-1]
+
+    def shortest_path(self, start, goal): # Returns the shortest path of cell indexes from goal to start, like Dijkstra.retrace
+        self.expanded = 0
+        if start == goal:
+            return [start]
+        if not self.is_key[start] and self.edge_of[start] == -1: # A loop of corridor with no junctions, only possible in mazes that aren't perfect
+            path = Dijkstra(self.maze).run(self.maze.array.node(start), self.maze.array.node(goal))
+            return [node.index for node in path] if path else None
+
+        best_distance = float('inf')
+        best_key = None
+        if not self.is_key[start] and not self.is_key[goal] and self.edge_of[start] == self.edge_of[goal]: # Start and goal in the same corridor
+            best_distance = abs(self.offset[start] - self.offset[goal])
+        goal_exits = {}
+        for key, steps, edge_id, position in self.get_exits(goal):
+            if key not in goal_exits or steps < goal_exits[key][0]:
+                goal_exits[key] = (steps, edge_id, position)
+
+        # Dijkstra's algorithm over key cells, starting from the ends of the start's corridor
+        distance = {}
+        previous = {} # Key cell -> (previous key cell, edge id, key cell's position on the edge)
+        open_set = []
+        order = itertools.count() # Tie-breaker so equal distances are expanded in the order they were queued
+        for key, steps, edge_id, position in self.get_exits(start):
+            if steps < distance.get(key, float('inf')):
+                distance[key] = steps
+                previous[key] = (None, edge_id, position)
+                heapq.heappush(open_set, (steps, next(order), key))
+        is_visited = set()
+        while open_set:
+            current_distance, _, key = heapq.heappop(open_set)
+            if current_distance >= best_distance: # Nothing left in the open set can beat the best path found
+                break
+            if key in is_visited:
+                continue
+            is_visited.add(key)
+            self.expanded += 1
+            if key in goal_exits and current_distance + goal_exits[key][0] < best_distance:
+                best_distance = current_distance + goal_exits[key][0]
+                best_key = key
+            for edge_id in self.adjacent[key]:
+                a, b, length, cells = self.edges[edge_id]
+                other = b if key == a else a
+                new_distance = current_distance + length
+                if new_distance < distance.get(other, float('inf')):
+                    distance[other] = new_distance
+                    previous[other] = (key, edge_id, 0 if other == a else length)
+                    heapq.heappush(open_set, (new_distance, next(order), other))
+
+        if best_key is None:
+            if best_distance == float('inf'):
+                return None # Goal can't be reached
+            edge_id = self.edge_of[start] # Straight along the shared corridor
+            path = self.path_along(edge_id, self.get_position(goal, edge_id), self.get_position(start, edge_id))
+        else:
+            # Expands the chain of key cells back into corridor cells, from goal to start
+            steps, edge_id, position = goal_exits[best_key]
+            path = self.path_along(edge_id, self.get_position(goal, edge_id), position) if edge_id is not None else [goal]
+            key = best_key
+            while True:
+                previous_key, edge_id, position = previous[key]
+                if previous_key is None: # Reached the corridor the start is in
+                    if edge_id is not None:
+                        path += self.path_along(edge_id, position, self.get_position(start, edge_id))[1:]
+                    break
+                a, b, length, cells = self.edges[edge_id]
+                path += self.path_along(edge_id, position, 0 if previous_key == a else length)[1:]
+                key = previous_key
+        return path
+
 class EducationMode:
     def __init__(self, game):
         self.game = game
-        self.image = load_image('blank.png')
+        self.image = assets.image('blank.png')
         self.buttons = [
             # Static buttons
             Button(self.game, 56, 670, 'back_button.png', self.back_button_clicked, 81, 72),
@@ -1798,26 +3472,27 @@ class EducationMode:
         self.maze = Maze(self.maze_width, self.maze_height, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height) # Generates new maze
         self.start_node_pos = (0, 0)
         self.goal_node_pos = (self.maze_width - 1, self.maze_height - 1)
-        self.dijkstra = self.maze.setup_dijkstra(self.start_node_pos, self.goal_node_pos) # Sets up the animation for the Dijkstra's algorithm visualiser
-        self.astar = self.maze.setup_astar(self.start_node_pos, self.goal_node_pos) # Sets up the animation for the A* algorithm visualiser
+        self.algorithm_names = ["Dijkstra's", 'A*', 'BFS', 'Bi-BFS'] # Algorithm switcher order
         self.current_algorithm_name = "Dijkstra's" # Current algrothm to run
-        self.current_algorithm = self.dijkstra # Current algorithm running
+        self.setup_algorithm() # Sets up the animation for the current algorithm, which becomes the current algorithm running
         self.status = "Ready" # Part of the info text which describes the status of the algorithm
-        self.next_animation_time = 0
-        self.animation_delay = 100 # ms between each animation frame
-        self.speed_multiplier = { # Describes the animation delay as a multiple of the default speed (100ms) so I can display as text
-            0: "Max",
-            50: "2x",
-            100: "1x",
-            150: "0.67x",
-            200: "0.5x",
-            250: "0.4x",
-            300: "0.33x",
-            350: "0.29x",
-            400: "0.25x",
-            450: "0.22x",
-            500: "Min"
-        }
+        self.speeds = [ # (label, animation steps per second) from slowest to fastest, as multiples of the default speed - Max runs as many steps as fit in ANIMATION_BUDGET
+            ("Min", 2),
+            ("0.22x", 2.22),
+            ("0.25x", 2.5),
+            ("0.29x", 2.86),
+            ("0.33x", 3.33),
+            ("0.4x", 4),
+            ("0.5x", 5),
+            ("0.67x", 6.67),
+            ("1x", 10),
+            ("2x", 20),
+            ("10x", 100),
+            ("100x", 1000),
+            ("Max", None)
+        ]
+        self.speed = 8 # Index of the current speed, 1x
+        self.animation_stepper = AnimationStepper()
         self.stop_animation = False
         self.stop_path_animation = False
         self.is_paused = True
@@ -1846,6 +3521,7 @@ class EducationMode:
         self.UI_label_font = pg.font.Font(MONTSERRAT_BOLD, 26)
         self.UI_text_font1 = pg.font.Font(MONTSERRAT_REG, 26)
         self.UI_text_font2 = pg.font.Font(MONTSERRAT_REG, 16)
+        self.UI_text_font3 = pg.font.Font(MONTSERRAT_REG, 20) # Maze dimensions of 3 or more digits, so they fit between the minus and plus buttons
         self.title = "Visualiser"
         self.title_colour = CYAN
         self.title_text_font = pg.font.Font(PARKVANE, 50)
@@ -1886,15 +3562,12 @@ class EducationMode:
             self.buttons[-6].draw() # Draw pause button
 
     def update(self):
+        self.update_camera()
         self.run_animation()
-        self.visited_nodes = 0
-        for x in range(self.maze.width): # Computes no. nodes visited
-            for y in range(self.maze.height):
-                if self.maze.array[x][y].is_path_visited:
-                    self.visited_nodes += 1
+        self.visited_nodes = self.maze.array.is_path_visited.count(1) # Computes no. nodes visited
         self.queued_nodes = len(self.current_algorithm.open_set) # Updates no. queued nodes
         if self.path: # Presence check
-            self.path_length = len(self.path[:self.path_pointer + 1]) # Updates final path length
+            self.path_length = min(len(self.path), self.path_pointer + 1) # Updates final path length
         self.update_info() # Updates info text
 
     def buttons_clicked(self):
@@ -1922,11 +3595,9 @@ class EducationMode:
         self.game.state = self.game.title_screen
         # Choose which soundtrack to play based on the darkness mode theme being on/off
         if self.game.play_mode.darkness_mode:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'darkness_bg_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('darkness_bg_music.mp3')
         else:
-            pg.mixer.music.load(os.path.join(SOUNDS_DIR, 'normal_bg_music.mp3'))
-            pg.mixer.music.play(-1)
+            play_music('normal_bg_music.mp3')
 
     def settings_button_clicked(self):
         self.game.show_settings = True
@@ -1949,13 +3620,17 @@ class EducationMode:
     def pause_button_clicked(self):
         self.is_paused = True
 
+    def setup_algorithm(self): # Sets up the animation for the algorithm chosen in the algorithm switcher
+        setups = {
+            "Dijkstra's": self.maze.setup_dijkstra,
+            'A*': self.maze.setup_astar,
+            'BFS': self.maze.setup_bfs,
+            'Bi-BFS': self.maze.setup_bidirectional_bfs
+        }
+        self.current_algorithm = setups[self.current_algorithm_name](self.start_node_pos, self.goal_node_pos)
+
     def replay_button_clicked(self):
-        if self.current_algorithm_name == "Dijkstra's":
-            self.dijkstra = self.maze.setup_dijkstra(self.start_node_pos, self.goal_node_pos) # Sets up the animation for the Dijkstra's algorithm visualiser
-            self.current_algorithm = self.dijkstra
-        else:
-            self.astar = self.maze.setup_astar(self.start_node_pos, self.goal_node_pos) # Sets up the animation for the A* algorithm visualiser
-            self.current_algorithm = self.astar
+        self.setup_algorithm()
         self.stop_animation = False
         self.stop_path_animation = False
         self.is_paused = False
@@ -1965,35 +3640,47 @@ class EducationMode:
         self.visited_nodes = 0
         self.queued_nodes = 0
         self.path_length = 0
+        self.animation_stepper.reset()
 
     def slow_down_button_clicked(self):
-        self.animation_delay = min(500, self.animation_delay + 50) # Range check - animation delay is capped to 500
+        self.speed = max(0, self.speed - 1) # Range check - can't go slower than Min
 
     def speed_up_button_clicked(self):
-        self.animation_delay = max(0, self.animation_delay - 50) # Range check - animation delay cannot be negative
+        self.speed = min(len(self.speeds) - 1, self.speed + 1) # Range check - can't go faster than Max
+
+    def get_size_step(self, size, is_increment): # Steps of 1 up to 50, then 10 up to 200, then 100, so the biggest mazes are a few clicks away
+        if size < 50 or (size == 50 and not is_increment):
+            return 1
+        elif size < 200 or (size == 200 and not is_increment):
+            return 10
+        return 100
 
     def decrement_width(self):
-        self.maze_width = max(6, self.maze_width - 1) # Range check - maze width cannot go below 6 as this will lead to UI elements overlapping
+        self.maze_width = max(6, self.maze_width - self.get_size_step(self.maze_width, False)) # Range check - maze width cannot go below 6 as this will lead to UI elements overlapping
 
     def increment_width(self):
-        self.maze_width = min(50, self.maze_width + 1) # Range check - maze width is capped to 50 as the game performance will slow down beyond 50
+        self.maze_width = min(MAX_MAZE_SIZE, self.maze_width + self.get_size_step(self.maze_width, True)) # Range check - mazes too big to fit are scrolled by the camera, capped to MAX_MAZE_SIZE
 
     def decrement_height(self):
-        self.maze_height = max(6, self.maze_height - 1) # Range check - maze height cannot go below 6 as this will lead to UI elements overlapping
+        self.maze_height = max(6, self.maze_height - self.get_size_step(self.maze_height, False)) # Range check - maze height cannot go below 6 as this will lead to UI elements overlapping
 
     def increment_height(self):
-        self.maze_height = min(50, self.maze_height + 1) # Range check - maze height is capped to 50 as the game performance will slow down beyond 50
+        self.maze_height = min(MAX_MAZE_SIZE, self.maze_height + self.get_size_step(self.maze_height, True)) # Range check - mazes too big to fit are scrolled by the camera, capped to MAX_MAZE_SIZE
+
+    def update_camera(self): # Arrow keys / WASD pan and the mouse wheel zooms in on the cursor
+        keys = pg.key.get_pressed()
+        dx = (keys[pg.K_LEFT] or keys[pg.K_a]) - (keys[pg.K_RIGHT] or keys[pg.K_d]) # The maze moves the opposite way to the view
+        dy = (keys[pg.K_UP] or keys[pg.K_w]) - (keys[pg.K_DOWN] or keys[pg.K_s])
+        if dx or dy:
+            self.maze.pan(dx * CAMERA_SPEED, dy * CAMERA_SPEED)
+        if self.game.mouse_wheel and self.maze.viewport.collidepoint(self.game.mouse_pos):
+            self.maze.zoom(self.maze.cell_size + self.game.mouse_wheel * max(self.maze.cell_size // 4, 1), self.game.mouse_pos)
 
     def refresh_button_clicked(self):
         self.maze = Maze(self.maze_width, self.maze_height, self.maze_surface_pos, self.maze_surface_width, self.maze_surface_height) # Generates new maze
         self.start_node_pos = (0, 0)
         self.goal_node_pos = (self.maze_width - 1, self.maze_height - 1)
-        if self.current_algorithm_name == "Dijkstra's":
-            self.dijkstra = self.maze.setup_dijkstra(self.start_node_pos, self.goal_node_pos) # Sets up the animation for the Dijkstra's algorithm visualiser
-            self.current_algorithm = self.dijkstra
-        else:
-            self.astar = self.maze.setup_astar(self.start_node_pos, self.goal_node_pos) # Sets up the animation for the A* algorithm visualiser
-            self.current_algorithm = self.astar
+        self.setup_algorithm()
         self.status = "Ready" # Part of the info text which describes the status of the algorithm
         self.stop_animation = False
         self.stop_path_animation = False
@@ -2004,68 +3691,91 @@ class EducationMode:
         self.visited_nodes = 0
         self.queued_nodes = 0
         self.path_length = 0
+        self.animation_stepper.reset()
 
     def previous_button_clicked(self): # Switches algorithms
-        if self.current_algorithm_name == "Dijkstra's":
-            self.current_algorithm_name = 'A*'
-        else:
-            self.current_algorithm_name = "Dijkstra's"
+        i = self.algorithm_names.index(self.current_algorithm_name)
+        self.current_algorithm_name = self.algorithm_names[(i - 1) % len(self.algorithm_names)]
 
     def next_button_clicked(self): # Switches algorithms
-        if self.current_algorithm_name == "Dijkstra's":
-            self.current_algorithm_name = 'A*'
-        else:
-            self.current_algorithm_name = "Dijkstra's"
+        i = self.algorithm_names.index(self.current_algorithm_name)
+        self.current_algorithm_name = self.algorithm_names[(i + 1) % len(self.algorithm_names)]
 
-    def run_animation(self):
+    def run_animation(self): # Runs as many animation steps as the current speed allows this simulation step
         if not self.is_paused:
+            rate = self.speeds[self.speed][1]
             if not self.stop_animation: # Runs the pathfinding animation until its stopped
                 self.status = "Exploring" # Part of the info text which describes the status of the algorithm
-                current_time = pg.time.get_ticks()
-                if current_time - self.next_animation_time > self.animation_delay: # Runs each frame of the pathfinding animation at intervals
-                    output = self.current_algorithm.run_frame()
-                    self.next_animation_time = current_time
-                    # Processes the value returned by the run_frame() method
-                    if isinstance(output, list):
-                        self.stop_animation = True
-                        self.path = output # List of nodes that form the shortest path maze solution
-                    else:
-                        self.stop_animation = output
-
+                self.animation_stepper.run(self.run_search_step, rate)
             elif not self.stop_path_animation and self.path: # Runs the final path animation until its stopped
                 self.status = "Goal found - retracing path" # Part of the info text which describes the status of the algorithm
-                current_time = pg.time.get_ticks()
-                if current_time - self.next_animation_time > self.animation_delay: # Runs each frame of the final path animation at intervals
-                    if self.path_pointer < len(self.path) - 1: # Updates the slice index value of the path list for the final path animation
-                        self.path_pointer += 1
-                        self.next_animation_time = current_time
-                    else:
-                        self.status = "Finished" # Part of the info text which describes the status of the algorithm
-                        self.stop_path_animation = True
+                self.animation_stepper.run(self.run_path_step, rate)
+
+    def run_search_step(self): # Runs one step of the pathfinding animation, returning True once the search is over
+        output = self.current_algorithm.run_frame()
+        # Processes the value returned by the run_frame() method
+        if isinstance(output, list):
+            self.stop_animation = True
+            self.path = output # List of nodes that form the shortest path maze solution
+        else:
+            self.stop_animation = output
+        return self.stop_animation
+
+    def run_path_step(self): # Runs one step of the final path animation, returning True once the whole path is shown
+        if self.path_pointer < len(self.path) - 1: # Updates the slice index value of the path list for the final path animation
+            self.path_pointer += 1
+            return False
+        self.status = "Finished" # Part of the info text which describes the status of the algorithm
+        self.stop_path_animation = True
+        return True
 
     def update_info(self): # Updates info text based on the current algorithm running
-        if self.current_algorithm == self.dijkstra:
+        if isinstance(self.current_algorithm, AStar):
             self.lines = [
-                "Dijkstra's Algorithm:",
+                "A* Algorithm:",
                 "",
                 "Finds shortest path from start to goal",
-                "Explores nodes by lowest distance",
-                "Selects node with lowest distance",
+                "Uses distance + heuristic",
+                "Selects node with lowest f(n)",
+                "f(n) = g(n) + h(n)",
                 "",
-                "No heuristic used",
+                "Usually faster than Dijkstra's",
+                f"Status: {self.status}"
+            ]
+        elif isinstance(self.current_algorithm, BidirectionalBFS):
+            self.lines = [
+                "Bidirectional BFS:",
+                "",
+                "Finds shortest path from start to goal",
+                "Searches from both start and goal",
+                "Stops where the two searches meet",
+                "",
+                "No faster than BFS corner to corner",
+                "",
+                f"Status: {self.status}"
+            ]
+        elif isinstance(self.current_algorithm, BFS):
+            self.lines = [
+                "Breadth-First Search:",
+                "",
+                "Finds shortest path from start to goal",
+                "Explores nodes in the order found",
+                "Every step costs the same",
+                "",
+                "No heuristic or priority queue used",
                 "",
                 f"Status: {self.status}"
             ]
         else:
             self.lines = [
-                "A* Algorithm:",
+                "Dijkstra's Algorithm:",
                 "",
                 "Finds shortest path from start to goal",
-                "Uses distance + heuristic",
-                "Selects node with lowest f(n)",
-                "f(n) = g(n) + h(n)",
+                "Explores nodes by lowest distance",
+                "Selects node with lowest distance",
+                "",
+                "No heuristic used",
                 "",
-                "Usually faster than Dijkstra's",
                 f"Status: {self.status}"
             ]
 
@@ -2154,7 +3864,7 @@ class EducationMode:
             str(self.maze_width),
             (SCREEN_WIDTH - self.maze_surface_pos[0] - self.maze_surface_width) // 2 + 5,
             202,
-            self.UI_text_font1,
+            self.UI_text_font1 if self.maze_width < 100 else self.UI_text_font3,
             WHITE,
             'center'
         )
@@ -2172,10 +3882,21 @@ class EducationMode:
             str(self.maze_height),
             (SCREEN_WIDTH - self.maze_surface_pos[0] - self.maze_surface_width) // 2 + 5,
             354,
-            self.UI_text_font1,
+            self.UI_text_font1 if self.maze_height < 100 else self.UI_text_font3,
             WHITE,
             'center'
         )
+        min_cell_size, max_cell_size = self.maze.get_zoom_range()
+        if min_cell_size < max_cell_size: # Camera controls, only for mazes the camera can move around
+            draw_text(
+                self.game.screen,
+                'Arrows to pan, scroll to zoom',
+                (SCREEN_WIDTH - self.maze_surface_pos[0] - self.maze_surface_width) // 2,
+                590,
+                self.UI_text_font2,
+                WHITE,
+                'center'
+            )
 
     def draw_algorithm_switcher(self):
         draw_text( # Algorithm switcher title
@@ -2209,9 +3930,12 @@ class EducationMode:
         )
 
     def draw_speed_multiplier(self):
+        text = f'Speed: {self.speeds[self.speed][0]}'
+        if not self.is_paused and not self.stop_path_animation: # Shows the measured speed while the animation runs
+            text += f' ({self.animation_stepper.get_steps_per_second():,} steps/s)'
         draw_text(
             self.game.screen,
-            f'Speed: {self.speed_multiplier[self.animation_delay]}',
+            text,
             self.maze_surface_pos[0] + self.maze_surface_width,
             self.maze_surface_pos[1] + self.maze_surface_height,
             self.UI_text_font2,
@@ -2220,5 +3944,6 @@ class EducationMode:
         )
 
 # Code execution
-new_game = Game()
-new_game.run()
\ No newline at end of file
+if __name__ == '__main__': # Only runs the game when executed directly, so the classes can be imported by tools
+    new_game = Game()
+    new_game.run()